@@ -0,0 +1,61 @@
+# coding=utf-8
+"""Compare vectorized execution estimates against walking the book per size
+
+    python benchmarks/bench_execution.py
+
+"""
+
+import random
+import timeit
+
+import numpy as np
+
+from bigone.execution import estimate_many
+
+LEVELS = 200
+SIZES = 5000
+
+
+def make_book():
+    rng = random.Random(1)
+    return {
+        'bids': [{'price': str(100 - i * 0.01), 'amount': str(rng.uniform(0.1, 5))} for i in range(LEVELS)],
+        'asks': [{'price': str(100.01 + i * 0.01), 'amount': str(rng.uniform(0.1, 5))} for i in range(LEVELS)],
+    }
+
+
+def naive(book, sizes):
+    levels = sorted((float(level['price']), float(level['amount'])) for level in book['asks'])
+    res = []
+    for size in sizes:
+        remaining, cost, used = size, 0.0, 0
+        for price, amount in levels:
+            take = min(amount, remaining)
+            cost += take * price
+            remaining -= take
+            used += 1
+            if remaining <= 0:
+                break
+        filled = size - remaining
+        res.append((cost / filled if filled else None, used))
+    return res
+
+
+def main():
+    book = make_book()
+    sizes = np.linspace(0.1, 400, SIZES)
+
+    vectorized = estimate_many(book, sizes, 'BID')
+    walked = naive(book, sizes)
+    assert np.allclose(vectorized['avg_price'], [r[0] for r in walked])
+
+    for name, func, number in (
+        ('naive walk', lambda: naive(book, sizes), 3),
+        ('estimate_many', lambda: estimate_many(book, sizes, 'BID'), 50),
+    ):
+        elapsed = min(timeit.repeat(func, number=number, repeat=3)) / number
+        print('{:<14} {:10.1f} us/call  {:8.3f} us/size'.format(name, elapsed * 1e6, elapsed * 1e6 / SIZES))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# coding=utf-8
+"""Compare batched book features against walking each book's level dicts
+
+    python benchmarks/bench_features.py
+
+"""
+
+import random
+import timeit
+
+from bigone.features import book_features, compute_features, stack_books
+
+MARKETS = 200
+LEVELS = 20
+TOP = 5
+
+
+def make_books():
+    rng = random.Random(1)
+    books = []
+    for m in range(MARKETS):
+        mid = rng.uniform(1, 1000)
+        tick = mid * 0.0001
+        books.append({
+            'market_uuid': 'M{}'.format(m),
+            'bids': [{'price': str(mid - (i + 1) * tick), 'amount': str(rng.uniform(0.1, 5))} for i in range(LEVELS)],
+            'asks': [{'price': str(mid + (i + 1) * tick), 'amount': str(rng.uniform(0.1, 5))} for i in range(LEVELS)],
+        })
+    return books
+
+
+def _slope(points):
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var if var else None
+
+
+def naive(books):
+    res = []
+    for book in books:
+        bids = sorted(((float(level['price']), float(level['amount'])) for level in book['bids']), reverse=True)[:LEVELS]
+        asks = sorted((float(level['price']), float(level['amount'])) for level in book['asks'])[:LEVELS]
+        best_bid, best_ask = bids[0][0], asks[0][0]
+        mid = (best_bid + best_ask) / 2
+        bid_volume = sum(a for _, a in bids[:TOP])
+        ask_volume = sum(a for _, a in asks[:TOP])
+        bid_points, ask_points, total = [], [], 0.0
+        for price, amount in bids:
+            total += amount
+            bid_points.append((mid - price, total))
+        total = 0.0
+        for price, amount in asks:
+            total += amount
+            ask_points.append((price - mid, total))
+        res.append({
+            'mid': mid,
+            'spread': best_ask - best_bid,
+            'microprice': (best_bid * asks[0][1] + best_ask * bids[0][1]) / (bids[0][1] + asks[0][1]),
+            'imbalance': (bid_volume - ask_volume) / (bid_volume + ask_volume),
+            'bid_vwap': sum(p * a for p, a in bids[:TOP]) / bid_volume,
+            'ask_vwap': sum(p * a for p, a in asks[:TOP]) / ask_volume,
+            'bid_slope': _slope(bid_points),
+            'ask_slope': _slope(ask_points),
+        })
+    return res
+
+
+def main():
+    books = make_books()
+    features = ('mid', 'spread', 'microprice', 'imbalance', 'bid_vwap', 'ask_vwap', 'bid_slope', 'ask_slope')
+    levels = stack_books(books, LEVELS)
+
+    batched = book_features(books, features, depth=LEVELS, top=TOP)
+    expected = naive(books)
+    for i, row in enumerate(expected):
+        for j, name in enumerate(features):
+            assert abs(batched[i, j] - row[name]) <= 1e-6 * max(1.0, abs(row[name])), (name, batched[i, j], row[name])
+
+    number = 20
+    for name, fn in (('naive dict walk', lambda: naive(books)),
+                     ('book_features', lambda: book_features(books, features, depth=LEVELS, top=TOP)),
+                     ('compute_features', lambda: compute_features(levels, features, top=TOP))):
+        best = min(timeit.repeat(fn, number=number, repeat=3)) / number
+        print('{:<18} {:8.2f} ms per {} books'.format(name, best * 1e3, MARKETS))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# coding=utf-8
+"""Track `python -X importtime` for the bigone package against a budget
+
+    python benchmarks/bench_import.py [budget_ms]
+
+Exits with a non-zero status when any of the measured imports exceed the budget.
+
+"""
+
+import subprocess
+import sys
+
+MODULES = ('bigone', 'bigone.client')
+DEFAULT_BUDGET_MS = 15.0
+RUNS = 5
+
+
+def import_time_ms(module):
+    """Cumulative import time of a module in a fresh interpreter, best of RUNS"""
+
+    best = None
+    for _ in range(RUNS):
+        proc = subprocess.Popen(
+            [sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        _, err = proc.communicate()
+        total = 0
+        for line in err.decode('utf-8').splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            _, cumulative, name = line.split('|')
+            # only count modules pulled in by this import, not interpreter startup
+            if name.strip() == module:
+                total = int(cumulative.strip())
+        if best is None or total < best:
+            best = total
+    return best / 1000.0
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    failed = False
+    for module in MODULES:
+        elapsed = import_time_ms(module)
+        over = elapsed > budget
+        failed = failed or over
+        print('{:<16} {:8.2f} ms  budget {:.2f} ms  {}'.format(module, elapsed, budget, 'OVER' if over else 'ok'))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
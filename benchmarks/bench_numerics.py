@@ -0,0 +1,91 @@
+# coding=utf-8
+"""Compare fixed-point conversion of depth payloads against Decimal construction
+
+The codec rows memoise repeated values, the memoised Decimal row shows the same cache
+applied to Decimal.
+
+    python benchmarks/bench_numerics.py
+
+"""
+
+import random
+import timeit
+from decimal import Decimal
+
+from bigone.numerics import MarketCodec, parse_fixed
+
+LEVELS = 200
+SNAPSHOTS = 50
+NUMBER = 20
+
+
+def make_snapshots():
+    rng = random.Random(1)
+    prices = ['{:.8f}00000000'.format(40 + i * 0.001) for i in range(LEVELS * 2)]
+    amounts = ['{:.4f}000000000000'.format(rng.uniform(0, 100)) for _ in range(LEVELS * 4)]
+    snapshots = []
+    for _ in range(SNAPSHOTS):
+        # consecutive snapshots mostly share price levels, amounts change more often
+        start = rng.randint(0, LEVELS)
+        snapshots.append({
+            'bids': [{'price': p, 'amount': rng.choice(amounts)} for p in prices[start:start + LEVELS // 2]],
+            'asks': [{'price': p, 'amount': rng.choice(amounts)} for p in prices[start + LEVELS // 2:start + LEVELS]],
+        })
+    return snapshots
+
+
+def with_decimal(snapshots):
+    for book in snapshots:
+        for side in ('bids', 'asks'):
+            [(Decimal(level['price']), Decimal(level['amount'])) for level in book[side]]
+
+
+def with_memoised_decimal(snapshots, cache):
+    for book in snapshots:
+        for side in ('bids', 'asks'):
+            res = []
+            for level in book[side]:
+                price = cache.get(level['price'])
+                if price is None:
+                    price = cache[level['price']] = Decimal(level['price'])
+                amount = cache.get(level['amount'])
+                if amount is None:
+                    amount = cache[level['amount']] = Decimal(level['amount'])
+                res.append((price, amount))
+
+
+def with_parse_fixed(snapshots):
+    for book in snapshots:
+        for side in ('bids', 'asks'):
+            [(parse_fixed(level['price'], 8), parse_fixed(level['amount'], 4)) for level in book[side]]
+
+
+def with_codec(snapshots, codec):
+    for book in snapshots:
+        codec.parse_depth(book)
+
+
+def main():
+    snapshots = make_snapshots()
+    values = SNAPSHOTS * LEVELS * 2
+    codec = MarketCodec(8, 4)
+
+    # exactness check against Decimal
+    for book in snapshots:
+        parsed = codec.parse_depth(book)
+        for level, (price, amount) in zip(book['bids'], parsed['bids']):
+            assert Decimal(level['price']).scaleb(8) == price
+            assert Decimal(level['amount']).scaleb(4) == amount
+
+    for name, func in (
+        ('Decimal', lambda: with_decimal(snapshots)),
+        ('memoised Decimal', lambda: with_memoised_decimal(snapshots, {})),
+        ('parse_fixed', lambda: with_parse_fixed(snapshots)),
+        ('MarketCodec.parse_depth', lambda: with_codec(snapshots, codec)),
+    ):
+        elapsed = min(timeit.repeat(func, number=NUMBER, repeat=3))
+        print('{:<26} {:8.1f} ns/value'.format(name, elapsed / NUMBER / values * 1e9))
+
+
+if __name__ == '__main__':
+    main()
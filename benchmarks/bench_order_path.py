@@ -0,0 +1,58 @@
+# coding=utf-8
+"""Compare client side overhead of create_order against an order template
+
+The session is mounted with an adapter answering in memory so only the client's own
+work is measured: building, signing, preparing and decoding the request.
+
+    python benchmarks/bench_order_path.py
+
+"""
+
+import timeit
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+
+from bigone.client import Client
+
+BODY = b'{"data":{"id":10,"market_uuid":"ETH-BTC","price":"0.01","amount":"10","side":"BID","state":"PENDING"}}'
+NUMBER = 20000
+
+
+class MemoryAdapter(BaseAdapter):
+
+    def send(self, request, **kwargs):
+        response = Response()
+        response.status_code = 200
+        response._content = BODY
+        response.headers['Content-Type'] = 'application/json'
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def main():
+    client = Client('api_key', 'api_secret')
+    client.session.mount('https://', MemoryAdapter())
+    template = client.order_template('ETH-BTC')
+
+    def generic():
+        client.create_order('ETH-BTC', 'BID', '0.01', '10')
+
+    def templated():
+        template.create_order('BID', '0.01', '10')
+
+    for name, fn in (('create_order', generic), ('order_template', templated)):
+        fn()
+        best = min(timeit.repeat(fn, number=NUMBER, repeat=3))
+        print('{:<16} {:8.1f} us/order'.format(name, best / NUMBER * 1e6))
+
+    best = min(timeit.repeat(client.signer.sign, number=NUMBER, repeat=3))
+    print('{:<16} {:8.1f} us/token'.format('signer', best / NUMBER * 1e6))
+
+
+if __name__ == '__main__':
+    main()
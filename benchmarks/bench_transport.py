@@ -0,0 +1,108 @@
+# coding=utf-8
+"""Compare transports on the same client calls against a local keep-alive server
+
+    python benchmarks/bench_transport.py
+
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+from bigone.aio import AsyncClient, AsyncMemoryTransport, ExecutorTransport
+from bigone.client import Client
+from bigone.transport import MemoryTransport, RequestsTransport, Urllib3Transport
+
+TICKER = {'data': {'market_uuid': 'ETH-BTC', 'close': '0.05', 'volume': '1000',
+                   'bid': {'price': '0.0499', 'amount': '1'}, 'ask': {'price': '0.0501', 'amount': '1'}}}
+BODY = json.dumps(TICKER).encode('utf-8')
+NUMBER = 2000
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def sequential(client):
+    client.get_ticker('ETH-BTC')
+    start = time.time()
+    for _ in range(NUMBER):
+        client.get_ticker('ETH-BTC')
+    return (time.time() - start) / NUMBER
+
+
+def concurrent(client):
+    start = time.time()
+    client.map_concurrent('get_ticker', ['ETH-BTC'] * NUMBER, max_workers=8)
+    return (time.time() - start) / NUMBER
+
+
+def concurrent_async(client):
+    loop = asyncio.new_event_loop()
+    start = time.time()
+    loop.run_until_complete(client.map_concurrent('get_ticker', ['ETH-BTC'] * NUMBER, max_workers=8))
+    elapsed = time.time() - start
+    loop.close()
+    return elapsed / NUMBER
+
+
+def main():
+    httpd = _Server(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = 'http://127.0.0.1:{}/api/v2'.format(httpd.server_address[1])
+
+    memory = MemoryTransport()
+    memory.add('get', Client.API_URL + '/markets/ETH-BTC/ticker', TICKER)
+    async_memory = AsyncMemoryTransport()
+    async_memory.add('get', Client.API_URL + '/markets/ETH-BTC/ticker', TICKER)
+
+    def client(transport, cls=Client):
+        c = cls('api_key', 'api_secret', transport=transport)
+        if not isinstance(transport, (MemoryTransport, AsyncMemoryTransport)):
+            c.API_URL = url
+        return c
+
+    rows = [
+        ('requests', sequential, client(RequestsTransport())),
+        ('urllib3', sequential, client(Urllib3Transport())),
+        ('memory', sequential, client(memory)),
+        ('requests x8', concurrent, client(RequestsTransport(threadsafe=True))),
+        ('urllib3 x8', concurrent, client(Urllib3Transport())),
+        ('async requests x8', concurrent_async, client(ExecutorTransport(max_workers=8), AsyncClient)),
+        ('async urllib3 x8', concurrent_async, client(ExecutorTransport(Urllib3Transport(), 8), AsyncClient)),
+        ('async memory x8', concurrent_async, client(async_memory, AsyncClient)),
+    ]
+    for name, run, c in rows:
+        print('{:<20} {:8.1f} us/request'.format(name, run(c) * 1e6))
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,4 +4,56 @@
 
 """
 
+import importlib
+import sys
+import types
+
 __version__ = '0.1.0'
+
+# attributes resolved on first access so `import bigone` stays cheap, heavier
+# subsystems and their dependencies are only loaded when they are used
+_LAZY_ATTRS = {
+    'Client': 'bigone.client',
+    'BigoneAPIException': 'bigone.exceptions',
+    'BigoneRequestException': 'bigone.exceptions',
+    'BigoneTimeoutException': 'bigone.exceptions',
+    'BigoneAuthException': 'bigone.exceptions',
+    'BigoneRateLimitException': 'bigone.exceptions',
+    'BigoneInsufficientBalanceException': 'bigone.exceptions',
+    'BigoneUnsupportedCurrencyException': 'bigone.exceptions',
+    'BigoneCircuitOpenException': 'bigone.exceptions',
+    'FillTracker': 'bigone.fills',
+}
+
+_LAZY_MODULES = ('aio', 'breaker', 'cache', 'candles', 'client', 'clock', 'depth', 'exceptions', 'execution', 'features', 'fills', 'graph', 'hedging', 'helpers', 'httpcache', 'numerics', 'orders', 'pipeline', 'scheduler', 'signing', 'snapshot', 'transfers', 'transport')
+
+__all__ = list(_LAZY_ATTRS) + list(_LAZY_MODULES)
+
+
+class _LazyModule(types.ModuleType):
+    """Package module resolving `_LAZY_ATTRS` and `_LAZY_MODULES` on first access
+
+    Module level `__getattr__` needs Python 3.7, replacing the module in `sys.modules`
+    works on every supported version.
+
+    """
+
+    def __getattr__(self, name):
+        if name in _LAZY_ATTRS:
+            value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+        elif name in _LAZY_MODULES:
+            value = importlib.import_module('bigone.{}'.format(name))
+        else:
+            raise AttributeError("module 'bigone' has no attribute '{}'".format(name))
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(__all__))
+
+
+_module = _LazyModule(__name__, __doc__)
+_module.__dict__.update(globals())
+# keep the original module alive, Python 2 clears the globals of collected modules
+_module._original = sys.modules[__name__]
+sys.modules[__name__] = _module
@@ -0,0 +1,187 @@
+# coding=utf-8
+"""asyncio client and transports, requires Python 3.5+"""
+
+import asyncio
+
+try:
+    import contextvars
+except ImportError:  # Python < 3.7, timing is tracked per thread
+    contextvars = None
+
+from .client import Client
+from .exceptions import BigoneTimeoutException
+from .helpers import endpoint_key
+from .transport import MemoryTransport, RequestsTransport
+
+
+class AsyncTransport(object):
+    """Asynchronous counterpart of `bigone.transport.Transport`
+
+    `request` takes the same arguments and is a coroutine returning the same kind of
+    response.
+
+    """
+
+    async def request(self, method, url, params=None, json=None, data=None, headers=None, timeout=None):
+        raise NotImplementedError()
+
+    async def close(self):
+        """Release pooled connections"""
+
+
+class ExecutorTransport(AsyncTransport):
+    """Run a thread safe synchronous transport on a thread pool
+
+    .. code:: python
+
+        client = AsyncClient(api_key, api_secret, transport=ExecutorTransport(Urllib3Transport()))
+
+    """
+
+    def __init__(self, transport=None, max_workers=16):
+        """Executor transport constructor
+
+        :param transport: optional - synchronous transport, a threadsafe `RequestsTransport` by default
+        :type transport: bigone.transport.Transport
+        :param max_workers: optional - maximum requests in flight
+        :type max_workers: int
+
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.transport = transport or RequestsTransport(threadsafe=True, pool_maxsize=max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    async def request(self, method, url, params=None, json=None, data=None, headers=None, timeout=None):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, lambda: self.transport.request(method, url, params, json, data, headers, timeout))
+
+    async def close(self):
+        self._executor.shutdown(wait=False)
+        self.transport.close()
+
+
+class AsyncMemoryTransport(MemoryTransport, AsyncTransport):
+    """In-process transport for `AsyncClient`, latency is simulated without blocking the loop"""
+
+    async def request(self, method, url, params=None, json=None, data=None, headers=None, timeout=None):
+        request = self._record(method, url, params, json, data, headers)
+        if self.latency:
+            if timeout and timeout < self.latency:
+                await asyncio.sleep(timeout)
+                raise BigoneTimeoutException('Request to {} timed out'.format(url))
+            await asyncio.sleep(self.latency)
+        return self._respond(request)
+
+    async def close(self):
+        pass
+
+
+class AsyncClient(Client):
+    """Client whose endpoint methods are coroutines
+
+    All endpoint methods of `Client` are available unchanged and return awaitables.
+    Hedging is not supported, `deadline`, `http_cache`, `breaker` and `clock_sync` are.
+
+    .. code:: python
+
+        client = AsyncClient(api_key, api_secret)
+
+        markets = await client.get_markets()
+        books = await client.map_concurrent('get_order_book', ['ETH-BTC', 'EOS-BTC'])
+
+    """
+
+    def __init__(self, api_key, api_secret, deadline=None, http_cache=False, transport=None, breaker=None,
+                 clock_sync=None):
+        """Async client constructor
+
+        :param transport: optional - asynchronous transport, an `ExecutorTransport` by default
+        :type transport: AsyncTransport
+
+        See `Client` for the other parameters.
+
+        """
+
+        super(AsyncClient, self).__init__(api_key, api_secret, deadline=deadline, http_cache=http_cache,
+                                          transport=transport or ExecutorTransport(), breaker=breaker,
+                                          clock_sync=clock_sync)
+        self._timing = contextvars.ContextVar('timing', default=None) if contextvars is not None else None
+
+    @property
+    def last_timing(self):
+        """Timing of the last call awaited by this task, see `Client.last_timing`"""
+
+        if self._timing is None:
+            return super(AsyncClient, self).last_timing
+        return self._timing.get()
+
+    def _set_timing(self, timing):
+        if self._timing is None:
+            super(AsyncClient, self)._set_timing(timing)
+        else:
+            self._timing.set(timing)
+
+    async def _request(self, method, path, signed, **kwargs):
+        key = self._revalidate(method, path, signed, kwargs)
+        return self._receive(key, await self._send(method, path, signed, **kwargs))
+
+    async def _send(self, method, path, signed, **kwargs):
+        uri = self._create_uri(path)
+        kwargs, deadline = self._request_kwargs(method, kwargs)
+        ticket = self.breaker.acquire(method, path) if self.breaker is not None else None
+        clock_sync = self.clock_sync
+        self._set_timing(None)
+        try:
+            sent = clock_sync.clock() if clock_sync is not None else None
+            request = self.transport.request(method, uri, **(self._sign(kwargs) if signed else kwargs))
+            if deadline:
+                try:
+                    response = await asyncio.wait_for(request, deadline)
+                except asyncio.TimeoutError:
+                    raise BigoneTimeoutException(
+                        'Deadline of {}s exceeded for {}'.format(deadline, endpoint_key(path)))
+            else:
+                response = await request
+            if clock_sync is not None:
+                clock_sync.observe_response(response, sent, clock_sync.clock())
+        except Exception as e:
+            if ticket is not None:
+                self.breaker.release(ticket, error=e)
+            raise
+        if ticket is not None:
+            self.breaker.release(ticket, response)
+        self.transfer_stats.record(endpoint_key(path), response)
+        self._set_timing(getattr(response, 'timing', None))
+        return response
+
+    async def map_concurrent(self, method, args_list, max_workers=8, return_exceptions=False):
+        """Await a client method for a list of arguments with at most `max_workers` in flight
+
+        See `Client.map_concurrent`.
+
+        """
+
+        func = getattr(self, method) if isinstance(method, str) else method
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def call(args):
+            async with semaphore:
+                if isinstance(args, tuple):
+                    return await func(*args)
+                if isinstance(args, dict):
+                    return await func(**args)
+                return await func(args)
+
+        return await asyncio.gather(*[call(args) for args in args_list], return_exceptions=return_exceptions)
+
+    async def close(self):
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
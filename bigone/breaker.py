@@ -0,0 +1,330 @@
+# coding=utf-8
+
+import collections
+import contextlib
+import threading
+import time
+
+from .exceptions import BigoneAPIException, BigoneCircuitOpenException
+from .helpers import endpoint_key
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+GROUP_TRADING = 'trading'
+GROUP_ACCOUNT = 'account'
+GROUP_MARKET = 'market'
+
+_HISTORY = frozenset(['viewer/trades', 'viewer/withdrawals', 'viewer/deposits', 'markets/*/trades'])
+
+
+def endpoint_group(method, path):
+    """Failure domain of an endpoint: trading, account or market"""
+
+    if path.startswith('viewer/orders'):
+        return GROUP_TRADING
+    if path.startswith('viewer') or path.startswith('accounts'):
+        return GROUP_ACCOUNT
+    return GROUP_MARKET
+
+
+def endpoint_priority(method, path):
+    """Default priority of an endpoint
+
+    Placing, cancelling and looking up orders is high priority, history feeds including
+    the order list are low priority, everything else is normal.
+
+    """
+
+    key = endpoint_key(path)
+    if method != 'get' or key == 'viewer/orders/*':
+        return PRIORITY_HIGH
+    if key in _HISTORY or key == 'viewer/orders':
+        return PRIORITY_LOW
+    return PRIORITY_NORMAL
+
+
+class _Circuit(object):
+
+    def __init__(self, window):
+        self.state = STATE_CLOSED
+        self.outcomes = collections.deque(maxlen=window)
+        self.opened_at = None
+        self.in_flight = 0
+        # probes in flight in the current half-open period
+        self.probes = 0
+        self.generation = 0
+        self.probe_successes = 0
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.shed = [0, 0, 0]
+        self.transitions = collections.Counter()
+
+
+class CircuitBreaker(object):
+    """Per endpoint group circuit breaker with priority based load shedding
+
+    Each group (trading, account and market data by default) trips open once the share
+    of failed or slow calls among the last `window` calls reaches `error_rate`. An open
+    circuit fails calls immediately with `BigoneCircuitOpenException` instead of queueing
+    them behind a degraded API. After `open_time` it turns half-open and lets a limited
+    number of probe calls through, `close_after` successful probes close it again and any
+    failed probe re-opens it.
+
+    While half-open low priority calls are shed first and `reserved_calls` of the
+    `half_open_calls` probe slots are kept for high priority calls such as order
+    placement and cancels.
+
+    Failures are timeouts, connection errors and 5xx or 429 responses, other API errors
+    are the caller's and count as successes.
+
+    .. code:: python
+
+        client = Client(api_key, api_secret, threadsafe=True, breaker=True)
+
+        # history sync gives way to trading when the API degrades
+        with client.breaker.priority(PRIORITY_LOW):
+            transfers.sync()
+
+        print(client.breaker.stats())
+
+    """
+
+    def __init__(self, error_rate=0.5, slow_call=2.0, window=20, min_calls=10, open_time=5.0,
+                 half_open_calls=4, reserved_calls=2, close_after=3, group=endpoint_group,
+                 priority=endpoint_priority, callback=None, clock=time.time):
+        """Circuit breaker constructor
+
+        :param error_rate: share of failed calls in the window that opens the circuit
+        :type error_rate: float
+        :param slow_call: seconds after which a call counts as failed
+        :type slow_call: float
+        :param window: number of recent calls considered per group
+        :type window: int
+        :param min_calls: calls needed in the window before the circuit can open
+        :type min_calls: int
+        :param open_time: seconds an open circuit waits before probing
+        :type open_time: float
+        :param half_open_calls: probe calls allowed in flight while half-open
+        :type half_open_calls: int
+        :param reserved_calls: probe slots only high priority calls may use
+        :type reserved_calls: int
+        :param close_after: successful probes that close the circuit
+        :type close_after: int
+        :param group: function of method and path returning the endpoint group
+        :type group: function
+        :param priority: function of method and path returning the default priority
+        :type priority: function
+        :param callback: optional - called with each transition dict
+        :type callback: function
+        :param clock: function returning the current time in seconds
+        :type clock: function
+
+        """
+
+        self.error_rate = error_rate
+        self.slow_call = slow_call
+        self.window = window
+        self.min_calls = min_calls
+        self.open_time = open_time
+        self.half_open_calls = half_open_calls
+        self.reserved_calls = reserved_calls
+        self.close_after = close_after
+        self.group = group
+        self.default_priority = priority
+        self.callback = callback
+        self.clock = clock
+        self._circuits = {}
+        self._transitions = collections.deque(maxlen=100)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def priority(self, priority):
+        """Run calls made by this thread at a priority, overriding the endpoint default"""
+
+        previous = getattr(self._local, 'priority', None)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def _circuit(self, group):
+        circuit = self._circuits.get(group)
+        if circuit is None:
+            circuit = self._circuits[group] = _Circuit(self.window)
+        return circuit
+
+    def _transition(self, group, circuit, state, now):
+        event = {'time': now, 'group': group, 'from': circuit.state, 'to': state}
+        circuit.transitions['{}->{}'.format(circuit.state, state)] += 1
+        circuit.state = state
+        if state == STATE_OPEN:
+            circuit.opened_at = now
+        elif state == STATE_HALF_OPEN:
+            circuit.probes = 0
+            circuit.probe_successes = 0
+            circuit.generation += 1
+        else:
+            circuit.outcomes.clear()
+        self._transitions.append(event)
+        return event
+
+    def acquire(self, method, path):
+        """Admit a call or fail fast
+
+        :return: ticket to pass to `release`
+
+        :raises: BigoneCircuitOpenException
+
+        """
+
+        group = self.group(method, path)
+        priority = getattr(self._local, 'priority', None)
+        if priority is None:
+            priority = self.default_priority(method, path)
+        now = self.clock()
+        event = None
+        with self._lock:
+            circuit = self._circuit(group)
+            if circuit.state == STATE_OPEN and now - circuit.opened_at >= self.open_time:
+                event = self._transition(group, circuit, STATE_HALF_OPEN, now)
+
+            if circuit.state == STATE_OPEN:
+                error = 'open'
+            elif circuit.state == STATE_HALF_OPEN and priority == PRIORITY_LOW:
+                error = 'shedding low priority calls'
+            elif circuit.state == STATE_HALF_OPEN and circuit.probes >= self.half_open_calls - (
+                    0 if priority == PRIORITY_HIGH else self.reserved_calls):
+                error = 'probing'
+            else:
+                error = None
+
+            probe = None
+            if error is None:
+                circuit.in_flight += 1
+                circuit.calls += 1
+                if circuit.state == STATE_HALF_OPEN:
+                    circuit.probes += 1
+                    probe = circuit.generation
+            else:
+                circuit.rejected += 1
+                circuit.shed[priority] += 1
+                retry_after = None
+                if circuit.state == STATE_OPEN:
+                    retry_after = max(0.0, circuit.opened_at + self.open_time - now)
+                state = circuit.state
+        self._notify(event)
+
+        if error is not None:
+            raise BigoneCircuitOpenException('Circuit for {} is {}'.format(group, error), group, state, retry_after)
+        return group, now, probe
+
+    def release(self, ticket, response=None, error=None):
+        """Record the outcome of an admitted call
+
+        :param ticket: as returned by `acquire`
+        :param response: optional - response of the call
+        :param error: optional - exception raised by the call
+
+        """
+
+        group, start, probe = ticket
+        now = self.clock()
+        failed = now - start >= self.slow_call or self._failed(response, error)
+        event = None
+        with self._lock:
+            circuit = self._circuit(group)
+            circuit.in_flight -= 1
+            circuit.failures += failed
+            # calls admitted before the current half-open period say nothing about recovery
+            if circuit.state == STATE_HALF_OPEN and probe == circuit.generation:
+                circuit.probes -= 1
+                if failed:
+                    event = self._transition(group, circuit, STATE_OPEN, now)
+                else:
+                    circuit.probe_successes += 1
+                    if circuit.probe_successes >= self.close_after:
+                        event = self._transition(group, circuit, STATE_CLOSED, now)
+            elif circuit.state == STATE_CLOSED:
+                circuit.outcomes.append(failed)
+                count = len(circuit.outcomes)
+                if count >= self.min_calls and sum(circuit.outcomes) >= self.error_rate * count:
+                    event = self._transition(group, circuit, STATE_OPEN, now)
+        self._notify(event)
+
+    @staticmethod
+    def _failed(response, error):
+        if error is not None:
+            if isinstance(error, BigoneAPIException):
+                return error.status_code >= 500 or error.status_code == 429
+            return True
+        if response is not None:
+            return response.status_code >= 500 or response.status_code == 429
+        return False
+
+    def _notify(self, event):
+        if event is not None and self.callback:
+            self.callback(event)
+
+    def state(self, group):
+        """Current state of a group"""
+
+        with self._lock:
+            circuit = self._circuits.get(group)
+            return circuit.state if circuit is not None else STATE_CLOSED
+
+    def transitions(self):
+        """Recent state transitions, oldest first
+
+        :return: list of dicts with time, group, from and to
+
+        """
+
+        with self._lock:
+            return list(self._transitions)
+
+    def stats(self):
+        """State, counters and transition counts per group
+
+        :return: dict
+
+        .. code:: python
+
+            {
+                "market": {
+                    "state": "half_open",
+                    "calls": 1200,
+                    "failures": 64,
+                    "error_rate": 0.55,         # over the current window
+                    "rejected": 310,
+                    "shed": {"high": 0, "normal": 12, "low": 298},
+                    "in_flight": 2,
+                    "transitions": {"closed->open": 2, "open->half_open": 2, "half_open->open": 1}
+                }
+            }
+
+        """
+
+        res = {}
+        with self._lock:
+            for group, circuit in self._circuits.items():
+                count = len(circuit.outcomes)
+                res[group] = {
+                    'state': circuit.state,
+                    'calls': circuit.calls,
+                    'failures': circuit.failures,
+                    'error_rate': float(sum(circuit.outcomes)) / count if count else None,
+                    'rejected': circuit.rejected,
+                    'shed': dict(zip(('high', 'normal', 'low'), circuit.shed)),
+                    'in_flight': circuit.in_flight,
+                    'transitions': dict(circuit.transitions)
+                }
+        return res
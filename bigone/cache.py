@@ -0,0 +1,315 @@
+# coding=utf-8
+
+import heapq
+import itertools
+import threading
+import time
+
+
+class DepthSnapshot(object):
+    """Order book held by a `DepthCache` along with when it was fetched"""
+
+    __slots__ = ('symbol', 'book', 'fetched_at')
+
+    def __init__(self, symbol, book, fetched_at):
+        self.symbol = symbol
+        self.book = book
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self):
+        """Seconds since the book was fetched"""
+        return time.time() - self.fetched_at
+
+
+class _Fetch(object):
+    """Order book request in flight, shared by every caller refreshing the same market"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.snapshot = None
+        self.error = None
+
+
+class DepthCache(object):
+    """Read-through order book cache with background refresh
+
+    Subscribed markets are refreshed by a background thread, each at its own interval.
+    Reads are served from memory as long as the book is no older than `max_staleness`,
+    otherwise the book is fetched synchronously before returning. Concurrent refreshes of
+    the same market, from readers or the background thread, share a single request.
+
+    Share one cache between components instead of each calling `get_order_book` on
+    their own schedule. The client should be created with `threadsafe=True` as reads
+    may fetch from the calling thread while the background thread refreshes.
+
+    .. code:: python
+
+        client = Client(api_key, api_secret, threadsafe=True)
+        cache = DepthCache(client, interval=1.0, max_staleness=3.0)
+        cache.subscribe('ETH-BTC')
+        cache.subscribe('EOS-BTC', interval=5.0)
+        cache.start()
+
+        snapshot = cache.get('ETH-BTC', max_staleness=0.5)
+        print(snapshot.age, snapshot.book['bids'][0])
+
+        print(cache.stats())
+        cache.stop()
+
+    """
+
+    def __init__(self, client, interval=1.0, max_staleness=5.0):
+        """Depth cache constructor
+
+        :param client: Client used to fetch order books
+        :type client: bigone.client.Client
+        :param interval: default refresh interval of subscribed markets in seconds
+        :type interval: float
+        :param max_staleness: default maximum age of a book served by `get` in seconds
+        :type max_staleness: float
+
+        """
+
+        self._client = client
+        self.interval = interval
+        self.max_staleness = max_staleness
+        self._snapshots = {}
+        self._intervals = {}
+        self._versions = {}
+        self._markets = {}
+        self._queue = []
+        self._fetching = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._errors = 0
+        self.last_error = None
+
+    def subscribe(self, symbol, interval=None):
+        """Refresh a market in the background, calling again updates the interval
+
+        :param symbol: market symbol or uuid
+        :type symbol: str
+        :param interval: optional - refresh interval in seconds
+        :type interval: float
+
+        """
+
+        with self._cond:
+            self._intervals[symbol] = interval or self.interval
+            self._versions[symbol] = next(self._seq)
+            self._markets.setdefault(symbol, {'lag': None, 'max_lag': 0.0, 'refreshes': 0})
+            snapshot = self._snapshots.get(symbol)
+            self._schedule(symbol, snapshot.fetched_at + self._intervals[symbol] if snapshot else time.time())
+            self._cond.notify()
+
+    def unsubscribe(self, symbol):
+        """Stop refreshing a market, the last book stays cached"""
+
+        with self._cond:
+            self._intervals.pop(symbol, None)
+            self._versions.pop(symbol, None)
+            self._markets.pop(symbol, None)
+
+    def subscriptions(self):
+        """Subscribed markets and their refresh intervals
+
+        :return: dict of symbol to interval
+
+        """
+
+        with self._cond:
+            return dict(self._intervals)
+
+    def get_state(self):
+        """Subscriptions and cached books for a snapshot"""
+
+        with self._cond:
+            return {
+                'subscriptions': dict(self._intervals),
+                'books': [[s.symbol, s.book, s.fetched_at] for s in self._snapshots.values()]
+            }
+
+    def set_state(self, state):
+        """Restore subscriptions and books from a snapshot
+
+        Books keep the time they were originally fetched so reads still honour
+        `max_staleness`, subscribed markets are refreshed as soon as they are due.
+
+        """
+
+        for symbol, book, fetched_at in state['books']:
+            self._snapshots[symbol] = DepthSnapshot(symbol, book, fetched_at)
+        for symbol, interval in state['subscriptions'].items():
+            self.subscribe(symbol, interval)
+
+    def start(self):
+        """Start the background refresh thread"""
+
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name='bigone-depth-cache')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread"""
+
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get(self, symbol, max_staleness=None):
+        """Get the order book of a market
+
+        :param symbol: market symbol or uuid
+        :type symbol: str
+        :param max_staleness: optional - maximum acceptable age in seconds, the book is
+            fetched synchronously if the cached one is older
+        :type max_staleness: float
+
+        :return: DepthSnapshot
+
+        :raises:  BigoneRequestException, BigoneAPIException
+
+        """
+
+        if max_staleness is None:
+            max_staleness = self.max_staleness
+        with self._cond:
+            snapshot = self._snapshots.get(symbol)
+            if snapshot is not None and snapshot.age <= max_staleness:
+                self._hits += 1
+                return snapshot
+            self._misses += 1
+        return self.refresh(symbol)
+
+    def get_order_book(self, symbol, max_staleness=None):
+        """Drop in replacement for `Client.get_order_book` served from the cache"""
+
+        return self.get(symbol, max_staleness).book
+
+    def refresh(self, symbol):
+        """Fetch the order book of a market now, or wait for a fetch already in flight
+
+        :return: DepthSnapshot
+
+        :raises:  BigoneRequestException, BigoneAPIException
+
+        """
+
+        with self._cond:
+            fetch = self._fetching.get(symbol)
+            if fetch is None:
+                fetch = self._fetching[symbol] = _Fetch()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            fetch.done.wait()
+            if fetch.error is not None:
+                raise fetch.error
+            return fetch.snapshot
+
+        try:
+            book = self._client.get_order_book(symbol)
+            fetch.snapshot = DepthSnapshot(symbol, book, time.time())
+        except Exception as e:
+            fetch.error = e
+            raise
+        finally:
+            with self._cond:
+                if fetch.snapshot is not None:
+                    self._snapshots[symbol] = fetch.snapshot
+                    self._refreshes += 1
+                del self._fetching[symbol]
+            fetch.done.set()
+        return fetch.snapshot
+
+    def stats(self):
+        """Cache hit ratio and refresh lag
+
+        :return: dict
+
+        .. code:: python
+
+            {
+                "hits": 120,
+                "misses": 3,
+                "hit_ratio": 0.9756,
+                "refreshes": 54,
+                "errors": 0,
+                "markets": {
+                    "ETH-BTC": {
+                        "interval": 1.0,
+                        "age": 0.41,
+                        "lag": 0.002,       # how late the last background refresh started
+                        "max_lag": 0.015,
+                        "refreshes": 51
+                    }
+                }
+            }
+
+        """
+
+        with self._cond:
+            total = self._hits + self._misses
+            markets = {}
+            for symbol, market in self._markets.items():
+                snapshot = self._snapshots.get(symbol)
+                markets[symbol] = dict(market, interval=self._intervals.get(symbol),
+                                       age=snapshot.age if snapshot else None)
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': float(self._hits) / total if total else None,
+                'refreshes': self._refreshes,
+                'errors': self._errors,
+                'markets': markets
+            }
+
+    def _schedule(self, symbol, due):
+        heapq.heappush(self._queue, (due, self._versions[symbol], symbol))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    now = time.time()
+                    if self._queue and self._queue[0][0] <= now:
+                        break
+                    self._cond.wait(self._queue[0][0] - now if self._queue else None)
+                if not self._running:
+                    return
+
+                due, version, symbol = heapq.heappop(self._queue)
+                if self._versions.get(symbol) != version:
+                    # unsubscribed or subscribed again since this entry was queued
+                    continue
+                interval = self._intervals[symbol]
+                market = self._markets[symbol]
+                market['lag'] = now - due
+                market['max_lag'] = max(market['max_lag'], now - due)
+                # keep the cadence unless we have fallen a whole interval behind
+                self._schedule(symbol, max(due + interval, now))
+
+            try:
+                self.refresh(symbol)
+            except Exception as e:
+                with self._cond:
+                    self._errors += 1
+                    self.last_error = e
+            else:
+                with self._cond:
+                    market['refreshes'] += 1
@@ -0,0 +1,309 @@
+# coding=utf-8
+
+import numpy as np
+
+from .helpers import parse_timestamp
+
+FIELDS = ('start', 'open', 'high', 'low', 'close', 'volume', 'quote_volume', 'buy_volume', 'sell_volume', 'count')
+
+START, OPEN, HIGH, LOW, CLOSE, VOLUME, QUOTE_VOLUME, BUY_VOLUME, SELL_VOLUME, COUNT = range(len(FIELDS))
+
+
+def trade_timestamp(trade):
+    """Timestamp of a trade node in seconds, read from `inserted_at`, `created_at` or `timestamp`
+
+    Nodes of `get_market_trades` carry none of these, pass their times explicitly.
+
+    :raises: ValueError when the trade has no timestamp
+
+    """
+
+    for key in ('inserted_at', 'created_at', 'timestamp'):
+        value = trade.get(key)
+        if value is not None:
+            return value if isinstance(value, (int, float)) else parse_timestamp(value)
+    raise ValueError('Trade {} has no timestamp'.format(trade.get('id')))
+
+
+def trades_to_arrays(trades, timestamps=None):
+    """Convert trades as returned by `get_market_trades` into column arrays
+
+    :param trades: trades dict with edges, or a list of trade nodes
+    :type trades: dict or list
+    :param timestamps: optional - trade times in seconds in the order of `trades`, read
+        from the trades when not given
+    :type timestamps: list or numpy.ndarray
+
+    :return: tuple of timestamps, prices, amounts and buy flags, sorted by timestamp
+
+    :raises: ValueError
+
+    """
+
+    if isinstance(trades, dict):
+        trades = [e['node'] for e in trades.get('edges', [])]
+    if timestamps is None:
+        timestamps = np.array([trade_timestamp(t) for t in trades], dtype=np.float64)
+    else:
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if len(timestamps) != len(trades):
+            raise ValueError('Got {} timestamps for {} trades'.format(len(timestamps), len(trades)))
+    prices = np.array([t['price'] for t in trades], dtype=np.float64)
+    amounts = np.array([t['amount'] for t in trades], dtype=np.float64)
+    is_buy = np.array([t.get('taker_side') == 'BID' for t in trades], dtype=bool)
+    order = np.argsort(timestamps, kind='mergesort')
+    return timestamps[order], prices[order], amounts[order], is_buy[order]
+
+
+def resample(timestamps, prices, amounts, is_buy, resolution):
+    """Vectorized OHLCV resampling of time sorted trades
+
+    :param timestamps: trade timestamps in seconds, sorted ascending
+    :type timestamps: numpy.ndarray
+    :param prices: trade prices
+    :type prices: numpy.ndarray
+    :param amounts: trade amounts
+    :type amounts: numpy.ndarray
+    :param is_buy: True where the taker was the buyer
+    :type is_buy: numpy.ndarray
+    :param resolution: bar length in seconds
+    :type resolution: int
+
+    :return: array of bars with a column per entry in `FIELDS`
+
+    """
+
+    bars = np.empty((0, len(FIELDS)))
+    if not len(timestamps):
+        return bars
+
+    starts = np.floor(timestamps / resolution) * resolution
+    first = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+    last = np.r_[first[1:] - 1, len(starts) - 1]
+
+    bars = np.empty((len(first), len(FIELDS)))
+    bars[:, START] = starts[first]
+    bars[:, OPEN] = prices[first]
+    bars[:, HIGH] = np.maximum.reduceat(prices, first)
+    bars[:, LOW] = np.minimum.reduceat(prices, first)
+    bars[:, CLOSE] = prices[last]
+    bars[:, VOLUME] = np.add.reduceat(amounts, first)
+    bars[:, QUOTE_VOLUME] = np.add.reduceat(prices * amounts, first)
+    bars[:, BUY_VOLUME] = np.add.reduceat(np.where(is_buy, amounts, 0), first)
+    bars[:, SELL_VOLUME] = bars[:, VOLUME] - bars[:, BUY_VOLUME]
+    bars[:, COUNT] = last - first + 1
+    return bars
+
+
+def vwap(bars):
+    """VWAP of each bar in an array of bars"""
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return bars[:, QUOTE_VOLUME] / bars[:, VOLUME]
+
+
+class CandleRing(object):
+    """Preallocated ring buffer of bars for one market and resolution
+
+    The bar being built is held as a plain list so each trade is an O(1) update, it is
+    written into the ring when the next bar starts.
+
+    """
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution
+        self.capacity = capacity
+        self._data = np.zeros((capacity, len(FIELDS)))
+        self._next = 0
+        self._size = 0
+        self._current = None
+        self.late_trades = 0
+
+    def __len__(self):
+        return self._size + (1 if self._current is not None else 0)
+
+    def update(self, timestamp, price, amount, is_buy):
+        """Add a single trade"""
+
+        start = timestamp - timestamp % self.resolution
+        bar = self._current
+        if bar is None or start > bar[START]:
+            if bar is not None:
+                self._push(bar)
+            self._current = [start, price, price, price, price, amount, price * amount,
+                             amount if is_buy else 0.0, 0.0 if is_buy else amount, 1]
+            return
+        if start < bar[START]:
+            # bars already written to the ring are not revisited
+            self.late_trades += 1
+            return
+
+        if price > bar[HIGH]:
+            bar[HIGH] = price
+        elif price < bar[LOW]:
+            bar[LOW] = price
+        bar[CLOSE] = price
+        bar[VOLUME] += amount
+        bar[QUOTE_VOLUME] += price * amount
+        if is_buy:
+            bar[BUY_VOLUME] += amount
+        else:
+            bar[SELL_VOLUME] += amount
+        bar[COUNT] += 1
+
+    def load(self, bars):
+        """Replace the contents of the ring with an array of bars, the last bar stays open"""
+
+        self._next = 0
+        self._size = 0
+        self._current = None
+        if not len(bars):
+            return
+        closed = bars[:-1][-self.capacity:]
+        self._data[:len(closed)] = closed
+        self._next = len(closed) % self.capacity
+        self._size = len(closed)
+        self._current = [float(v) for v in bars[-1]]
+
+    def bars(self):
+        """Bars oldest first including the open bar
+
+        :return: array with a column per entry in `FIELDS`
+
+        """
+
+        if self._size < self.capacity:
+            closed = self._data[:self._size]
+        else:
+            closed = np.roll(self._data, -self._next, axis=0)
+        if self._current is None:
+            return closed.copy()
+        return np.vstack([closed, np.array([self._current], dtype=np.float64)])
+
+    def _push(self, bar):
+        self._data[self._next] = bar
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+
+class CandleAggregator(object):
+    """Multi-resolution OHLCV aggregation over market trades
+
+    Live trades update every resolution in O(1), history can be backfilled with vectorized
+    resampling. Bars for each market and resolution are held in preallocated ring buffers.
+
+    Requires numpy.
+
+    .. code:: python
+
+        candles = CandleAggregator(resolutions=(1, 60, 3600), capacity=1440)
+
+        # seed from stored history, nodes with an inserted_at, created_at or timestamp field
+        candles.backfill('ETH-BTC', stored_trades)
+
+        # then feed live trades, the feed has no trade times so the arrival time is used
+        trades = client.get_market_trades('ETH-BTC', after=last_id)
+        candles.update_many('ETH-BTC', trades, timestamp=time.time())
+
+        bars = candles.bars('ETH-BTC', 60)
+        closes = bars[:, CLOSE]
+
+    """
+
+    def __init__(self, resolutions=(1, 60, 3600), capacity=1440):
+        """Candle aggregator constructor
+
+        :param resolutions: bar lengths in seconds
+        :type resolutions: tuple
+        :param capacity: number of bars kept per market and resolution
+        :type capacity: int
+
+        """
+
+        self.resolutions = tuple(resolutions)
+        self.capacity = capacity
+        self._rings = {}
+
+    def add_market(self, symbol):
+        """Preallocate ring buffers for a market"""
+
+        if symbol not in self._rings:
+            self._rings[symbol] = [CandleRing(r, self.capacity) for r in self.resolutions]
+        return self._rings[symbol]
+
+    def markets(self):
+        return list(self._rings)
+
+    def update(self, symbol, trade, timestamp=None):
+        """Add a live trade
+
+        :param symbol: market symbol
+        :type symbol: str
+        :param trade: trade node as returned by `get_market_trades`
+        :type trade: dict
+        :param timestamp: optional - trade time in seconds, read from the trade when not given,
+            pass the arrival time for feeds without trade timestamps
+        :type timestamp: float
+
+        :raises: ValueError
+
+        """
+
+        if timestamp is None:
+            timestamp = trade_timestamp(trade)
+        price = float(trade['price'])
+        amount = float(trade['amount'])
+        is_buy = trade.get('taker_side') == 'BID'
+        rings = self._rings.get(symbol) or self.add_market(symbol)
+        for ring in rings:
+            ring.update(timestamp, price, amount, is_buy)
+
+    def update_many(self, symbol, trades, timestamp=None):
+        """Add a page of live trades as returned by `get_market_trades`
+
+        :param timestamp: optional - time in seconds applied to every trade, see `update`
+        :type timestamp: float
+
+        :raises: ValueError
+
+        """
+
+        if isinstance(trades, dict):
+            trades = [e['node'] for e in trades.get('edges', [])]
+        for trade in trades:
+            self.update(symbol, trade, timestamp)
+
+    def backfill(self, symbol, trades, timestamps=None):
+        """Replace the bars of a market with bars resampled from trade history
+
+        :param symbol: market symbol
+        :type symbol: str
+        :param trades: trades dict with edges, a list of trade nodes, or a tuple of
+            (timestamps, prices, amounts, is_buy) arrays
+        :type trades: dict or list or tuple
+        :param timestamps: optional - trade times in seconds for nodes without a
+            timestamp field, e.g. a `get_market_trades` payload
+        :type timestamps: list or numpy.ndarray
+
+        :raises: ValueError
+
+        """
+
+        if isinstance(trades, tuple):
+            columns = trades
+        else:
+            columns = trades_to_arrays(trades, timestamps)
+        for ring in self.add_market(symbol):
+            ring.load(resample(columns[0], columns[1], columns[2], columns[3], ring.resolution))
+
+    def bars(self, symbol, resolution):
+        """Bars for a market and resolution, oldest first
+
+        :return: array with a column per entry in `FIELDS`
+
+        """
+
+        rings = self._rings.get(symbol)
+        if rings is None:
+            return np.empty((0, len(FIELDS)))
+        return rings[self.resolutions.index(resolution)].bars()
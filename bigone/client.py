@@ -1,10 +1,10 @@
 # coding=utf-8
 
-import jwt
-import requests
-import time
+import threading
 
-from .exceptions import BigoneAPIException, BigoneRequestException
+from .exceptions import BigoneRequestException, BigoneTimeoutException, api_exception
+from .helpers import endpoint_key
+from .httpcache import HttpCache, TransferStats
 
 
 class Client(object):
@@ -14,7 +14,8 @@ class Client(object):
     SIDE_BID = 'BID'
     SIDE_ASK = 'ASK'
 
-    def __init__(self, api_key, api_secret):
+    def __init__(self, api_key, api_secret, threadsafe=False, pool_maxsize=64, hedge=None, deadline=None,
+                 http_cache=False, transport=None, breaker=None, clock_sync=None):
         """Big.One API Client constructor
 
         https://open.big.one/
@@ -23,83 +24,292 @@ class Client(object):
         :type api_key: str
         :param api_key: Api Secret
         :type api_key: str
+        :param threadsafe: optional - give each thread its own session on a shared connection pool
+        :type threadsafe: bool
+        :param pool_maxsize: optional - maximum connections kept per host in threadsafe mode
+        :type pool_maxsize: int
+        :param hedge: optional - hedge slow GET requests, True or a HedgePolicy, implies threadsafe
+        :type hedge: bool or bigone.hedging.HedgePolicy
+        :param deadline: optional - default time limit of each call in seconds, implies threadsafe
+        :type deadline: float
+        :param http_cache: optional - revalidate public GETs with ETag / Last-Modified, True or an HttpCache
+        :type http_cache: bool or bigone.httpcache.HttpCache
+        :param transport: optional - HTTP stack, a `RequestsTransport` built from `threadsafe` and
+            `pool_maxsize` by default
+        :type transport: bigone.transport.Transport
+        :param breaker: optional - fail fast and shed load per endpoint group when the API degrades,
+            True or a CircuitBreaker
+        :type breaker: bool or bigone.breaker.CircuitBreaker
+        :param clock_sync: optional - estimate the server clock offset, applied to the nonce, True or a ClockSync
+        :type clock_sync: bool or bigone.clock.ClockSync
 
         .. code:: python
 
             client = Client(api_key, api_secret)
 
+            # safe to share between threads
+            client = Client(api_key, api_secret, threadsafe=True)
+
+            # hedge slow reads and give up on any call after 2 seconds
+            client = Client(api_key, api_secret, hedge=True, deadline=2.0)
+
+            # send requests with urllib3 directly
+            client = Client(api_key, api_secret, transport=Urllib3Transport())
+
+        Concurrency model
+
+        By default the client uses a single `requests.Session` and should be used from one
+        thread at a time. With `threadsafe=True` every thread lazily creates its own session,
+        all sessions mount the same `HTTPAdapter` so connections are pooled across threads.
+        Request arguments and headers are built fresh for each call, no state shared between
+        threads is mutated on the request path. Other transports must be thread safe to be
+        shared between threads.
+
+        A call with a deadline runs on a worker thread, the caller stops waiting once the
+        deadline has passed while the abandoned attempt finishes in the background. Passing
+        `deadline=` to a call of a client created without `threadsafe=True` or a default
+        deadline raises `BigoneRequestException`, the abandoned attempt would share the
+        session with the caller's next call.
+
         """
 
+        if hedge is True:
+            from .hedging import HedgePolicy
+            hedge = HedgePolicy()
+        if breaker is True:
+            from .breaker import CircuitBreaker
+            breaker = CircuitBreaker()
+        if clock_sync is True:
+            from .clock import ClockSync
+            clock_sync = ClockSync()
+
         self.API_KEY = api_key
         self.API_SECRET = api_secret
-        self.session = self._init_session()
+        self.threadsafe = threadsafe or hedge is not None or deadline is not None
+        self.hedge = hedge
+        self.breaker = breaker
+        self.clock_sync = clock_sync
+        self.deadline = deadline
+        self.http_cache = HttpCache() if http_cache is True else (http_cache or None)
+        self.transfer_stats = TransferStats()
+        self.pool_maxsize = pool_maxsize
+        if transport is None:
+            from .transport import RequestsTransport
+            transport = RequestsTransport(threadsafe=self.threadsafe, pool_maxsize=pool_maxsize)
+        self.transport = transport
+        self._signer = None
+        self._executor = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """`requests` session of the default transport, per thread in threadsafe mode"""
+        return self.transport.session
+
+    @session.setter
+    def session(self, session):
+        self.transport.session = session
+
+    @property
+    def last_timing(self):
+        """Timing of the last call made by this thread, see `ClockSync.observe_response`
+
+        None without `clock_sync`, before the first call and after a failed call.
 
-    def _init_session(self):
+        .. code:: python
 
-        session = requests.session()
-        headers = {'Accept': 'application/json',
-                   'User-Agent': 'python-bigone'}
-        session.headers.update(headers)
-        return session
+            client = Client(api_key, api_secret, clock_sync=True)
+            client.get_order_book('ETH-BTC')
 
-    def _create_uri(self, path):
-        return '{}/{}'.format(self.API_URL, path)
+            print(client.last_timing['rtt'], client.last_timing['server_time'])
 
-    def _create_signature(self, ):
+        """
 
-        headers = {'typ': 'JWT', 'alg': 'HS256'}
-        payload = {
-            'type': 'OpenAPI',
-            'sub': self.API_KEY,
-            'nonce': int(time.time() * 1000000000)  # convert to nanoseconds
-        }
-        sig = jwt.encode(payload, self.API_SECRET, algorithm='HS256', headers=headers)
-        return sig.decode("utf-8")
+        return getattr(self._local, 'timing', None)
 
-    def _request(self, method, path, signed, **kwargs):
+    def _set_timing(self, timing):
+        self._local.timing = timing
 
-        data = kwargs.get('data', None)
+    def get_state(self):
+        """Derived state of the client for a snapshot, see `bigone.snapshot`"""
 
-        if signed:
-            kwargs['headers'] = {
-                'Authorization': 'Bearer {}'.format(self._create_signature())
-            }
+        return {'http_cache': self.http_cache.get_state() if self.http_cache is not None else None,
+                'clock_sync': self.clock_sync.get_state() if self.clock_sync is not None else None}
 
-        uri = self._create_uri(path)
+    def set_state(self, state):
+        """Restore derived state from a snapshot"""
 
-        if method == 'get' and data:
-            kwargs['params'] = kwargs['data']
-            del(kwargs['data'])
+        if self.http_cache is not None and state.get('http_cache'):
+            self.http_cache.set_state(state['http_cache'])
+        if self.clock_sync is not None and state.get('clock_sync'):
+            self.clock_sync.set_state(state['clock_sync'])
 
-        if method == 'post' and data:
-            kwargs['json'] = kwargs['data']
-            del(kwargs['data'])
+    def _create_uri(self, path):
+        return '{}/{}'.format(self.API_URL, path)
+
+    @property
+    def signer(self):
+        """JWT signer, created on first use"""
+        if self._signer is None:
+            from .signing import Signer
+            if self.clock_sync is not None:
+                self._signer = Signer(self.API_KEY, self.API_SECRET, clock=self.clock_sync.now)
+            else:
+                self._signer = Signer(self.API_KEY, self.API_SECRET)
+        return self._signer
+
+    def _create_signature(self, ):
+        return self.signer.sign()
+
+    def _request(self, method, path, signed, **kwargs):
+        key = self._revalidate(method, path, signed, kwargs)
+        return self._receive(key, self._send(method, path, signed, **kwargs))
+
+    def _revalidate(self, method, path, signed, kwargs):
+        """HTTP cache key of a public GET, adds the conditional request headers to kwargs"""
+
+        if self.http_cache is None or method != 'get' or signed:
+            return None
+        key = self.http_cache.key(self._create_uri(path), kwargs.get('data'))
+        headers = self.http_cache.validators(key)
+        if headers:
+            kwargs['headers'] = headers
+        return key
+
+    def _receive(self, key, response):
+        """Decode a response, serving 304 answers from the HTTP cache"""
+
+        if key is None:
+            return self._handle_response(response)
+        if response.status_code == 304:
+            entry = self.http_cache.get(key)
+            if entry is not None:
+                return self.http_cache.data(entry)
+        res = self._handle_response(response)
+        self.http_cache.store(key, response, res)
+        return res
+
+    def _request_kwargs(self, method, kwargs):
+        """Transport arguments of a call, kwargs is local to the call and never shared between threads"""
+
+        data = kwargs.pop('data', None)
+        deadline = kwargs.pop('deadline', None) or self.deadline
+
+        if data:
+            if method == 'get':
+                kwargs['params'] = data
+            elif method == 'post':
+                kwargs['json'] = data
+            else:
+                kwargs['data'] = data
+
+        if deadline and 'timeout' not in kwargs:
+            kwargs['timeout'] = deadline
+        return kwargs, deadline
+
+    def _sign(self, kwargs):
+        # sign each attempt so hedged requests carry their own nonce
+        return dict(kwargs, headers={'Authorization': 'Bearer {}'.format(self._create_signature())})
+
+    def _send(self, method, path, signed, **kwargs):
+        """Send a request and return the raw response without decoding it"""
 
-        response = getattr(self.session, method)(uri, **kwargs)
-        return self._handle_response(response)
+        uri = self._create_uri(path)
+        kwargs, deadline = self._request_kwargs(method, kwargs)
+        transport = self.transport
+
+        def send():
+            request_kwargs = self._sign(kwargs) if signed else kwargs
+            return self._transmit(path, lambda: transport.request(method, uri, **request_kwargs))
+
+        return self._dispatch(method, path, send, deadline)
+
+    def _transmit(self, path, request):
+        """Run one attempt, sampling the server clock and recording transfer stats"""
+
+        clock_sync = self.clock_sync
+        if clock_sync is None:
+            response = request()
+        else:
+            sent = clock_sync.clock()
+            response = request()
+            clock_sync.observe_response(response, sent, clock_sync.clock())
+        self.transfer_stats.record(endpoint_key(path), response)
+        return response
+
+    def _dispatch(self, method, path, send, deadline):
+        """Run `send` under the circuit breaker, hedging and the deadline of the call"""
+
+        self._set_timing(None)
+        if self.breaker is None:
+            response = self._call(method, path, send, deadline)
+        else:
+            ticket = self.breaker.acquire(method, path)
+            try:
+                response = self._call(method, path, send, deadline)
+            except Exception as e:
+                self.breaker.release(ticket, error=e)
+                raise
+            self.breaker.release(ticket, response)
+        # attempts may run on worker threads, the timing is published to the caller's thread
+        self._set_timing(getattr(response, 'timing', None))
+        return response
+
+    def _call(self, method, path, send, deadline):
+        if self.hedge is not None and method == 'get':
+            return self.hedge.call(endpoint_key(path), send, deadline)
+        if not deadline:
+            return send()
+
+        if not self.threadsafe:
+            raise BigoneRequestException(
+                'Deadlines run calls on a worker thread, create the client with threadsafe=True')
+
+        # the transport timeout only bounds each socket operation, the deadline bounds the whole call
+        from concurrent.futures import wait
+
+        future = self._deadline_executor().submit(send)
+        done, _ = wait([future], timeout=deadline)
+        if not done:
+            raise BigoneTimeoutException('Deadline of {}s exceeded for {}'.format(deadline, endpoint_key(path)))
+        return future.result()
+
+    def _deadline_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    from concurrent.futures import ThreadPoolExecutor
+                    self._executor = ThreadPoolExecutor(max_workers=self.pool_maxsize)
+        return self._executor
 
     def _handle_response(self, response):
-        """Internal helper for handling API responses from the Quoine server.
+        """Internal helper for handling API responses from the Big.One server.
         Raises the appropriate exceptions when necessary; otherwise, returns the
         response.
         """
 
-        if not str(response.status_code).startswith('2'):
-            raise BigoneAPIException(response)
+        # decode once, the exception is built from the same body
         try:
             json = response.json()
+        except ValueError:
+            if not str(response.status_code).startswith('2'):
+                raise api_exception(response, response.text)
+            raise BigoneRequestException('Invalid Response: {}'.format(response.text))
+
+        if not str(response.status_code).startswith('2'):
+            raise api_exception(response, json)
 
+        if isinstance(json, dict):
             if 'msg' in json or 'errors' in json:
-                raise BigoneAPIException(response)
+                raise api_exception(response, json)
 
-            # by default return full response
-            res = json
             # if it's a normal response we have a data attribute, return that
             if 'data' in json:
-                res = json['data']
-            return res
-        except ValueError:
-            raise BigoneRequestException('Invalid Response: {}'.format(response.text))
+                return json['data']
+
+        # by default return full response
+        return json
 
     def _get(self, path, signed=False, **kwargs):
         return self._request('get', path, signed, **kwargs)
@@ -113,6 +323,57 @@ class Client(object):
     def _delete(self, path, signed=False, **kwargs):
         return self._request('delete', path, signed, **kwargs)
 
+    def map_concurrent(self, method, args_list, max_workers=8, return_exceptions=False):
+        """Call a client method concurrently for a list of arguments
+
+        Best used with a client created with `threadsafe=True`.
+
+        :param method: name of a client method or a callable
+        :type method: str or function
+        :param args_list: arguments for each call, a tuple is passed as positional arguments,
+            a dict as keyword arguments and anything else as a single argument
+        :type args_list: list
+        :param max_workers: number of threads to use
+        :type max_workers: int
+        :param return_exceptions: optional - return exceptions in the results instead of raising
+        :type return_exceptions: bool
+
+        .. code:: python
+
+            client = Client(api_key, api_secret, threadsafe=True)
+            books = client.map_concurrent('get_order_book', ['ETH-BTC', 'EOS-BTC'], max_workers=2)
+
+        :return: list of results in the same order as `args_list`
+
+        :raises:  BigoneRequestException, BigoneAPIException
+
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        func = getattr(self, method) if isinstance(method, str) else method
+
+        def call(args):
+            if isinstance(args, tuple):
+                return func(*args)
+            if isinstance(args, dict):
+                return func(**args)
+            return func(args)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(call, args) for args in args_list]
+
+        results = []
+        for future in futures:
+            exc = future.exception()
+            if exc is None:
+                results.append(future.result())
+            elif return_exceptions:
+                results.append(exc)
+            else:
+                raise exc
+        return results
+
     # Account endpoints
 
     def get_accounts(self):
@@ -333,11 +594,13 @@ class Client(object):
 
         return self._get('markets/{}/ticker'.format(symbol))
 
-    def get_order_book(self, symbol):
+    def get_order_book(self, symbol, deadline=None):
         """Get symbol market details
 
         :param symbol: Name of symbol
         :type symbol: str
+        :param deadline: optional - time limit of the call in seconds
+        :type deadline: float
 
         .. code:: python
 
@@ -369,11 +632,11 @@ class Client(object):
                 ]
             }
 
-        :raises:  BigoneRequestException, BigoneAPIException
+        :raises:  BigoneRequestException, BigoneAPIException, BigoneTimeoutException
 
         """
 
-        return self._get('markets/{}/depth'.format(symbol))
+        return self._get('markets/{}/depth'.format(symbol), deadline=deadline)
 
     def get_market_trades(self, symbol, after=None, before=None, first=None, last=None):
         """Get market trades - max 50
@@ -487,6 +750,29 @@ class Client(object):
 
         return self._post('viewer/orders', True, data=data)
 
+    def order_template(self, symbol):
+        """Order placement request prepared once for a market
+
+        Use for latency sensitive order placement, see `bigone.orders.OrderTemplate`.
+        Requires the default `RequestsTransport`.
+
+        :param symbol: Name of symbol
+        :type symbol: str
+
+        .. code:: python
+
+            template = client.order_template('ETH-BTC')
+            order = template.create_order('BID', '1.0', '1.0')
+
+        :return: OrderTemplate
+
+        :raises:  BigoneRequestException
+
+        """
+
+        from .orders import OrderTemplate
+        return OrderTemplate(self, symbol)
+
     def get_orders(self, symbol, after=None, before=None, first=None, last=None, side=None, state=None):
         """Get a list of orders
 
@@ -559,13 +845,15 @@ class Client(object):
 
         return self._get('viewer/orders', True, data=data)
 
-    def get_order(self, order_id):
+    def get_order(self, order_id, deadline=None):
         """Get an order
 
         https://open.big.one/docs/api_orders.html#get-one-order
 
         :param order_id: Id of order
         :type order_id: str
+        :param deadline: optional - time limit of the call in seconds
+        :type deadline: float
 
         .. code:: python
 
@@ -586,11 +874,11 @@ class Client(object):
                 "state": "FILLED"
             }
 
-        :raises:  BigoneRequestException, BigoneAPIException
+        :raises:  BigoneRequestException, BigoneAPIException, BigoneTimeoutException
 
         """
 
-        return self._get('viewer/orders/{}'.format(order_id), True)
+        return self._get('viewer/orders/{}'.format(order_id), True, deadline=deadline)
 
     def cancel_order(self, order_id):
         """Cancel an order
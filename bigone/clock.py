@@ -0,0 +1,155 @@
+# coding=utf-8
+
+import collections
+import threading
+import time
+from email.utils import mktime_tz, parsedate_tz
+
+
+class ClockSync(object):
+    """Server clock offset and round trip time estimated from responses
+
+    Each response bounds the server clock: the server stamped its `Date` header, with a
+    one second resolution, between the moment the request was sent and the moment the
+    response was received. The offset is the intersection of these intervals over the
+    last `window` samples, so fast round trips tighten it and slow ones are ignored.
+    When the intervals stop overlapping, e.g. after the local clock jumped, the median of
+    the interval midpoints is used instead.
+
+    Passed to the client, the offset is applied to the JWT nonce and every response gets
+    a `timing` dict with the estimated server side timing.
+
+    .. code:: python
+
+        client = Client(api_key, api_secret, clock_sync=True)
+        client.get_markets()
+
+        print(client.clock_sync.offset, client.clock_sync.rtt)
+
+    """
+
+    def __init__(self, window=64, clock=time.time):
+        """Clock sync constructor
+
+        :param window: number of recent samples used for the estimate
+        :type window: int
+        :param clock: function returning the local time in seconds
+        :type clock: function
+
+        """
+
+        self.window = window
+        self.clock = clock
+        self._samples = collections.deque(maxlen=window)
+        self._offset = 0.0
+        self._error = None
+        self._rtt = None
+        self._lock = threading.Lock()
+
+    @property
+    def offset(self):
+        """Estimated server time minus local time in seconds, 0 until a sample is observed"""
+        return self._offset
+
+    @property
+    def error(self):
+        """Half width of the offset interval, None without samples or on the median fallback"""
+        return self._error
+
+    @property
+    def rtt(self):
+        """Median round trip time of recent samples in seconds"""
+        return self._rtt
+
+    def now(self):
+        """Estimated current server time"""
+
+        return self.clock() + self._offset
+
+    def observe(self, sent, received, server_time, resolution=1.0):
+        """Add a sample
+
+        :param sent: local time the request was sent
+        :type sent: float
+        :param received: local time the response was received
+        :type received: float
+        :param server_time: server time reported by the response, truncated to `resolution`
+        :type server_time: float
+        :param resolution: resolution of the server time in seconds
+        :type resolution: float
+
+        """
+
+        with self._lock:
+            self._samples.append((server_time - received, server_time + resolution - sent, received - sent))
+            self._estimate()
+
+    def _estimate(self):
+        lower = max(s[0] for s in self._samples)
+        upper = min(s[1] for s in self._samples)
+        if lower <= upper:
+            self._offset = (lower + upper) / 2
+            self._error = (upper - lower) / 2
+        else:
+            self._offset = _median([(s[0] + s[1]) / 2 for s in self._samples])
+            self._error = None
+        self._rtt = _median([s[2] for s in self._samples])
+
+    def observe_response(self, response, sent, received):
+        """Add a sample from the `Date` header of a response and annotate it with `timing`
+
+        :return: timing dict, also set as `response.timing`
+
+        .. code:: python
+
+            {
+                "sent": 1531000000.120,           # local clock
+                "received": 1531000000.184,
+                "rtt": 0.064,
+                "offset": -0.352,                 # server minus local clock
+                "server_time": 1530999999.800     # estimated server time the request was handled
+            }
+
+        """
+
+        date = response.headers.get('Date')
+        parsed = parsedate_tz(date) if date else None
+        if parsed is not None:
+            self.observe(sent, received, mktime_tz(parsed))
+
+        rtt = received - sent
+        timing = {
+            'sent': sent,
+            'received': received,
+            'rtt': rtt,
+            'offset': self._offset,
+            'server_time': sent + rtt / 2 + self._offset
+        }
+        try:
+            response.timing = timing
+        except AttributeError:
+            pass
+        return timing
+
+    def get_state(self):
+        """Recent samples for a snapshot"""
+
+        with self._lock:
+            return [list(s) for s in self._samples]
+
+    def set_state(self, state):
+        """Restore samples from a snapshot"""
+
+        with self._lock:
+            self._samples.clear()
+            self._samples.extend(tuple(s) for s in state)
+            if self._samples:
+                self._estimate()
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
@@ -0,0 +1,84 @@
+# coding=utf-8
+
+
+def parse_depth(book):
+    """Convert an order book as returned by `get_order_book` into sorted price levels
+
+    :param book: order book dict
+    :type book: dict
+
+    .. code:: python
+
+        bids, asks = parse_depth(client.get_order_book('ETH-BTC'))
+
+    :return: tuple of bids and asks as lists of (price, amount) float tuples, best level first
+
+    """
+
+    bids = sorted(((float(level['price']), float(level['amount'])) for level in book.get('bids', [])), reverse=True)
+    asks = sorted((float(level['price']), float(level['amount'])) for level in book.get('asks', []))
+    return bids, asks
+
+
+def _vwap(levels):
+    volume = sum(a for _, a in levels)
+    if not volume:
+        return None
+    return sum(p * a for p, a in levels) / volume
+
+
+def book_metrics(book, depth=10):
+    """Summary metrics of an order book
+
+    :param book: order book dict as returned by `get_order_book`
+    :type book: dict
+    :param depth: number of levels per side used for VWAP and imbalance
+    :type depth: int
+
+    .. code:: python
+
+        metrics = book_metrics(client.get_order_book('ETH-BTC'), depth=5)
+
+    :return: dict
+
+    .. code:: python
+
+        {
+            "market_uuid": "BTC-EOS",
+            "best_bid": 42.0,
+            "best_ask": 45.0,
+            "mid": 43.5,
+            "spread": 3.0,
+            "bid_vwap": 41.8,
+            "ask_vwap": 45.6,
+            "bid_volume": 23.33363711,
+            "ask_volume": 4193.3283464,
+            "imbalance": -0.9889
+        }
+
+    """
+
+    bids, asks = parse_depth(book)
+    bids, asks = bids[:depth], asks[:depth]
+    best_bid = bids[0][0] if bids else None
+    best_ask = asks[0][0] if asks else None
+    bid_volume = sum(a for _, a in bids)
+    ask_volume = sum(a for _, a in asks)
+    total = bid_volume + ask_volume
+
+    res = {
+        'market_uuid': book.get('market_uuid'),
+        'best_bid': best_bid,
+        'best_ask': best_ask,
+        'mid': None,
+        'spread': None,
+        'bid_vwap': _vwap(bids),
+        'ask_vwap': _vwap(asks),
+        'bid_volume': bid_volume,
+        'ask_volume': ask_volume,
+        'imbalance': (bid_volume - ask_volume) / total if total else None
+    }
+    if best_bid is not None and best_ask is not None:
+        res['mid'] = (best_bid + best_ask) / 2
+        res['spread'] = best_ask - best_bid
+    return res
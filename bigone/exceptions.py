@@ -6,28 +6,53 @@ class BigoneAPIException(Exception):
 
         `code` values
 
+        The first error code in the response as an int, None if the response had no code.
+        All codes are in `codes`. Subclasses group the common code families so callers can
+        catch them directly.
+
         `message` format
 
+        Error messages of the response, multiple errors are joined by newlines.
+
     """
-    def __init__(self, response):
-        self.code = ''
+
+    codes_handled = frozenset()
+    status_codes_handled = frozenset()
+
+    def __init__(self, response, body=None):
+        """
+        :param response: response of the failed request
+        :param body: decoded response body, or the response text when it could not be decoded.
+            The response is only parsed when body is not given.
+
+        """
+
+        if body is None:
+            try:
+                body = response.json()
+            except ValueError:
+                body = response.text
+
+        self.code = None
+        self.codes = ()
         self.message = 'Unknown Error'
-        try:
-            json_res = response.json()
-        except ValueError:
-            print("Can't parse error response: {}".format(response.text))
-            self.message = response.text
-        else:
-            print("doing something with json_res: {}".format(json_res))
-            if 'msg' in json_res:
-                self.message = json_res['msg']
-                self.code = json_res['code']
-            elif 'errors' in json_res:
-                if type(json_res['errors']) == list:
-                    self.message = "\n ".join(["{}: {}".format(el['code'], el['message']) for el in json_res['errors']])
-                elif 'detail' in json_res['errors']:
-                    self.message = json_res['errors']['detail']
+        self.errors = []
+        if not isinstance(body, dict):
+            self.message = body
+        elif 'msg' in body:
+            self.message = body['msg']
+            self.code = body.get('code')
+            self.codes = (self.code,)
+        elif 'errors' in body:
+            if isinstance(body['errors'], list):
+                self.errors = body['errors']
+                self.codes = tuple(el.get('code') for el in self.errors)
+                self.code = self.codes[0] if self.codes else None
+                self.message = "\n ".join(["{}: {}".format(el.get('code'), el.get('message')) for el in self.errors])
+            elif 'detail' in body['errors']:
+                self.message = body['errors']['detail']
 
+        self.body = body
         self.status_code = response.status_code
         self.response = response
         self.request = getattr(response, 'request', None)
@@ -36,9 +61,86 @@ class BigoneAPIException(Exception):
         return 'BigoneAPIException {}: {}'.format(self.code, self.message)
 
 
+class BigoneAuthException(BigoneAPIException):
+    """Authentication failed, token expired or permission denied"""
+
+    codes_handled = frozenset([10403, 40004, 40103, 40104, 40301])
+    status_codes_handled = frozenset([401, 403])
+
+
+class BigoneRateLimitException(BigoneAPIException):
+    """Too many requests"""
+
+    codes_handled = frozenset([10429])
+    status_codes_handled = frozenset([429])
+
+
+class BigoneInsufficientBalanceException(BigoneAPIException):
+    """Not enough available balance for the request"""
+
+    codes_handled = frozenset([10014, 40603])
+
+
+class BigoneUnsupportedCurrencyException(BigoneAPIException):
+    """Currency is not supported"""
+
+    codes_handled = frozenset([20102])
+
+
+_API_EXCEPTIONS = (BigoneAuthException, BigoneRateLimitException, BigoneInsufficientBalanceException,
+                   BigoneUnsupportedCurrencyException)
+_CODE_EXCEPTIONS = dict((code, cls) for cls in _API_EXCEPTIONS for code in cls.codes_handled)
+_STATUS_EXCEPTIONS = dict((status, cls) for cls in _API_EXCEPTIONS for status in cls.status_codes_handled)
+
+
+def api_exception(response, body=None):
+    """Create the most specific API exception for a failed response
+
+    :param response: response of the failed request
+    :param body: decoded response body, or the response text when it could not be decoded
+
+    :return: BigoneAPIException or one of its subclasses
+
+    """
+
+    if isinstance(body, dict):
+        errors = body.get('errors')
+        if 'code' in body:
+            cls = _CODE_EXCEPTIONS.get(body['code'])
+        elif isinstance(errors, list) and errors:
+            cls = _CODE_EXCEPTIONS.get(errors[0].get('code'))
+        else:
+            cls = None
+        if cls is not None:
+            return cls(response, body)
+    return _STATUS_EXCEPTIONS.get(response.status_code, BigoneAPIException)(response, body)
+
+
 class BigoneRequestException(Exception):
     def __init__(self, message):
         self.message = message
 
     def __str__(self):
         return 'BigoneRequestException: {}'.format(self.message)
+
+
+class BigoneTimeoutException(BigoneRequestException):
+    def __str__(self):
+        return 'BigoneTimeoutException: {}'.format(self.message)
+
+
+class BigoneCircuitOpenException(BigoneRequestException):
+    """Call rejected without being sent because the circuit breaker of its endpoint group is open
+
+    `retry_after` is the number of seconds until the circuit probes again, None while half-open.
+
+    """
+
+    def __init__(self, message, group=None, state=None, retry_after=None):
+        super(BigoneCircuitOpenException, self).__init__(message)
+        self.group = group
+        self.state = state
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return 'BigoneCircuitOpenException: {}'.format(self.message)
@@ -0,0 +1,174 @@
+# coding=utf-8
+
+import numpy as np
+
+SIDE_BID = 'BID'
+SIDE_ASK = 'ASK'
+
+
+def book_side_arrays(book, side):
+    """Price and amount arrays of the levels an order on `side` would take
+
+    A BID order walks the asks from the lowest price, an ASK order walks the bids
+    from the highest price.
+
+    :param book: order book dict as returned by `get_order_book`
+    :type book: dict
+    :param side: side of the order (BID or ASK)
+    :type side: str
+
+    :return: tuple of price and amount arrays, best level first
+
+    """
+
+    if side == SIDE_BID:
+        levels = book.get('asks', [])
+    elif side == SIDE_ASK:
+        levels = book.get('bids', [])
+    else:
+        raise ValueError('Invalid side: {}'.format(side))
+
+    prices = np.array([level['price'] for level in levels], dtype=np.float64)
+    amounts = np.array([level['amount'] for level in levels], dtype=np.float64)
+    order = np.argsort(prices, kind='mergesort')
+    if side == SIDE_ASK:
+        order = order[::-1]
+    return prices[order], amounts[order]
+
+
+def _estimate(prices, amounts, sizes, side):
+    sizes = np.asarray(sizes, dtype=np.float64)
+    n = len(prices)
+    if not n:
+        nan = np.full(sizes.shape, np.nan)
+        return {
+            'size': sizes, 'filled': np.zeros(sizes.shape), 'avg_price': nan, 'worst_price': nan,
+            'cost': np.zeros(sizes.shape), 'slippage': nan, 'levels': np.zeros(sizes.shape, dtype=np.int64),
+            'complete': sizes <= 0
+        }
+
+    cum_amount = np.cumsum(amounts)
+    cum_cost = np.cumsum(prices * amounts)
+    total = cum_amount[-1]
+
+    # index of the level that completes each size
+    idx = np.minimum(np.searchsorted(cum_amount, sizes, side='left'), n - 1)
+    prev_amount = np.where(idx > 0, cum_amount[idx - 1], 0.0)
+    prev_cost = np.where(idx > 0, cum_cost[idx - 1], 0.0)
+
+    filled = np.minimum(sizes, total)
+    cost = prev_cost + (filled - prev_amount) * prices[idx]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_price = cost / filled
+    best = prices[0]
+    if side == SIDE_BID:
+        slippage = (avg_price - best) / best
+    else:
+        slippage = (best - avg_price) / best
+
+    return {
+        'size': sizes,
+        'filled': filled,
+        'avg_price': avg_price,
+        'worst_price': prices[idx],
+        'cost': cost,
+        'slippage': slippage,
+        'levels': np.where(filled > 0, idx + 1, 0),
+        'complete': sizes <= total
+    }
+
+
+def estimate_many(book, sizes, side):
+    """Estimate execution of many candidate order sizes against a book at once
+
+    :param book: order book dict as returned by `get_order_book`
+    :type book: dict
+    :param sizes: candidate order amounts
+    :type sizes: list or numpy.ndarray
+    :param side: side of the order (BID or ASK)
+    :type side: str
+
+    .. code:: python
+
+        book = client.get_order_book('ETH-BTC')
+        res = estimate_many(book, np.linspace(0.1, 50, 5000), Client.SIDE_BID)
+        affordable = res['size'][res['slippage'] < 0.001]
+
+    :return: dict of arrays, one entry per size
+
+    .. code:: python
+
+        {
+            "size": array([...]),           # requested amount
+            "filled": array([...]),         # amount the book can fill
+            "avg_price": array([...]),      # average fill price
+            "worst_price": array([...]),    # price of the last level touched
+            "cost": array([...]),           # quote amount paid or received
+            "slippage": array([...]),       # relative to the best price, positive is worse
+            "levels": array([...]),         # number of levels consumed
+            "complete": array([...])        # False where the book is too thin
+        }
+
+    """
+
+    prices, amounts = book_side_arrays(book, side)
+    return _estimate(prices, amounts, sizes, side)
+
+
+def estimate_execution(book, side, amount):
+    """Estimate execution of a single order against a book
+
+    :param book: order book dict as returned by `get_order_book`
+    :type book: dict
+    :param side: side of the order (BID or ASK)
+    :type side: str
+    :param amount: order amount
+    :type amount: float or str
+
+    .. code:: python
+
+        res = estimate_execution(client.get_order_book('ETH-BTC'), Client.SIDE_BID, '10')
+
+    :return: dict with the same keys as `estimate_many` holding scalars
+
+    """
+
+    res = estimate_many(book, [float(amount)], side)
+    return dict((k, v[0].item()) for k, v in res.items())
+
+
+def estimate_history(snapshots, sizes, side):
+    """Estimate execution of candidate sizes over stored depth snapshots
+
+    :param snapshots: iterable of (timestamp, book) tuples
+    :type snapshots: iterable
+    :param sizes: candidate order amounts
+    :type sizes: list or numpy.ndarray
+    :param side: side of the order (BID or ASK)
+    :type side: str
+
+    .. code:: python
+
+        res = estimate_history(stored_snapshots, [1, 5, 10], Client.SIDE_ASK)
+        # slippage of a size 5 order over time
+        res['slippage'][:, 1]
+
+    :return: dict with a `timestamp` array and the `estimate_many` keys as arrays of
+        shape (snapshots, sizes)
+
+    """
+
+    timestamps = []
+    rows = []
+    for timestamp, book in snapshots:
+        timestamps.append(timestamp)
+        rows.append(estimate_many(book, sizes, side))
+
+    res = {'timestamp': np.array(timestamps, dtype=np.float64)}
+    sizes = np.asarray(sizes, dtype=np.float64)
+    for key in ('size', 'filled', 'avg_price', 'worst_price', 'cost', 'slippage', 'levels', 'complete'):
+        if rows:
+            res[key] = np.vstack([r[key] for r in rows])
+        else:
+            res[key] = np.empty((0, len(sizes)))
+    return res
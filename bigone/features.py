@@ -0,0 +1,193 @@
+# coding=utf-8
+
+import numpy as np
+
+BID_PRICE, BID_AMOUNT, ASK_PRICE, ASK_AMOUNT = range(4)
+
+FEATURES = ('best_bid', 'best_ask', 'mid', 'spread', 'spread_bps', 'microprice', 'imbalance',
+            'bid_volume', 'ask_volume', 'bid_vwap', 'ask_vwap', 'bid_slope', 'ask_slope')
+
+
+def _stack_side(books, key, depth, descending):
+    levels = [book.get(key) or () for book in books]
+    counts = np.array([len(side) for side in levels], dtype=np.int64)
+    width = max(int(counts.max()) if len(counts) else 0, depth)
+    prices = np.full((len(books), width), np.nan)
+    amounts = np.zeros((len(books), width))
+
+    flat = [level for side in levels for level in side]
+    if flat:
+        rows = np.repeat(np.arange(len(books)), counts)
+        cols = np.arange(len(flat)) - np.repeat(np.cumsum(counts) - counts, counts)
+        prices[rows, cols] = np.array([level['price'] for level in flat], dtype=np.float64)
+        amounts[rows, cols] = np.array([level['amount'] for level in flat], dtype=np.float64)
+
+    # empty levels are NaN so they sort last on both sides
+    order = np.argsort(-prices if descending else prices, axis=1, kind='mergesort')[:, :depth]
+    return np.take_along_axis(prices, order, 1), np.take_along_axis(amounts, order, 1)
+
+
+def stack_books(books, depth=10):
+    """Stack order books into one array of price levels
+
+    Levels are sorted best first, missing levels have a NaN price and a zero amount. The
+    array can be kept as history, e.g. with `numpy.save`, and passed to `compute_features`.
+
+    :param books: order book dicts as returned by `get_order_book`
+    :type books: list
+    :param depth: number of levels kept per side
+    :type depth: int
+
+    :return: array of shape (books, 4, depth) indexed by `BID_PRICE`, `BID_AMOUNT`,
+        `ASK_PRICE` and `ASK_AMOUNT`
+
+    """
+
+    levels = np.empty((len(books), 4, depth))
+    levels[:, BID_PRICE], levels[:, BID_AMOUNT] = _stack_side(books, 'bids', depth, True)
+    levels[:, ASK_PRICE], levels[:, ASK_AMOUNT] = _stack_side(books, 'asks', depth, False)
+    return levels
+
+
+def _slope(distance, amounts):
+    """Least squares slope of cumulative amount against distance from the mid, per row"""
+
+    valid = ~np.isnan(distance) & (amounts > 0)
+    count = valid.sum(axis=1)
+    x = np.where(valid, distance, 0.0)
+    y = np.where(valid, np.cumsum(amounts, axis=1), 0.0)
+    mean_x = x.sum(axis=1) / np.maximum(count, 1)
+    mean_y = y.sum(axis=1) / np.maximum(count, 1)
+    cov = np.where(valid, (x - mean_x[:, None]) * (y - mean_y[:, None]), 0.0).sum(axis=1)
+    var = np.where(valid, (x - mean_x[:, None]) ** 2, 0.0).sum(axis=1)
+    return np.where((count > 1) & (var > 0), cov / np.where(var > 0, var, 1.0), np.nan)
+
+
+def compute_features(levels, features=FEATURES, top=5, dtype=np.float64):
+    """Book features of stacked price levels
+
+    Volume, VWAP and imbalance use the `top` levels of each side. The slope is the least
+    squares slope of the cumulative amount against the distance from the mid over all
+    stacked levels, in amount per unit of price. Features that cannot be computed, e.g.
+    on an empty side, are NaN.
+
+    :param levels: array as returned by `stack_books`, any leading shape
+    :type levels: numpy.ndarray
+    :param features: names of the features to compute, in output order, see `FEATURES`
+    :type features: list
+    :param top: number of levels per side used for volume, VWAP and imbalance
+    :type top: int
+    :param dtype: dtype of the result, float32 halves its size
+    :type dtype: numpy.dtype
+
+    :return: array of shape (..., len(features))
+
+    :raises: ValueError
+
+    """
+
+    unknown = [f for f in features if f not in FEATURES]
+    if unknown:
+        raise ValueError('Unknown features: {}'.format(', '.join(unknown)))
+
+    shape = levels.shape[:-2]
+    levels = levels.reshape((-1,) + levels.shape[-2:])
+    bid_prices, bid_amounts = levels[:, BID_PRICE], levels[:, BID_AMOUNT]
+    ask_prices, ask_amounts = levels[:, ASK_PRICE], levels[:, ASK_AMOUNT]
+
+    best_bid = bid_prices[:, 0]
+    best_ask = ask_prices[:, 0]
+    mid = (best_bid + best_ask) / 2
+    bid_volume = bid_amounts[:, :top].sum(axis=1)
+    ask_volume = ask_amounts[:, :top].sum(axis=1)
+    values = {'best_bid': best_bid, 'best_ask': best_ask, 'mid': mid, 'bid_volume': bid_volume,
+              'ask_volume': ask_volume}
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        wanted = set(features)
+        if 'spread' in wanted or 'spread_bps' in wanted:
+            values['spread'] = best_ask - best_bid
+            values['spread_bps'] = values['spread'] / mid * 10000
+        if 'microprice' in wanted:
+            top_bid, top_ask = bid_amounts[:, 0], ask_amounts[:, 0]
+            values['microprice'] = (best_bid * top_ask + best_ask * top_bid) / (top_bid + top_ask)
+        if 'imbalance' in wanted:
+            values['imbalance'] = (bid_volume - ask_volume) / (bid_volume + ask_volume)
+        if 'bid_vwap' in wanted:
+            values['bid_vwap'] = np.nansum(bid_prices[:, :top] * bid_amounts[:, :top], axis=1) / bid_volume
+        if 'ask_vwap' in wanted:
+            values['ask_vwap'] = np.nansum(ask_prices[:, :top] * ask_amounts[:, :top], axis=1) / ask_volume
+        if 'bid_slope' in wanted:
+            values['bid_slope'] = _slope(mid[:, None] - bid_prices, bid_amounts)
+        if 'ask_slope' in wanted:
+            values['ask_slope'] = _slope(ask_prices - mid[:, None], ask_amounts)
+
+    res = np.empty((len(levels), len(features)), dtype=dtype)
+    for i, name in enumerate(features):
+        res[:, i] = values[name]
+    return res.reshape(shape + (len(features),))
+
+
+def book_features(books, features=FEATURES, depth=10, top=5, dtype=np.float64):
+    """Book features of many order books at once
+
+    :param books: order book dicts as returned by `get_order_book`
+    :type books: list
+
+    See `stack_books` and `compute_features` for the other parameters.
+
+    .. code:: python
+
+        symbols = ['ETH-BTC', 'EOS-BTC', 'BTC-USDT']
+        books = client.map_concurrent('get_order_book', symbols)
+        res = book_features(books, features=('microprice', 'imbalance', 'spread_bps'))
+        # imbalance of EOS-BTC
+        res[1, 1]
+
+    :return: array of shape (books, len(features))
+
+    """
+
+    return compute_features(stack_books(books, depth), features, top, dtype)
+
+
+def feature_history(snapshots, features=FEATURES, depth=10, top=5, dtype=np.float64):
+    """Book features over stored depth snapshots, computed in a single batch
+
+    :param snapshots: iterable of (timestamp, books) tuples, books is a list with the
+        same markets in the same order for every timestamp, or a single book
+    :type snapshots: iterable
+
+    See `stack_books` and `compute_features` for the other parameters.
+
+    .. code:: python
+
+        res = feature_history(stored_snapshots, features=('mid', 'imbalance'))
+        # imbalance of the first market over time
+        res['features'][:, 0, 1]
+
+    :return: dict with a `timestamp` array and a `features` array of shape
+        (snapshots, markets, len(features))
+
+    :raises: ValueError
+
+    """
+
+    timestamps = []
+    books = []
+    markets = None
+    for timestamp, snapshot in snapshots:
+        if isinstance(snapshot, dict):
+            snapshot = [snapshot]
+        if markets is None:
+            markets = len(snapshot)
+        elif len(snapshot) != markets:
+            raise ValueError('Snapshot at {} has {} markets, expected {}'.format(timestamp, len(snapshot), markets))
+        timestamps.append(timestamp)
+        books.extend(snapshot)
+
+    levels = stack_books(books, depth).reshape((len(timestamps), markets or 0, 4, depth))
+    return {
+        'timestamp': np.array(timestamps, dtype=np.float64),
+        'features': compute_features(levels, features, top, dtype)
+    }
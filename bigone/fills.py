@@ -0,0 +1,228 @@
+# coding=utf-8
+
+from decimal import Decimal
+
+
+class FillTracker(object):
+    """Incremental fill ingester built on the viewer/trades feed
+
+    Instead of polling `get_order` for every open order, the tracker remembers the
+    cursor of the last trade it processed and only requests newer pages of
+    `get_trades`, so each cycle costs one call regardless of how many orders are open.
+
+    Without a cursor the tracker starts from the newest trade, older trades are never
+    replayed. Start it before placing the orders it tracks so no fill is missed.
+
+    .. code:: python
+
+        tracker = FillTracker(client, 'ETH-BTC')
+        tracker.start()
+
+        order = client.create_order('ETH-BTC', Client.SIDE_BID, '0.01', '10')
+        tracker.track(order)
+
+        for event in tracker.poll():
+            print(event['order_id'], event['filled_amount'], event['avg_deal_price'])
+
+    """
+
+    STATE_PENDING = 'PENDING'
+    STATE_FILLED = 'FILLED'
+
+    def __init__(self, client, symbol=None, page_size=50, callback=None, cursor=None):
+        """Fill tracker constructor
+
+        :param client: Client instance used to fetch trades
+        :type client: bigone.client.Client
+        :param symbol: optional - restrict to a single market
+        :type symbol: str
+        :param page_size: number of trades to request per page
+        :type page_size: int
+        :param callback: optional - called with each fill event
+        :type callback: function
+        :param cursor: optional - trade cursor to resume from, the newest trade by default
+        :type cursor: str
+
+        """
+
+        self._client = client
+        self.symbol = symbol
+        self.page_size = page_size
+        self.callback = callback
+        self.cursor = cursor
+        self._started = False
+        self._orders = {}
+
+    def start(self):
+        """Set the cursor to the newest trade unless one was given or restored
+
+        Called by `track` and `poll` if needed.
+
+        :raises:  BigoneRequestException, BigoneAPIException
+
+        """
+
+        if self._started or self.cursor is not None:
+            return
+        res = self._client.get_trades(self.symbol, last=1)
+        edges = res.get('edges', [])
+        if edges and edges[-1].get('cursor'):
+            self.cursor = edges[-1]['cursor']
+        end_cursor = res.get('page_info', {}).get('end_cursor')
+        if end_cursor:
+            self.cursor = end_cursor
+        self._started = True
+
+    def track(self, order):
+        """Start tracking fills for an order
+
+        :param order: order dict as returned by `create_order` or `get_order`
+        :type order: dict
+
+        :raises:  BigoneRequestException, BigoneAPIException
+
+        """
+
+        self.start()
+        filled = Decimal(order.get('filled_amount') or '0')
+        avg_price = Decimal(order.get('avg_deal_price') or '0')
+        self._orders[str(order['id'])] = {
+            'id': order['id'],
+            'market_uuid': order.get('market_uuid'),
+            'amount': Decimal(order['amount']) if order.get('amount') else None,
+            'filled_amount': filled,
+            'notional': filled * avg_price,
+            'state': order.get('state', self.STATE_PENDING)
+        }
+
+    def untrack(self, order_id):
+        """Stop tracking fills for an order
+
+        :param order_id: Id of order
+        :type order_id: str
+
+        """
+
+        self._orders.pop(str(order_id), None)
+
+    def tracked_orders(self):
+        """Ids of orders currently being tracked
+
+        :return: list of order ids
+
+        """
+
+        return [o['id'] for o in self._orders.values()]
+
+    def get_state(self):
+        """Cursor and tracked orders for a snapshot"""
+
+        orders = []
+        for order in self._orders.values():
+            orders.append(dict(order, amount=None if order['amount'] is None else str(order['amount']),
+                               filled_amount=str(order['filled_amount']), notional=str(order['notional'])))
+        return {'cursor': self.cursor, 'orders': orders}
+
+    def set_state(self, state):
+        """Restore the cursor and tracked orders from a snapshot"""
+
+        self.cursor = state['cursor']
+        self._started = True
+        self._orders = {}
+        for order in state['orders']:
+            self._orders[str(order['id'])] = dict(
+                order, amount=None if order['amount'] is None else Decimal(order['amount']),
+                filled_amount=Decimal(order['filled_amount']), notional=Decimal(order['notional']))
+
+    def poll(self):
+        """Fetch trades newer than the current cursor and attribute them to orders
+
+        Pages through `get_trades` until no further pages are available.
+
+        :return: list of fill event dicts
+
+        .. code:: python
+
+            [
+                {
+                    "order_id": 10,
+                    "trade_id": 1,
+                    "market_uuid": "BTC-EOS",
+                    "price": Decimal("46.145"),
+                    "amount": Decimal("0.246548"),
+                    "filled_amount": Decimal("0.246548"),
+                    "avg_deal_price": Decimal("46.145"),
+                    "state": "PENDING"
+                }
+            ]
+
+        :raises:  BigoneRequestException, BigoneAPIException
+
+        """
+
+        self.start()
+        events = []
+        while True:
+            res = self._client.get_trades(self.symbol, after=self.cursor, first=self.page_size)
+            edges = res.get('edges', [])
+            for edge in edges:
+                for event in self._apply_trade(edge['node']):
+                    events.append(event)
+                    if self.callback:
+                        self.callback(event)
+                if edge.get('cursor'):
+                    self.cursor = edge['cursor']
+
+            page_info = res.get('page_info', {})
+            if page_info.get('end_cursor'):
+                self.cursor = page_info['end_cursor']
+            if not edges or not page_info.get('has_next_page'):
+                break
+
+        return events
+
+    def _apply_trade(self, trade):
+        events = []
+        for order_id in _trade_order_ids(trade):
+            order = self._orders.get(str(order_id))
+            if order is not None:
+                events.append(self._apply_fill(order, trade))
+        return events
+
+    def _apply_fill(self, order, trade):
+        price = Decimal(trade['price'])
+        amount = Decimal(trade['amount'])
+        order['filled_amount'] += amount
+        order['notional'] += price * amount
+        if order['amount'] is not None and order['filled_amount'] >= order['amount']:
+            order['state'] = self.STATE_FILLED
+            del self._orders[str(order['id'])]
+
+        return {
+            'order_id': order['id'],
+            'trade_id': trade.get('id'),
+            'market_uuid': trade.get('market_uuid', order['market_uuid']),
+            'price': price,
+            'amount': amount,
+            'filled_amount': order['filled_amount'],
+            'avg_deal_price': order['notional'] / order['filled_amount'],
+            'state': order['state']
+        }
+
+
+def _trade_order_ids(trade):
+    """Find the ids of the viewer's orders that took part in a trade"""
+
+    if trade.get('order_id') is not None:
+        return [trade['order_id']]
+
+    side = trade.get('viewer_side')
+    if side == 'BID':
+        keys = ['bid_order_id']
+    elif side == 'ASK':
+        keys = ['ask_order_id']
+    elif side == 'SELF_TRADING':
+        keys = ['bid_order_id', 'ask_order_id']
+    else:
+        keys = []
+    return [trade[k] for k in keys if trade.get(k) is not None]
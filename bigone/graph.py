@@ -0,0 +1,187 @@
+# coding=utf-8
+
+import math
+
+from .helpers import market_id
+
+SIDE_BID = 'BID'
+SIDE_ASK = 'ASK'
+
+
+class ArbitrageGraph(object):
+    """Currency graph over all markets for cross-market arbitrage detection
+
+    Every market adds two edges, buying the base currency with the quote at the ask and
+    selling it for the quote at the bid, weighted by the negative log of the rate so a
+    profitable cycle has a negative total weight. Cycles up to `max_length` are
+    enumerated once when the graph is built and indexed by edge, ticker updates only
+    re-evaluate the cycles that touch a changed edge.
+
+    .. code:: python
+
+        graph = ArbitrageGraph.from_markets(client.get_markets(), fee=0.001)
+
+        while True:
+            graph.update(client.get_tickers())
+            for opportunity in graph.opportunities(min_return=0.001):
+                print(opportunity['path'], opportunity['return'])
+
+    """
+
+    def __init__(self, fee=0.0, max_length=3):
+        """Arbitrage graph constructor
+
+        :param fee: fee charged on each trade as a fraction
+        :type fee: float
+        :param max_length: longest cycle to detect, 3 for triangular arbitrage
+        :type max_length: int
+
+        """
+
+        self.fee = fee
+        self.max_length = max_length
+        self._fee_weight = -math.log(1 - fee)
+        self._markets = {}
+        self._edges = []
+        self._weights = []
+        self._adjacency = {}
+        self._cycles = []
+        self._cycle_weights = []
+        self._edge_cycles = []
+        self._negative = set()
+
+    @classmethod
+    def from_markets(cls, markets, **kwargs):
+        """Build a graph from markets as returned by `get_markets`"""
+
+        graph = cls(**kwargs)
+        for market in markets:
+            graph.add_market(market)
+        graph.build()
+        return graph
+
+    def add_market(self, market):
+        """Add the buy and sell edges of a market, call `build` once all are added"""
+
+        base = market['baseAsset']['symbol']
+        quote = market['quoteAsset']['symbol']
+        symbol = market_id(market)
+        buy = self._add_edge(quote, base, symbol, SIDE_BID)
+        sell = self._add_edge(base, quote, symbol, SIDE_ASK)
+        self._markets[symbol] = (buy, sell)
+        if market.get('uuid'):
+            self._markets[market['uuid']] = (buy, sell)
+
+    def _add_edge(self, source, target, symbol, side):
+        edge = len(self._edges)
+        self._edges.append((source, target, symbol, side))
+        self._weights.append(float('inf'))
+        self._adjacency.setdefault(source, []).append(edge)
+        self._adjacency.setdefault(target, [])
+        return edge
+
+    def build(self):
+        """Enumerate cycles and index them by edge"""
+
+        currencies = sorted(self._adjacency)
+        rank = dict((c, i) for i, c in enumerate(currencies))
+        cycles = []
+
+        def extend(start, path, current):
+            for edge in self._adjacency[current]:
+                target = self._edges[edge][1]
+                if target == start and len(path) >= 2:
+                    cycles.append(tuple(path + [edge]))
+                elif len(path) + 1 < self.max_length and rank[target] > rank[start] and all(
+                        self._edges[e][0] != target for e in path):
+                    extend(start, path + [edge], target)
+
+        # each cycle is found once, from its lowest ranked currency
+        for start in currencies:
+            extend(start, [], start)
+
+        self._cycles = cycles
+        self._cycle_weights = [float('inf')] * len(cycles)
+        self._edge_cycles = [[] for _ in self._edges]
+        for i, cycle in enumerate(cycles):
+            for edge in cycle:
+                self._edge_cycles[edge].append(i)
+            self._cycle_weights[i] = sum(self._weights[e] for e in cycle)
+        self._negative = set(i for i, w in enumerate(self._cycle_weights) if w < 0)
+
+    def __len__(self):
+        return len(self._cycles)
+
+    def update(self, tickers):
+        """Update edge weights from tickers as returned by `get_tickers`
+
+        :return: number of cycles re-evaluated
+
+        """
+
+        changed = set()
+        for ticker in tickers:
+            edges = self._markets.get(ticker.get('market_uuid'))
+            if edges is None:
+                continue
+            buy, sell = edges
+            ask = (ticker.get('ask') or {}).get('price')
+            bid = (ticker.get('bid') or {}).get('price')
+            self._set_weight(buy, math.log(float(ask)) + self._fee_weight if ask and float(ask) > 0 else None, changed)
+            self._set_weight(sell, -math.log(float(bid)) + self._fee_weight if bid and float(bid) > 0 else None, changed)
+
+        cycles = set()
+        for edge in changed:
+            cycles.update(self._edge_cycles[edge])
+        for i in cycles:
+            weight = sum(self._weights[e] for e in self._cycles[i])
+            self._cycle_weights[i] = weight
+            if weight < 0:
+                self._negative.add(i)
+            else:
+                self._negative.discard(i)
+        return len(cycles)
+
+    def _set_weight(self, edge, weight, changed):
+        if weight is None:
+            weight = float('inf')
+        if self._weights[edge] != weight:
+            self._weights[edge] = weight
+            changed.add(edge)
+
+    def opportunities(self, min_return=0.0):
+        """Profitable cycles, best first
+
+        :param min_return: minimum return of the cycle as a fraction
+        :type min_return: float
+
+        :return: list of dicts
+
+        .. code:: python
+
+            [
+                {
+                    "path": ["BTC", "ETH", "EOS", "BTC"],
+                    "markets": ["ETH-BTC", "EOS-ETH", "EOS-BTC"],
+                    "sides": ["BID", "BID", "ASK"],
+                    "return": 0.0042
+                }
+            ]
+
+        """
+
+        limit = -math.log(1 + min_return)
+        res = []
+        for i in self._negative:
+            weight = self._cycle_weights[i]
+            if weight >= limit:
+                continue
+            edges = [self._edges[e] for e in self._cycles[i]]
+            res.append({
+                'path': [e[0] for e in edges] + [edges[0][0]],
+                'markets': [e[2] for e in edges],
+                'sides': [e[3] for e in edges],
+                'return': math.exp(-weight) - 1
+            })
+        res.sort(key=lambda o: -o['return'])
+        return res
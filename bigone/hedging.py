@@ -0,0 +1,170 @@
+# coding=utf-8
+
+import collections
+import threading
+import time
+
+from .exceptions import BigoneTimeoutException
+
+
+class HedgePolicy(object):
+    """Hedged requests for idempotent GETs
+
+    When an attempt has not answered within the `percentile` of recent latencies for its
+    endpoint, a duplicate request is sent on another pooled connection and whichever
+    answers first is used. With a deadline the call raises `BigoneTimeoutException`
+    once it has passed, regardless of how many attempts are in flight.
+
+    .. code:: python
+
+        client = Client(api_key, api_secret, hedge=HedgePolicy(percentile=0.95), deadline=2.0)
+        book = client.get_order_book('ETH-BTC', deadline=0.5)
+
+        print(client.hedge.stats())
+
+    """
+
+    def __init__(self, percentile=0.95, initial_delay=0.25, min_delay=0.005, max_delay=2.0,
+                 window=200, min_samples=20, max_workers=16):
+        """Hedge policy constructor
+
+        :param percentile: latency percentile after which a hedge is sent, between 0 and 1
+        :type percentile: float
+        :param initial_delay: hedge delay used until `min_samples` latencies are recorded
+        :type initial_delay: float
+        :param min_delay: lower bound of the hedge delay in seconds
+        :type min_delay: float
+        :param max_delay: upper bound of the hedge delay in seconds
+        :type max_delay: float
+        :param window: number of recent latencies kept per endpoint
+        :type window: int
+        :param min_samples: latencies needed before the percentile is used
+        :type min_samples: int
+        :param max_workers: maximum requests in flight
+        :type max_workers: int
+
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.window = window
+        self.min_samples = min_samples
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._latencies = {}
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._timeouts = 0
+
+    def record(self, key, latency):
+        """Record the latency of a completed attempt"""
+
+        with self._lock:
+            samples = self._latencies.get(key)
+            if samples is None:
+                samples = self._latencies[key] = collections.deque(maxlen=self.window)
+            samples.append(latency)
+
+    def delay(self, key):
+        """Seconds to wait for an attempt before hedging it"""
+
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+        if len(samples) < self.min_samples:
+            return self.initial_delay
+        value = samples[min(len(samples) - 1, int(self.percentile * len(samples)))]
+        return min(self.max_delay, max(self.min_delay, value))
+
+    def call(self, key, func, deadline=None):
+        """Call `func`, hedging it if it is slower than the learned delay
+
+        :param key: endpoint the latency is tracked under
+        :type key: str
+        :param func: function making the request, called once per attempt
+        :type func: function
+        :param deadline: optional - seconds after which `BigoneTimeoutException` is raised
+        :type deadline: float
+
+        :raises: BigoneTimeoutException
+
+        """
+
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        start = time.time()
+        end = start + deadline if deadline else None
+
+        def remaining():
+            return None if end is None else max(0.0, end - time.time())
+
+        def attempt():
+            attempt_start = time.time()
+            res = func()
+            self.record(key, time.time() - attempt_start)
+            return res
+
+        with self._lock:
+            self._requests += 1
+
+        futures = [self._executor.submit(attempt)]
+        hedge_delay = self.delay(key)
+        left = remaining()
+        done, _ = wait(futures, timeout=hedge_delay if left is None else min(hedge_delay, left))
+        if not done and (left is None or left > hedge_delay):
+            futures.append(self._executor.submit(attempt))
+            with self._lock:
+                self._hedges += 1
+
+        pending = set(futures)
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                with self._lock:
+                    self._timeouts += 1
+                raise BigoneTimeoutException('Deadline of {}s exceeded for {}'.format(deadline, key))
+            for future in done:
+                if future.exception() is None:
+                    if future is not futures[0]:
+                        with self._lock:
+                            self._hedge_wins += 1
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def stats(self):
+        """Hedge rate and wins
+
+        :return: dict
+
+        .. code:: python
+
+            {
+                "requests": 1000,
+                "hedges": 48,
+                "hedge_wins": 31,
+                "hedge_rate": 0.048,
+                "win_rate": 0.6458,     # share of hedges that answered first
+                "timeouts": 2,
+                "delays": {"markets/*/depth": 0.182}
+            }
+
+        """
+
+        with self._lock:
+            keys = list(self._latencies)
+            res = {
+                'requests': self._requests,
+                'hedges': self._hedges,
+                'hedge_wins': self._hedge_wins,
+                'hedge_rate': float(self._hedges) / self._requests if self._requests else None,
+                'win_rate': float(self._hedge_wins) / self._hedges if self._hedges else None,
+                'timeouts': self._timeouts
+            }
+        res['delays'] = dict((k, self.delay(k)) for k in keys)
+        return res
@@ -0,0 +1,65 @@
+# coding=utf-8
+
+import calendar
+import re
+import time
+
+_ID_SEGMENT = re.compile(r'(?<=/)[^/]*[^a-z_/][^/]*(?=/|$)')
+
+
+def market_id(market):
+    """Convert a market from `get_markets` to the symbol form used by the endpoints
+
+    :param market: market dict as returned by `get_markets`
+    :type market: dict
+
+    .. code:: python
+
+        market_id({'name': 'BTG/BTC', ...})
+        # 'BTG-BTC'
+
+    :return: str
+
+    """
+
+    return market['name'].replace('/', '-')
+
+
+def parse_timestamp(value):
+    """Convert an API timestamp to seconds since the epoch
+
+    Handles fractional seconds of any precision, e.g. nanoseconds.
+
+    :param value: timestamp e.g. "2018-03-15T16:13:45.610463Z"
+    :type value: str
+
+    .. code:: python
+
+        parse_timestamp('2018-03-15T16:13:45.610463Z')
+        # 1521130425.610463
+
+    :return: float
+
+    """
+
+    value = value.rstrip('Z')
+    seconds, _, fraction = value.partition('.')
+    res = calendar.timegm(time.strptime(seconds, '%Y-%m-%dT%H:%M:%S'))
+    if fraction:
+        res += float('0.' + fraction)
+    return res
+
+
+def endpoint_key(path):
+    """Group request paths by endpoint
+
+    .. code:: python
+
+        endpoint_key('markets/ETH-BTC/depth')
+        # 'markets/*/depth'
+
+    :return: str
+
+    """
+
+    return _ID_SEGMENT.sub('*', path)
@@ -0,0 +1,160 @@
+# coding=utf-8
+
+import collections
+import json
+import threading
+
+
+class HttpCache(object):
+    """Validators and decoded bodies of public GET responses for conditional requests
+
+    Responses carrying an `ETag` or `Last-Modified` header are kept, the next request for
+    the same URL sends `If-None-Match` / `If-Modified-Since` and a 304 answer is served
+    from the cache without downloading the body again. Bodies are kept as compact JSON
+    and every hit decodes its own copy, callers may modify what they get.
+
+    .. code:: python
+
+        client = Client(api_key, api_secret, http_cache=True)
+        markets = client.get_markets()
+        # revalidated, served from the cache when unchanged
+        markets = client.get_markets()
+
+    """
+
+    def __init__(self, max_entries=1024):
+        """HTTP cache constructor
+
+        :param max_entries: number of responses kept, least recently used are dropped first
+        :type max_entries: int
+
+        """
+
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(uri, params=None):
+        if not params:
+            return uri
+        return '{}?{}'.format(uri, '&'.join('{}={}'.format(k, params[k]) for k in sorted(params)))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.pop(key)
+                self._entries[key] = entry
+            return entry
+
+    @staticmethod
+    def data(entry):
+        """Decoded body of a cached entry, a new object on every call"""
+
+        return json.loads(entry['body'])
+
+    def validators(self, key):
+        """Conditional request headers for a cached response
+
+        :return: dict of headers, empty when nothing is cached
+
+        """
+
+        entry = self.get(key)
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, key, response, data):
+        """Keep a decoded response if it carries validators
+
+        The data is serialized before returning, later changes made by the caller are not cached.
+
+        """
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = {'etag': etag, 'last_modified': last_modified,
+                                  'body': json.dumps(data, separators=(',', ':'))}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_state(self):
+        """Cached entries for a snapshot, oldest first"""
+
+        with self._lock:
+            return [[key, entry] for key, entry in self._entries.items()]
+
+    def set_state(self, state):
+        """Restore entries from a snapshot, they are revalidated on their next request"""
+
+        with self._lock:
+            self._entries.clear()
+            for key, entry in state:
+                self._entries[key] = entry
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TransferStats(object):
+    """Bytes on the wire per endpoint
+
+    `wire_bytes` counts response bodies as received, before decompression, `body_bytes`
+    counts them after decompression.
+
+    """
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, key, response):
+        body_bytes = len(response.content)
+        try:
+            wire_bytes = response.raw.tell()
+        except (AttributeError, TypeError, ValueError):
+            wire_bytes = body_bytes
+        not_modified = 1 if response.status_code == 304 else 0
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = {'requests': 0, 'wire_bytes': 0, 'body_bytes': 0, 'not_modified': 0}
+            stats['requests'] += 1
+            stats['wire_bytes'] += wire_bytes or 0
+            stats['body_bytes'] += body_bytes
+            stats['not_modified'] += not_modified
+
+    def stats(self):
+        """Totals per endpoint
+
+        :return: dict
+
+        .. code:: python
+
+            {
+                "markets": {"requests": 10, "wire_bytes": 9211, "body_bytes": 68830, "not_modified": 9},
+                "markets/*/depth": {"requests": 120, "wire_bytes": 612301, "body_bytes": 4012954, "not_modified": 0}
+            }
+
+        """
+
+        with self._lock:
+            return dict((k, dict(v)) for k, v in self._endpoints.items())
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
@@ -0,0 +1,246 @@
+# coding=utf-8
+
+import re
+from decimal import Decimal, InvalidOperation
+
+from .helpers import market_id
+
+_POW10 = [10 ** i for i in range(64)]
+
+_DECIMAL = re.compile(r'[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?\Z')
+
+
+def parse_fixed(value, scale):
+    """Parse a decimal string into a fixed-point integer
+
+    The result is the value multiplied by 10 ** scale. Parsing is exact, a value with
+    non-zero digits beyond `scale` raises a ValueError rather than being rounded.
+
+    A single call is several times slower than constructing a `Decimal` on CPython 3,
+    whose decimal module is implemented in C. The gain is integer arithmetic on the
+    result, repeated values should go through a memoising `MarketCodec`.
+
+    :param value: decimal value e.g. "46.1450000000000000"
+    :type value: str
+    :param scale: number of decimal places to keep
+    :type scale: int
+
+    .. code:: python
+
+        parse_fixed('46.1450000000000000', 8)
+        # 4614500000
+
+    :return: int
+
+    :raises: ValueError
+
+    """
+
+    try:
+        whole, _, frac = value.partition('.')
+    except AttributeError:
+        return _parse_decimal(value, scale)
+    # int() would accept surrounding whitespace and underscores
+    unsigned = whole[1:] if whole[:1] in ('+', '-') else whole
+    if not unsigned.isdigit() or (frac and not frac.isdigit()):
+        return _parse_decimal(value, scale)
+
+    digits = len(frac)
+    if digits > scale:
+        if frac[scale:].strip('0'):
+            raise ValueError('{} has more than {} decimal places'.format(value, scale))
+        return int(whole + frac[:scale])
+    shift = scale - digits
+    return int(whole + frac) * (_POW10[shift] if shift < len(_POW10) else 10 ** shift)
+
+
+def _parse_decimal(value, scale):
+    """Slow path for exponent notation and non string values"""
+
+    # Decimal itself accepts surrounding whitespace and underscores
+    if _DECIMAL.match(str(value)) is None:
+        raise ValueError('Invalid decimal value: {}'.format(value))
+    try:
+        scaled = Decimal(str(value)).scaleb(scale)
+        if scaled != scaled.to_integral_value():
+            raise ValueError('{} has more than {} decimal places'.format(value, scale))
+        return int(scaled)
+    except InvalidOperation:
+        raise ValueError('Invalid decimal value: {}'.format(value))
+
+
+def format_fixed(value, scale):
+    """Format a fixed-point integer as a decimal string
+
+    :param value: fixed-point value
+    :type value: int
+    :param scale: number of decimal places the value is scaled by
+    :type scale: int
+
+    .. code:: python
+
+        format_fixed(4614500000, 8)
+        # '46.14500000'
+
+    :return: str
+
+    """
+
+    if scale == 0:
+        return str(value)
+    sign = '-' if value < 0 else ''
+    digits = str(abs(value)).rjust(scale + 1, '0')
+    return '{}{}.{}'.format(sign, digits[:-scale], digits[-scale:])
+
+
+class MarketCodec(object):
+    """Fixed-point conversion of prices and amounts for a single market
+
+    Prices are scaled by the market `quoteScale` and amounts by the `baseScale`.
+    Parsed strings are memoised, depth and trade payloads repeat the same price levels
+    from one snapshot to the next so most values are converted with a dict lookup.
+
+    .. code:: python
+
+        codecs = market_codecs(client.get_markets())
+        codec = codecs['ETH-BTC']
+
+        book = codec.parse_depth(client.get_order_book('ETH-BTC'))
+        best_bid_price, best_bid_amount = book['bids'][0]
+
+        client.create_order('ETH-BTC', Client.SIDE_BID, codec.format_price(price), codec.format_amount(amount))
+
+    """
+
+    def __init__(self, price_scale, amount_scale, cache_size=65536):
+        """Market codec constructor
+
+        :param price_scale: decimal places of prices
+        :type price_scale: int
+        :param amount_scale: decimal places of amounts
+        :type amount_scale: int
+        :param cache_size: maximum number of memoised strings per field
+        :type cache_size: int
+
+        """
+
+        self.price_scale = price_scale
+        self.amount_scale = amount_scale
+        self.cache_size = cache_size
+        self._price_cache = {}
+        self._amount_cache = {}
+
+    @classmethod
+    def from_market(cls, market, **kwargs):
+        """Create a codec from a market dict as returned by `get_markets`"""
+
+        return cls(market['quoteScale'], market['baseScale'], **kwargs)
+
+    def parse_price(self, value):
+        return self._parse(value, self.price_scale, self._price_cache)
+
+    def parse_amount(self, value):
+        return self._parse(value, self.amount_scale, self._amount_cache)
+
+    def format_price(self, value):
+        return format_fixed(value, self.price_scale)
+
+    def format_amount(self, value):
+        return format_fixed(value, self.amount_scale)
+
+    def parse_prices(self, values):
+        """Batch convert a list of price strings"""
+
+        return self._parse_many(values, self.price_scale, self._price_cache)
+
+    def parse_amounts(self, values):
+        """Batch convert a list of amount strings"""
+
+        return self._parse_many(values, self.amount_scale, self._amount_cache)
+
+    def parse_depth(self, book):
+        """Convert an order book as returned by `get_order_book`
+
+        :param book: order book dict
+        :type book: dict
+
+        :return: dict with bids and asks as lists of (price, amount) tuples
+
+        .. code:: python
+
+            {
+                "market_uuid": "BTC-EOS",
+                "bids": [(4200000000, 2333363711)],
+                "asks": [(4500000000, 419332834640)]
+            }
+
+        """
+
+        res = {'market_uuid': book.get('market_uuid')}
+        for side in ('bids', 'asks'):
+            levels = book.get(side, [])
+            prices = self.parse_prices([level['price'] for level in levels])
+            amounts = self.parse_amounts([level['amount'] for level in levels])
+            res[side] = list(zip(prices, amounts))
+        return res
+
+    def parse_trades(self, trades):
+        """Convert trades as returned by `get_market_trades` or `get_trades`
+
+        :param trades: trades dict with edges, or a list of trade nodes
+        :type trades: dict or list
+
+        :return: list of (id, taker_side, price, amount) tuples
+
+        """
+
+        if isinstance(trades, dict):
+            nodes = [e['node'] for e in trades.get('edges', [])]
+        else:
+            nodes = trades
+        prices = self.parse_prices([n['price'] for n in nodes])
+        amounts = self.parse_amounts([n['amount'] for n in nodes])
+        return [(n['id'], n.get('taker_side'), p, a) for n, p, a in zip(nodes, prices, amounts)]
+
+    def _parse(self, value, scale, cache):
+        res = cache.get(value)
+        if res is None:
+            res = parse_fixed(value, scale)
+            self._store(cache, value, res)
+        return res
+
+    def _parse_many(self, values, scale, cache):
+        res = list(map(cache.get, values))
+        if None in res:
+            for i, value in enumerate(values):
+                if res[i] is None:
+                    res[i] = parse_fixed(value, scale)
+                    self._store(cache, value, res[i])
+        return res
+
+    def _store(self, cache, value, res):
+        if len(cache) >= self.cache_size:
+            cache.clear()
+        cache[value] = res
+
+
+def market_codecs(markets, **kwargs):
+    """Build codecs for every market returned by `get_markets`
+
+    Codecs are keyed by both market symbol (e.g. ETH-BTC) and market uuid.
+
+    .. code:: python
+
+        codecs = market_codecs(client.get_markets())
+
+    :return: dict of MarketCodec
+
+    """
+
+    res = {}
+    for market in markets:
+        codec = MarketCodec.from_market(market, **kwargs)
+        res[market_id(market)] = codec
+        if market.get('uuid'):
+            res[market['uuid']] = codec
+    return res
@@ -0,0 +1,134 @@
+# coding=utf-8
+
+import json
+import re
+
+from .exceptions import BigoneRequestException, BigoneTimeoutException
+
+_NUMBER = re.compile(r'^[0-9]+(\.[0-9]+)?\Z')
+
+
+class OrderTemplate(object):
+    """Precompiled order placement request for one market
+
+    The URL, headers and the static parts of the JSON body are prepared once. Placing an
+    order only serializes side, price and amount into the body, signs with the client's
+    `Signer` and sends the prepared request on the session's pooled connection, skipping
+    the generic argument handling of `Client.create_order`. Orders go through the client's
+    circuit breaker, clock sync and deadline like any other call. Requests go straight to the
+    session's adapter, session hooks and response cookies are not processed. Requires the
+    default `RequestsTransport`, clients on other transports and `AsyncClient` raise
+    `BigoneRequestException`.
+
+    .. code:: python
+
+        template = client.order_template('ETH-BTC')
+        template.warm()
+
+        order = template.create_order(Client.SIDE_BID, '0.01', '10')
+
+    """
+
+    SIDES = ('BID', 'ASK')
+
+    def __init__(self, client, symbol):
+        """Order template constructor, use `Client.order_template`
+
+        :param client: Client used to sign and send orders
+        :type client: bigone.client.Client
+        :param symbol: Name of symbol
+        :type symbol: str
+
+        :raises: BigoneRequestException
+
+        """
+
+        from .transport import RequestsTransport
+
+        if not isinstance(client.transport, RequestsTransport):
+            raise BigoneRequestException('Order templates require a RequestsTransport, the client uses {}'.format(
+                type(client.transport).__name__))
+
+        self._client = client
+        self.symbol = symbol
+        self.path = 'viewer/orders'
+        self.url = client._create_uri(self.path)
+        prefix = '{{"market_id":{},"side":"'.format(json.dumps(symbol)).encode('utf-8')
+        self._parts = dict((side, prefix + side.encode('utf-8') + b'","price":"') for side in self.SIDES)
+        self._prepared = {}
+
+    def _prepare(self, session):
+        import requests
+
+        request = requests.Request('POST', self.url, data=b'{}', headers={'Content-Type': 'application/json'})
+        prepared = session.prepare_request(request)
+        # proxies, verify and cert are resolved from the environment once instead of per send
+        settings = session.merge_environment_settings(self.url, {}, False, None, None)
+        entry = (session, prepared, session.get_adapter(self.url), settings)
+        self._prepared[id(session)] = entry
+        return entry
+
+    def body(self, side, price, amount):
+        """JSON body of an order
+
+        :return: bytes
+
+        :raises: BigoneRequestException
+
+        """
+
+        if not isinstance(price, str):
+            price = str(price)
+        if not isinstance(amount, str):
+            amount = str(amount)
+        if side not in self._parts or not _NUMBER.match(price) or not _NUMBER.match(amount):
+            raise BigoneRequestException('Invalid order {} {} @ {}'.format(side, amount, price))
+        return b''.join((self._parts[side], price.encode('ascii'), b'","amount":"', amount.encode('ascii'), b'"}'))
+
+    def warm(self):
+        """Open a pooled connection ahead of the first order"""
+
+        self._client.get_ticker(self.symbol)
+
+    def create_order(self, side, price, amount):
+        """Create a new order
+
+        :param side:  side of order (BID or ASK)
+        :type side: str
+        :param price: Price as string
+        :type price: str
+        :param amount: Amount as string
+        :type amount: str
+
+        :return: dict as returned by `Client.create_order`
+
+        :raises:  BigoneRequestException, BigoneAPIException
+
+        """
+
+        body = self.body(side, price, amount)
+        client = self._client
+
+        def attempt():
+            # with a deadline this runs on a worker thread, which has its own session when threadsafe
+            session = client.session
+            entry = self._prepared.get(id(session))
+            if entry is None or entry[0] is not session:
+                entry = self._prepare(session)
+            _, template, adapter, settings = entry
+
+            request = template.copy()
+            request.body = body
+            request.headers['Content-Length'] = str(len(body))
+            request.headers['Authorization'] = 'Bearer {}'.format(client.signer.sign())
+            try:
+                # the adapter is called directly, the session would resolve proxies again on each send
+                return adapter.send(request, timeout=client.deadline, **settings)
+            except Exception as e:
+                from requests.exceptions import Timeout
+                if isinstance(e, Timeout):
+                    raise BigoneTimeoutException('Request to {} timed out: {}'.format(self.path, e))
+                raise
+
+        response = client._dispatch('post', self.path, lambda: client._transmit(self.path, attempt), client.deadline)
+        return client._handle_response(response)
@@ -0,0 +1,149 @@
+# coding=utf-8
+
+import json
+
+from .depth import book_metrics
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+
+def _analyse(raw, depth):
+    res = json.loads(raw.decode('utf-8'))
+    return book_metrics(res.get('data', res), depth)
+
+
+def _analyse_shared(name, tasks, depth):
+    """Worker entry point, decodes responses straight out of a shared memory block"""
+
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return [(symbol, _analyse(bytes(shm.buf[offset:offset + size]), depth)) for symbol, offset, size in tasks]
+    finally:
+        shm.close()
+
+
+class DepthPipeline(object):
+    """Fetch depth for many markets and compute book metrics on a process pool
+
+    I/O stays on threads in the calling process while decoding and analytics run in worker
+    processes so they are not limited by the GIL. Raw response bytes are written into one
+    shared memory block per cycle and workers read them in place, only offsets and the
+    resulting metrics cross the process boundary.
+
+    Requires Python 3.8+ for shared memory, with `processes=0` everything runs in the calling
+    process.
+
+    .. code:: python
+
+        client = Client(api_key, api_secret, threadsafe=True)
+        symbols = [market_id(m) for m in client.get_markets()]
+
+        with DepthPipeline(client, processes=4) as pipeline:
+            while True:
+                metrics = pipeline.run(symbols)
+                print(metrics['ETH-BTC']['imbalance'])
+
+    """
+
+    def __init__(self, client, processes=None, io_workers=16, depth=10, chunks_per_process=4):
+        """Depth pipeline constructor
+
+        :param client: Client used for requests, ideally created with `threadsafe=True`
+        :type client: bigone.client.Client
+        :param processes: number of worker processes, defaults to the number of cores, 0 disables the pool
+        :type processes: int
+        :param io_workers: number of threads fetching depth
+        :type io_workers: int
+        :param depth: number of levels per side used for metrics
+        :type depth: int
+        :param chunks_per_process: number of tasks each worker gets per cycle
+        :type chunks_per_process: int
+
+        """
+
+        self._client = client
+        self.io_workers = io_workers
+        self.depth = depth
+        self.chunks_per_process = chunks_per_process
+        self._pool = None
+        if processes != 0 and shared_memory is not None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(max_workers=processes)
+            self.processes = self._pool._max_workers
+        else:
+            self.processes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Shut down the worker processes"""
+
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def fetch(self, symbols):
+        """Fetch raw depth responses for symbols
+
+        :return: list of response bytes in the same order as `symbols`
+
+        :raises:  BigoneRequestException, BigoneAPIException
+
+        """
+
+        return self._client.map_concurrent(self._fetch_raw, symbols, max_workers=self.io_workers)
+
+    def _fetch_raw(self, symbol):
+        response = self._client._send('get', 'markets/{}/depth'.format(symbol), False)
+        content = response.content
+        # error bodies can come with a 2xx status, a byte search keeps decoding off this thread
+        if not str(response.status_code).startswith('2') or b'"errors"' in content or b'"msg"' in content:
+            self._client._handle_response(response)
+        return content
+
+    def run(self, symbols):
+        """Fetch depth for all symbols and compute book metrics
+
+        :param symbols: list of market symbols or uuids
+        :type symbols: list
+
+        :return: dict of symbol to metrics as returned by `bigone.depth.book_metrics`
+
+        :raises:  BigoneRequestException, BigoneAPIException
+
+        """
+
+        raws = self.fetch(symbols)
+        if self._pool is None:
+            return dict((symbol, _analyse(raw, self.depth)) for symbol, raw in zip(symbols, raws))
+
+        total = sum(len(raw) for raw in raws)
+        shm = shared_memory.SharedMemory(create=True, size=max(total, 1))
+        try:
+            tasks = []
+            offset = 0
+            for symbol, raw in zip(symbols, raws):
+                shm.buf[offset:offset + len(raw)] = raw
+                tasks.append((symbol, offset, len(raw)))
+                offset += len(raw)
+
+            chunk_count = max(1, self.processes * self.chunks_per_process)
+            chunk_size = max(1, -(-len(tasks) // chunk_count))
+            futures = [
+                self._pool.submit(_analyse_shared, shm.name, tasks[i:i + chunk_size], self.depth)
+                for i in range(0, len(tasks), chunk_size)
+            ]
+            res = {}
+            for future in futures:
+                res.update(future.result())
+            return res
+        finally:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,250 @@
+# coding=utf-8
+
+import heapq
+import itertools
+import time
+
+from .helpers import market_id
+
+
+class PollScheduler(object):
+    """Adaptive polling schedule that spreads a request budget across markets
+
+    Markets are weighted by their observed trade rate and how often their ticker
+    changes, each market gets a share of the budget proportional to its weight within
+    `min_interval` and `max_interval`. Deadlines are kept in a priority queue, `due`
+    returns the markets to poll now.
+
+    .. code:: python
+
+        scheduler = PollScheduler(budget=10)
+        scheduler.add_markets(client.get_markets())
+
+        while True:
+            scheduler.observe_tickers(client.get_tickers())
+            for symbol in scheduler.due():
+                trades = client.get_market_trades(symbol)
+                scheduler.observe_trades(symbol, trades)
+            scheduler.rebalance()
+            time.sleep(max(0, scheduler.next_deadline() - time.time()))
+
+        # or drive a DepthCache
+        scheduler.apply(depth_cache)
+
+    """
+
+    def __init__(self, budget, min_interval=0.5, max_interval=60.0, trade_weight=1.0, ticker_weight=1.0,
+                 floor_weight=0.01, decay=0.3):
+        """Poll scheduler constructor
+
+        :param budget: total requests per second to spread across markets
+        :type budget: float
+        :param min_interval: shortest interval a market can be polled at in seconds
+        :type min_interval: float
+        :param max_interval: longest interval a market can be polled at in seconds
+        :type max_interval: float
+        :param trade_weight: weight of trades per second in market activity
+        :type trade_weight: float
+        :param ticker_weight: weight of ticker changes per second in market activity
+        :type ticker_weight: float
+        :param floor_weight: activity every market has so quiet markets are still polled
+        :type floor_weight: float
+        :param decay: smoothing factor of the activity moving averages, between 0 and 1
+        :type decay: float
+
+        """
+
+        self.budget = budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.trade_weight = trade_weight
+        self.ticker_weight = ticker_weight
+        self.floor_weight = floor_weight
+        self.decay = decay
+        self._markets = {}
+        self._queue = []
+        self._seq = itertools.count()
+
+    def add_market(self, symbol, now=None):
+        """Add a market to the schedule, it is due immediately"""
+
+        if symbol in self._markets:
+            return
+        now = time.time() if now is None else now
+        self._markets[symbol] = {
+            'trade_rate': 0.0,
+            'ticker_rate': 0.0,
+            'last_trade_id': None,
+            'last_trade_check': None,
+            'ticker': None,
+            'last_ticker_check': None,
+            'interval': self.max_interval,
+            'deadline': now,
+            'last_poll': None,
+            'version': next(self._seq)
+        }
+        heapq.heappush(self._queue, (now, self._markets[symbol]['version'], symbol))
+        self.rebalance(now)
+
+    def add_markets(self, markets, now=None):
+        """Add all markets as returned by `get_markets`"""
+
+        for market in markets:
+            self.add_market(market_id(market), now)
+
+    def remove_market(self, symbol):
+        self._markets.pop(symbol, None)
+
+    def observe_trades(self, symbol, trades, now=None):
+        """Update the trade rate of a market from a `get_market_trades` response
+
+        :param symbol: market symbol
+        :type symbol: str
+        :param trades: trades dict with edges, or a list of trade nodes
+        :type trades: dict or list
+
+        """
+
+        market = self._markets.get(symbol)
+        if market is None:
+            return
+        now = time.time() if now is None else now
+        if isinstance(trades, dict):
+            trades = [e['node'] for e in trades.get('edges', [])]
+        ids = [t['id'] for t in trades]
+        last_id = market['last_trade_id']
+        if last_id is not None and market['last_trade_check'] is not None:
+            elapsed = now - market['last_trade_check']
+            if elapsed > 0:
+                count = sum(1 for i in ids if i > last_id)
+                market['trade_rate'] = self._smooth(market['trade_rate'], count / elapsed)
+        if ids:
+            market['last_trade_id'] = max(ids + ([last_id] if last_id is not None else []))
+        market['last_trade_check'] = now
+
+    def observe_tickers(self, tickers, now=None):
+        """Update the ticker change rate of markets from a `get_tickers` response"""
+
+        now = time.time() if now is None else now
+        for ticker in tickers:
+            market = self._markets.get(ticker.get('market_uuid'))
+            if market is None:
+                continue
+            state = (ticker.get('close'), (ticker.get('bid') or {}).get('price'), (ticker.get('ask') or {}).get('price'))
+            if market['ticker'] is not None and market['last_ticker_check'] is not None:
+                elapsed = now - market['last_ticker_check']
+                if elapsed > 0:
+                    changed = 1.0 if state != market['ticker'] else 0.0
+                    market['ticker_rate'] = self._smooth(market['ticker_rate'], changed / elapsed)
+            market['ticker'] = state
+            market['last_ticker_check'] = now
+
+    def activity(self, symbol):
+        """Weighted activity of a market"""
+
+        market = self._markets[symbol]
+        weighted = self.trade_weight * market['trade_rate'] + self.ticker_weight * market['ticker_rate']
+        return self.floor_weight + weighted
+
+    def rebalance(self, now=None):
+        """Recompute the interval of every market from its activity
+
+        Markets whose share of the budget would put them below `min_interval` are capped
+        and the spare budget is shared between the rest.
+
+        """
+
+        now = time.time() if now is None else now
+        weights = dict((s, self.activity(s)) for s in self._markets)
+        intervals = {}
+        budget = float(self.budget)
+        while weights:
+            total = sum(weights.values())
+            capped = [s for s, w in weights.items() if budget * w / total > 1.0 / self.min_interval]
+            if not capped:
+                break
+            for symbol in capped:
+                intervals[symbol] = self.min_interval
+                budget -= 1.0 / self.min_interval
+                del weights[symbol]
+        total = sum(weights.values())
+        for symbol, weight in weights.items():
+            rate = budget * weight / total if budget > 0 else 0
+            intervals[symbol] = min(self.max_interval, 1.0 / rate) if rate > 0 else self.max_interval
+
+        for symbol, interval in intervals.items():
+            market = self._markets[symbol]
+            if interval == market['interval']:
+                continue
+            market['interval'] = interval
+            market['version'] = next(self._seq)
+            if market['last_poll'] is not None:
+                market['deadline'] = max(now, market['last_poll'] + interval)
+            heapq.heappush(self._queue, (market['deadline'], market['version'], symbol))
+
+    def due(self, now=None):
+        """Markets whose deadline has passed, most overdue first, each is rescheduled
+
+        :return: list of symbols
+
+        """
+
+        now = time.time() if now is None else now
+        res = []
+        while self._queue and self._queue[0][0] <= now:
+            deadline, version, symbol = heapq.heappop(self._queue)
+            market = self._markets.get(symbol)
+            if market is None or market['version'] != version:
+                continue
+            res.append(symbol)
+            market['last_poll'] = now
+            market['deadline'] = max(deadline + market['interval'], now)
+            heapq.heappush(self._queue, (market['deadline'], version, symbol))
+        return res
+
+    def next_deadline(self):
+        """Time the next market becomes due, None when there are no markets"""
+
+        while self._queue:
+            deadline, version, symbol = self._queue[0]
+            market = self._markets.get(symbol)
+            if market is not None and market['version'] == version:
+                return deadline
+            heapq.heappop(self._queue)
+        return None
+
+    def allocation(self):
+        """Current allocation of the budget
+
+        :return: dict of symbol to allocation
+
+        .. code:: python
+
+            {
+                "ETH-BTC": {
+                    "interval": 0.5,
+                    "rate": 2.0,            # requests per second
+                    "activity": 3.41,
+                    "trade_rate": 2.4,
+                    "ticker_rate": 1.0
+                }
+            }
+
+        """
+
+        return dict((symbol, {
+            'interval': m['interval'],
+            'rate': 1.0 / m['interval'],
+            'activity': self.activity(symbol),
+            'trade_rate': m['trade_rate'],
+            'ticker_rate': m['ticker_rate']
+        }) for symbol, m in self._markets.items())
+
+    def apply(self, cache):
+        """Subscribe each market in a `DepthCache` at its allocated interval"""
+
+        for symbol, market in self._markets.items():
+            cache.subscribe(symbol, market['interval'])
+
+    def _smooth(self, current, sample):
+        return self.decay * sample + (1 - self.decay) * current
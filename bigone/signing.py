@@ -0,0 +1,68 @@
+# coding=utf-8
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+class Signer(object):
+    """HS256 JWT signer for the OpenAPI token
+
+    Produces the same tokens as `jwt.encode` for the `Authorization` header. The header
+    segment, the static part of the payload and the keyed HMAC state are computed once,
+    only the nonce is serialized for each token.
+
+    .. code:: python
+
+        signer = Signer(api_key, api_secret)
+        headers = {'Authorization': 'Bearer {}'.format(signer.sign())}
+
+    """
+
+    def __init__(self, api_key, api_secret, clock=time.time):
+        """Signer constructor
+
+        :param api_key: Api Key
+        :type api_key: str
+        :param api_secret: Api Secret
+        :type api_secret: str
+        :param clock: function returning the current time in seconds, used for the nonce
+        :type clock: function
+
+        """
+
+        self.clock = clock
+        header = json.dumps({'typ': 'JWT', 'alg': 'HS256'}, separators=(',', ':')).encode('utf-8')
+        self._header = _b64(header) + b'.'
+        self._payload_prefix = '{{"type":"OpenAPI","sub":{},"nonce":'.format(json.dumps(api_key))
+        secret = api_secret if isinstance(api_secret, bytes) else api_secret.encode('utf-8')
+        self._hmac = hmac.new(secret, digestmod=hashlib.sha256)
+
+    def nonce(self):
+        """Current time in nanoseconds"""
+
+        return int(self.clock() * 1000000000)
+
+    def sign(self, nonce=None):
+        """Create a token
+
+        :param nonce: optional - nonce to use, defaults to the current time in nanoseconds
+        :type nonce: int
+
+        :return: str
+
+        """
+
+        if nonce is None:
+            nonce = self.nonce()
+        payload = '{}{}}}'.format(self._payload_prefix, nonce).encode('utf-8')
+        signing_input = self._header + _b64(payload)
+        mac = self._hmac.copy()
+        mac.update(signing_input)
+        return (signing_input + b'.' + _b64(mac.digest())).decode('utf-8')
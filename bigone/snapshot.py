@@ -0,0 +1,130 @@
+# coding=utf-8
+
+import collections
+import json
+import os
+import struct
+import zlib
+
+MAGIC = b'BGSN'
+VERSION = 1
+
+_HEADER = struct.Struct('>4sH')
+
+
+class Snapshot(object):
+    """Compact binary snapshot of client state for warm restarts
+
+    Any object with `get_state` and `set_state` methods can be registered, the client,
+    `FillTracker`, `DepthCache` and `TransferSync` support it. State is stored as
+    zlib compressed JSON behind a small versioned header.
+
+    The client keeps its HTTP cache and clock offset samples. On restart cached public
+    responses are revalidated with conditional requests, signatures use the previous
+    clock offset until new samples arrive, depth books keep their original fetch time so
+    reads still honour `max_staleness`, and cursors resume where they stopped instead of
+    rescanning history.
+
+    .. code:: python
+
+        client = Client(api_key, api_secret, http_cache=True)
+        fills = FillTracker(client)
+        depth = DepthCache(client)
+
+        snapshot = Snapshot()
+        snapshot.register('client', client)
+        snapshot.register('fills', fills)
+        snapshot.register('depth', depth)
+
+        # at startup, a missing file is a cold start
+        snapshot.load('/var/lib/bot/bigone.snap')
+
+        # before shutdown or periodically
+        snapshot.save('/var/lib/bot/bigone.snap')
+
+    """
+
+    def __init__(self, level=6):
+        """Snapshot constructor
+
+        :param level: zlib compression level
+        :type level: int
+
+        """
+
+        self.level = level
+        self._components = collections.OrderedDict()
+
+    def register(self, name, component):
+        """Register a component under a name that is stable across restarts"""
+
+        self._components[name] = component
+
+    def dumps(self):
+        """Serialize the state of all registered components
+
+        :return: bytes
+
+        """
+
+        state = dict((name, component.get_state()) for name, component in self._components.items())
+        body = zlib.compress(json.dumps(state, separators=(',', ':')).encode('utf-8'), self.level)
+        return _HEADER.pack(MAGIC, VERSION) + body
+
+    def loads(self, data):
+        """Restore registered components from serialized state
+
+        Components missing from the snapshot are left untouched.
+
+        :return: list of restored component names
+
+        :raises: ValueError
+
+        """
+
+        if len(data) < _HEADER.size:
+            raise ValueError('Snapshot is truncated')
+        magic, version = _HEADER.unpack(data[:_HEADER.size])
+        if magic != MAGIC:
+            raise ValueError('Not a bigone snapshot')
+        if version != VERSION:
+            raise ValueError('Unsupported snapshot version {}'.format(version))
+        try:
+            payload = zlib.decompress(data[_HEADER.size:])
+        except zlib.error as e:
+            raise ValueError('Snapshot is corrupt: {}'.format(e))
+        state = json.loads(payload.decode('utf-8'))
+
+        restored = []
+        for name, component in self._components.items():
+            if name in state:
+                component.set_state(state[name])
+                restored.append(name)
+        return restored
+
+    def save(self, path):
+        """Write a snapshot file atomically"""
+
+        data = self.dumps()
+        tmp = '{}.tmp'.format(path)
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.name == 'nt' and os.path.exists(path):
+            os.remove(path)
+        os.rename(tmp, path)
+
+    def load(self, path):
+        """Restore from a snapshot file
+
+        :return: list of restored component names, empty when the file does not exist
+
+        :raises: ValueError
+
+        """
+
+        if not os.path.exists(path):
+            return []
+        with open(path, 'rb') as f:
+            return self.loads(f.read())
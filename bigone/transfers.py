@@ -0,0 +1,303 @@
+# coding=utf-8
+
+import json
+import sqlite3
+import threading
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transfers (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    currency TEXT,
+    state TEXT,
+    final INTEGER NOT NULL,
+    cursor TEXT,
+    prev_cursor TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+CREATE INDEX IF NOT EXISTS transfers_pending ON transfers (kind, final, seq);
+CREATE TABLE IF NOT EXISTS cursors (
+    kind TEXT PRIMARY KEY,
+    cursor TEXT
+);
+CREATE TABLE IF NOT EXISTS watermarks (
+    kind TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    id TEXT,
+    inserted_at TEXT,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, currency)
+);
+"""
+
+
+class TransferSync(object):
+    """Incremental deposit and withdrawal history stored in sqlite
+
+    The last cursor of each feed is kept as a watermark so a sync only requests pages
+    newer than the previous one. Transfers that have not reached a final state are
+    re-checked by resuming the feed from the cursor just before the oldest of them,
+    the new pages are read in the same pass. Each currency keeps the latest transfer
+    seen and the number of transfers as its own watermark for reconciliation.
+
+    .. code:: python
+
+        sync = TransferSync(client, '/var/lib/treasury/transfers.db')
+
+        for event in sync.sync():
+            print(event['type'], event['kind'], event['currency'], event['state'])
+
+        print(sync.watermarks())
+
+    """
+
+    KIND_DEPOSIT = 'deposit'
+    KIND_WITHDRAWAL = 'withdrawal'
+
+    EVENT_NEW = 'new'
+    EVENT_UPDATED = 'updated'
+
+    FINAL_STATES = frozenset(['confirmed', 'completed', 'failed', 'cancelled', 'canceled', 'rejected'])
+
+    def __init__(self, client, path=':memory:', page_size=50, callback=None):
+        """Transfer sync constructor
+
+        :param client: Client instance used to fetch transfers
+        :type client: bigone.client.Client
+        :param path: sqlite database file, in memory by default
+        :type path: str
+        :param page_size: number of transfers to request per page
+        :type page_size: int
+        :param callback: optional - called with each change event
+        :type callback: function
+
+        """
+
+        self._client = client
+        self.path = path
+        self.page_size = page_size
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._fetch = {
+            self.KIND_DEPOSIT: client.get_deposits,
+            self.KIND_WITHDRAWAL: client.withdrawals,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def sync(self, kinds=None):
+        """Fetch new transfers and re-check pending ones
+
+        :param kinds: optional - list of kinds to sync, deposits and withdrawals by default
+        :type kinds: list
+
+        :return: list of change event dicts
+
+        .. code:: python
+
+            [
+                {
+                    "type": "updated",
+                    "kind": "withdrawal",
+                    "id": "10",
+                    "currency": "ETH",
+                    "state": "CONFIRMED",
+                    "previous_state": "PENDING",
+                    "transfer": {...}
+                }
+            ]
+
+        :raises:  BigoneRequestException, BigoneAPIException
+
+        """
+
+        events = []
+        for kind in kinds or (self.KIND_DEPOSIT, self.KIND_WITHDRAWAL):
+            events.extend(self._sync_kind(kind))
+        return events
+
+    def _sync_kind(self, kind):
+        with self._lock:
+            cursor = self._cursor(kind)
+            row = self._db.execute(
+                'SELECT prev_cursor FROM transfers WHERE kind = ? AND final = 0 ORDER BY seq LIMIT 1',
+                (kind,)).fetchone()
+        # resuming before the oldest pending transfer re-checks it and everything after it
+        after = row[0] if row is not None else cursor
+
+        fetch = self._fetch[kind]
+        events = []
+        while True:
+            edges, page_info = _page(fetch(first=self.page_size, after=after), self.page_size)
+            with self._lock, self._db:
+                for edge in edges:
+                    event = self._apply(kind, edge['node'], edge.get('cursor'), after)
+                    if edge.get('cursor'):
+                        after = edge['cursor']
+                    if event is not None:
+                        events.append(event)
+                if page_info.get('end_cursor'):
+                    after = page_info['end_cursor']
+                if after is not None:
+                    self._db.execute('INSERT OR REPLACE INTO cursors (kind, cursor) VALUES (?, ?)', (kind, after))
+            if not edges or not page_info.get('has_next_page'):
+                break
+
+        if self.callback:
+            for event in events:
+                self.callback(event)
+        return events
+
+    def _cursor(self, kind):
+        row = self._db.execute('SELECT cursor FROM cursors WHERE kind = ?', (kind,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _apply(self, kind, node, cursor, prev_cursor):
+        transfer_id = str(_field(node, 'id', 'deposit_id'))
+        currency = _field(node, 'asset_symbol', 'asset_uuid', 'deposit_type')
+        state = node.get('state')
+        final = 1 if state is not None and state.lower() in self.FINAL_STATES else 0
+        data = json.dumps(node, sort_keys=True)
+
+        row = self._db.execute('SELECT state, data FROM transfers WHERE kind = ? AND id = ?',
+                               (kind, transfer_id)).fetchone()
+        if row is None:
+            seq = self._db.execute('SELECT COALESCE(MAX(seq), 0) + 1 FROM transfers WHERE kind = ?',
+                                   (kind,)).fetchone()[0]
+            self._db.execute(
+                'INSERT INTO transfers (kind, id, seq, currency, state, final, cursor, prev_cursor, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (kind, transfer_id, seq, currency, state, final, cursor, prev_cursor, data))
+            self._db.execute(
+                'INSERT OR REPLACE INTO watermarks (kind, currency, id, inserted_at, count) VALUES (?, ?, ?, ?, '
+                'COALESCE((SELECT count FROM watermarks WHERE kind = ? AND currency = ?), 0) + 1)',
+                (kind, currency or '', transfer_id, _field(node, 'inserted_at', 'created_at'), kind, currency or ''))
+            event_type, previous_state = self.EVENT_NEW, None
+        elif row[1] != data:
+            self._db.execute('UPDATE transfers SET state = ?, final = ?, data = ? WHERE kind = ? AND id = ?',
+                             (state, final, data, kind, transfer_id))
+            event_type, previous_state = self.EVENT_UPDATED, row[0]
+        else:
+            return None
+
+        return {
+            'type': event_type,
+            'kind': kind,
+            'id': transfer_id,
+            'currency': currency,
+            'state': state,
+            'previous_state': previous_state,
+            'transfer': node
+        }
+
+    def transfers(self, kind=None, currency=None, pending=False):
+        """Stored transfers, oldest first
+
+        :param kind: optional - deposit or withdrawal
+        :type kind: str
+        :param currency: optional - restrict to a currency
+        :type currency: str
+        :param pending: only return transfers not in a final state
+        :type pending: bool
+
+        :return: list of transfer dicts as returned by the API
+
+        """
+
+        query = 'SELECT data FROM transfers WHERE 1 = 1'
+        args = []
+        if kind:
+            query += ' AND kind = ?'
+            args.append(kind)
+        if currency:
+            query += ' AND currency = ?'
+            args.append(currency)
+        if pending:
+            query += ' AND final = 0'
+        query += ' ORDER BY kind, seq'
+        with self._lock:
+            return [json.loads(row[0]) for row in self._db.execute(query, args)]
+
+    def watermarks(self):
+        """Latest transfer seen and number of transfers per kind and currency
+
+        :return: dict
+
+        .. code:: python
+
+            {
+                "withdrawal": {
+                    "ETH": {"id": "10", "inserted_at": "2018-03-15T16:13:45.610463Z", "count": 4}
+                }
+            }
+
+        """
+
+        res = {}
+        with self._lock:
+            for kind, currency, transfer_id, inserted_at, count in self._db.execute(
+                    'SELECT kind, currency, id, inserted_at, count FROM watermarks ORDER BY kind, currency'):
+                res.setdefault(kind, {})[currency] = {'id': transfer_id, 'inserted_at': inserted_at, 'count': count}
+        return res
+
+    def get_state(self):
+        """Cursors, watermarks and pending transfers for a snapshot
+
+        Transfers in a final state are not included, they are never re-checked.
+
+        """
+
+        with self._lock:
+            return {
+                'cursors': [list(r) for r in self._db.execute('SELECT kind, cursor FROM cursors')],
+                'watermarks': [list(r) for r in self._db.execute(
+                    'SELECT kind, currency, id, inserted_at, count FROM watermarks')],
+                'pending': [list(r) for r in self._db.execute(
+                    'SELECT kind, id, seq, currency, state, final, cursor, prev_cursor, data '
+                    'FROM transfers WHERE final = 0 ORDER BY kind, seq')]
+            }
+
+    def set_state(self, state):
+        """Restore cursors, watermarks and pending transfers from a snapshot"""
+
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM cursors')
+            self._db.execute('DELETE FROM watermarks')
+            self._db.execute('DELETE FROM transfers WHERE final = 0')
+            self._db.executemany('INSERT INTO cursors (kind, cursor) VALUES (?, ?)', state['cursors'])
+            self._db.executemany('INSERT INTO watermarks (kind, currency, id, inserted_at, count) '
+                                 'VALUES (?, ?, ?, ?, ?)', state['watermarks'])
+            self._db.executemany(
+                'INSERT OR REPLACE INTO transfers (kind, id, seq, currency, state, final, cursor, prev_cursor, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', state['pending'])
+
+
+def _page(res, page_size):
+    """Edges and page info of a transfer page
+
+    Deposits may come back as a plain list, it is paged by the id of its last transfer
+    and a full page means more may follow.
+
+    """
+
+    if isinstance(res, list):
+        edges = []
+        for node in res:
+            transfer_id = _field(node, 'id', 'deposit_id')
+            edges.append({'node': node, 'cursor': str(transfer_id) if transfer_id is not None else None})
+        end_cursor = edges[-1]['cursor'] if edges else None
+        return edges, {'end_cursor': end_cursor, 'has_next_page': end_cursor is not None and len(res) >= page_size}
+    return res.get('edges', []), res.get('page_info', {})
+
+
+def _field(node, *keys):
+    for key in keys:
+        if node.get(key) is not None:
+            return node[key]
+    return None
@@ -0,0 +1,364 @@
+# coding=utf-8
+
+import collections
+import json
+import threading
+import time
+import weakref
+
+from .exceptions import BigoneTimeoutException
+
+try:
+    from urllib.parse import urlencode
+except ImportError:
+    from urllib import urlencode
+
+DEFAULT_HEADERS = {
+    'Accept': 'application/json',
+    'User-Agent': 'python-bigone'
+}
+
+
+def _accept_encoding():
+    """Compression schemes urllib3 can decode here, includes br when brotli is installed"""
+    try:
+        from urllib3.util.request import ACCEPT_ENCODING
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip,deflate'
+    return ACCEPT_ENCODING
+
+
+class Transport(object):
+    """HTTP stack used by the client to send requests
+
+    A transport sends one request and returns a response with `status_code`, `headers`,
+    `content`, `text` and `json()`, like `requests.Response`. Timeouts are raised as
+    `BigoneTimeoutException`. Transports used with `threadsafe=True` or hedging must be
+    safe to call from several threads.
+
+    .. code:: python
+
+        client = Client(api_key, api_secret, transport=Urllib3Transport())
+
+    """
+
+    def request(self, method, url, params=None, json=None, data=None, headers=None, timeout=None):
+        """Send a request
+
+        :param method: lower case HTTP method
+        :type method: str
+        :param url: absolute URL
+        :type url: str
+        :param params: optional - query parameters
+        :type params: dict
+        :param json: optional - body encoded as JSON
+        :type json: dict
+        :param data: optional - body encoded as a form
+        :type data: dict
+        :param headers: optional - headers added to the transport defaults
+        :type headers: dict
+        :param timeout: optional - seconds to wait for the server
+        :type timeout: float
+
+        :return: response
+
+        :raises: BigoneTimeoutException
+
+        """
+
+        raise NotImplementedError()
+
+    def close(self):
+        """Release pooled connections"""
+
+
+class Response(object):
+    """Response of transports not built on requests"""
+
+    def __init__(self, status_code, content, headers=None, url=None, raw=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers if hasattr(headers, 'getlist') else Headers(headers or {})
+        self.url = url
+        # urllib3 response, `raw.tell()` gives the bytes read from the wire
+        self.raw = raw
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', 'replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class Headers(dict):
+    """Case insensitive response headers"""
+
+    def __init__(self, headers=None):
+        super(Headers, self).__init__()
+        for key, value in (headers or {}).items():
+            self[key] = value
+
+    def __setitem__(self, key, value):
+        super(Headers, self).__setitem__(key.lower(), value)
+
+    def __getitem__(self, key):
+        return super(Headers, self).__getitem__(key.lower())
+
+    def __contains__(self, key):
+        return super(Headers, self).__contains__(key.lower())
+
+    def get(self, key, default=None):
+        return super(Headers, self).get(key.lower(), default)
+
+    def getlist(self, key):
+        return [self[key]] if key in self else []
+
+
+class RequestsTransport(Transport):
+    """Default transport on `requests` sessions
+
+    With `threadsafe=True` every thread lazily creates its own session, all sessions mount
+    the same `HTTPAdapter` so connections are pooled across threads.
+
+    """
+
+    def __init__(self, threadsafe=False, pool_maxsize=64, headers=None):
+        """Requests transport constructor
+
+        :param threadsafe: optional - give each thread its own session on a shared connection pool
+        :type threadsafe: bool
+        :param pool_maxsize: optional - maximum connections kept per host in threadsafe mode
+        :type pool_maxsize: int
+        :param headers: optional - headers sent with every request
+        :type headers: dict
+
+        """
+
+        self.threadsafe = threadsafe
+        self.pool_maxsize = pool_maxsize
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self._session = None
+        self._adapter = None
+        self._local = threading.local()
+        # per thread sessions, so close reaches all of them
+        self._sessions = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """HTTP session, created on first use so importing and constructing the client stays cheap"""
+        if self.threadsafe:
+            session = getattr(self._local, 'session', None)
+            if session is None:
+                session = self.session = self._init_session()
+            return session
+
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._init_session()
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        if self.threadsafe:
+            self._local.session = session
+            with self._lock:
+                self._sessions.add(session)
+        else:
+            self._session = session
+
+    def _init_session(self):
+        import requests
+
+        session = requests.session()
+        session.headers.update(self.headers)
+        session.headers['Accept-Encoding'] = _accept_encoding()
+        if self.threadsafe:
+            adapter = self._shared_adapter()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        return session
+
+    def _shared_adapter(self):
+        if self._adapter is None:
+            with self._lock:
+                if self._adapter is None:
+                    from requests.adapters import HTTPAdapter
+                    self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_maxsize)
+        return self._adapter
+
+    def request(self, method, url, params=None, json=None, data=None, headers=None, timeout=None):
+        kwargs = {}
+        if params:
+            kwargs['params'] = params
+        if json is not None:
+            kwargs['json'] = json
+        if data is not None:
+            kwargs['data'] = data
+        if headers:
+            kwargs['headers'] = headers
+        if timeout:
+            kwargs['timeout'] = timeout
+        try:
+            return getattr(self.session, method)(url, **kwargs)
+        except Exception as e:
+            from requests.exceptions import Timeout
+            if isinstance(e, Timeout):
+                raise BigoneTimeoutException('Request to {} timed out: {}'.format(url, e))
+            raise
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions)
+        if self._session is not None:
+            sessions.append(self._session)
+        for session in sessions:
+            session.close()
+        if self._adapter is not None:
+            self._adapter.close()
+
+
+class Urllib3Transport(Transport):
+    """Transport calling a urllib3 connection pool directly
+
+    Skips the session, hook, cookie and environment handling of requests, the pool is
+    shared by all threads.
+
+    """
+
+    def __init__(self, pool_maxsize=64, headers=None, **pool_kwargs):
+        """urllib3 transport constructor
+
+        :param pool_maxsize: optional - maximum connections kept per host
+        :type pool_maxsize: int
+        :param headers: optional - headers sent with every request
+        :type headers: dict
+        :param pool_kwargs: optional - passed to `urllib3.PoolManager`
+
+        """
+
+        import urllib3
+
+        self._timeout_errors = (urllib3.exceptions.TimeoutError,)
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self.headers['Accept-Encoding'] = _accept_encoding()
+        self._json_headers = dict(self.headers, **{'Content-Type': 'application/json'})
+        self._form_headers = dict(self.headers, **{'Content-Type': 'application/x-www-form-urlencoded'})
+        pool_kwargs.setdefault('retries', False)
+        self._pool = urllib3.PoolManager(maxsize=pool_maxsize, **pool_kwargs)
+
+    def request(self, method, url, params=None, json=None, data=None, headers=None, timeout=None):
+        body = None
+        base_headers = self.headers
+        if params:
+            url = '{}?{}'.format(url, urlencode(params))
+        if json is not None:
+            body = _dumps(json)
+            base_headers = self._json_headers
+        elif data is not None:
+            body = urlencode(data)
+            base_headers = self._form_headers
+        if headers:
+            base_headers = dict(base_headers, **headers)
+
+        try:
+            response = self._pool.request(method.upper(), url, body=body, headers=base_headers, timeout=timeout,
+                                          preload_content=False)
+            content = response.read()
+        except self._timeout_errors as e:
+            raise BigoneTimeoutException('Request to {} timed out: {}'.format(url, e))
+        response.release_conn()
+        return Response(response.status, content, response.headers, url, response)
+
+    def close(self):
+        self._pool.clear()
+
+
+class MemoryTransport(Transport):
+    """In-process transport answering from registered routes
+
+    For tests and load tests of code built on the client, no sockets are used. Routes
+    match the method and the URL without its query string.
+
+    .. code:: python
+
+        transport = MemoryTransport()
+        transport.add('get', Client.API_URL + '/markets', {'data': markets})
+        client = Client(api_key, api_secret, transport=transport)
+
+        assert client.get_markets() == markets
+
+    """
+
+    def __init__(self, latency=0, history=100):
+        """Memory transport constructor
+
+        :param latency: optional - seconds each request sleeps to simulate the network
+        :type latency: float
+        :param history: optional - number of recent requests kept in `requests`
+        :type history: int
+
+        """
+
+        self.latency = latency
+        self.requests = collections.deque(maxlen=history)
+        self.calls = 0
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def add(self, method, url, body=None, status_code=200, headers=None):
+        """Register a route
+
+        :param method: HTTP method
+        :type method: str
+        :param url: absolute URL without query string
+        :type url: str
+        :param body: JSON serializable body encoded once, or a function called with the
+            request dict returning a body or a `Response`
+        :type body: dict or function
+        :param status_code: optional - response status
+        :type status_code: int
+        :param headers: optional - response headers
+        :type headers: dict
+
+        """
+
+        if not callable(body):
+            body = _dumps(body)
+        self._routes[(method.lower(), url)] = (body, status_code, Headers(headers))
+
+    def request(self, method, url, params=None, json=None, data=None, headers=None, timeout=None):
+        request = self._record(method, url, params, json, data, headers)
+        if self.latency:
+            if timeout and timeout < self.latency:
+                time.sleep(timeout)
+                raise BigoneTimeoutException('Request to {} timed out'.format(url))
+            time.sleep(self.latency)
+        return self._respond(request)
+
+    def _record(self, method, url, params, json, data, headers):
+        request = {'method': method, 'url': url, 'params': params, 'json': json, 'data': data, 'headers': headers}
+        with self._lock:
+            self.calls += 1
+            self.requests.append(request)
+        return request
+
+    def _respond(self, request):
+        url = request['url']
+        route = self._routes.get((request['method'], url))
+        if route is None:
+            return Response(404, _dumps({'errors': [{'code': 404, 'message': 'No route for {}'.format(url)}]}),
+                            url=url)
+        body, status_code, route_headers = route
+        if callable(body):
+            body = body(request)
+            if isinstance(body, Response):
+                return body
+            body = _dumps(body)
+        return Response(status_code, body, route_headers, url)
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
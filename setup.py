@@ -33,7 +33,10 @@ setup(
     author='Sam McHardy',
     license='MIT',
     author_email='',
-    install_requires=['requests', 'pyJWT'],
+    install_requires=['requests', 'futures; python_version < "3"'],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     keywords='bigone exchange rest api bitcoin btc eos qtum bitcny',
     classifiers=[
           'Intended Audience :: Developers',
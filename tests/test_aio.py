@@ -0,0 +1,90 @@
+# coding=utf-8
+
+import asyncio
+import time
+
+from bigone.aio import AsyncClient, AsyncMemoryTransport, ExecutorTransport
+from bigone.exceptions import BigoneAPIException, BigoneTimeoutException
+from bigone.transport import MemoryTransport
+import pytest
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_async_client():
+    """Test endpoint methods are awaitable and requests run concurrently"""
+
+    transport = AsyncMemoryTransport(latency=0.05)
+    for symbol in ('ETH-BTC', 'EOS-BTC', 'BAD-BTC'):
+        transport.add('get', '{}/markets/{}/depth'.format(AsyncClient.API_URL, symbol),
+                      {'data': {'market_uuid': symbol}} if symbol != 'BAD-BTC' else {'errors': [{'code': 10013}]},
+                      status_code=200 if symbol != 'BAD-BTC' else 422)
+    client = AsyncClient('api_key', 'api_secret', transport=transport)
+
+    async def main():
+        books = await client.map_concurrent('get_order_book', ['ETH-BTC', 'EOS-BTC', 'BAD-BTC'] * 4,
+                                            return_exceptions=True)
+        with pytest.raises(BigoneAPIException):
+            await client.get_order_book('BAD-BTC')
+        return books
+
+    loop = asyncio.new_event_loop()
+    start = loop.time()
+    books = loop.run_until_complete(main())
+    elapsed = loop.time() - start
+    loop.close()
+
+    assert [b['market_uuid'] for b in books[:2]] == ['ETH-BTC', 'EOS-BTC']
+    assert isinstance(books[2], BigoneAPIException)
+    assert elapsed < 0.3
+
+
+def test_executor_transport():
+    """Test a synchronous transport runs on the executor with signed requests"""
+
+    transport = MemoryTransport()
+    transport.add('post', AsyncClient.API_URL + '/viewer/orders', lambda request: {'data': request['json']})
+    client = AsyncClient('api_key', 'api_secret', transport=ExecutorTransport(transport))
+
+    order = _run(client.create_order('ETH-BTC', 'BID', '1', '2'))
+    assert order == {'market_id': 'ETH-BTC', 'side': 'BID', 'price': '1', 'amount': '2'}
+    assert transport.requests[-1]['headers']['Authorization'].startswith('Bearer ')
+    _run(client.close())
+
+
+def test_deadline():
+    """Test the deadline bounds the whole call, not only each read"""
+
+    transport = MemoryTransport()
+    transport.add('get', AsyncClient.API_URL + '/markets/ETH-BTC/ticker',
+                  lambda request: time.sleep(0.5) or {'data': {}})
+    client = AsyncClient('api_key', 'api_secret', deadline=0.1, transport=ExecutorTransport(transport))
+
+    start = time.time()
+    with pytest.raises(BigoneTimeoutException):
+        _run(client.get_ticker('ETH-BTC'))
+    assert time.time() - start < 0.4
+    _run(client.close())
+
+
+def test_last_timing():
+    """Test the timing of the last awaited call is visible to the calling task"""
+
+    transport = AsyncMemoryTransport()
+    transport.add('get', AsyncClient.API_URL + '/markets', {'data': []},
+                  headers={'Date': 'Sun, 08 Jul 2018 21:46:50 GMT'})
+    client = AsyncClient('api_key', 'api_secret', transport=transport, clock_sync=True)
+
+    async def main():
+        await client.get_markets()
+        return client.last_timing
+
+    timing = _run(main())
+    assert timing['rtt'] >= 0
+    assert timing['offset'] == client.clock_sync.offset
@@ -1,7 +1,10 @@
 # coding=utf-8
 
 from bigone.client import Client
-from bigone.exceptions import BigoneAPIException, BigoneRequestException
+from bigone.exceptions import (
+    BigoneAPIException, BigoneAuthException, BigoneInsufficientBalanceException, BigoneRateLimitException,
+    BigoneRequestException, BigoneUnsupportedCurrencyException
+)
 import pytest
 import requests_mock
 
@@ -31,3 +34,32 @@ def test_api_exception():
             }
             m.get('https://big.one/api/v2/accounts/ABC', json=json_obj, status_code=422)
             client.get_account('ABC')
+
+
+def test_typed_api_exceptions(capsys):
+    """Test error codes map to exception subclasses without printing"""
+
+    with requests_mock.mock() as m:
+        json_obj = {'errors': [{'code': 20102, 'message': 'Unsupported currency ABC'}]}
+        m.get('https://big.one/api/v2/accounts/ABC', json=json_obj, status_code=422)
+        with pytest.raises(BigoneUnsupportedCurrencyException) as e:
+            client.get_account('ABC')
+        assert e.value.code == 20102
+        assert e.value.status_code == 422
+
+        json_obj = {'errors': [{'code': 10014, 'message': 'Insufficient funds'}]}
+        m.post('https://big.one/api/v2/viewer/orders', json=json_obj, status_code=422)
+        with pytest.raises(BigoneInsufficientBalanceException):
+            client.create_order('ETH-BTC', Client.SIDE_BID, '1', '1')
+
+        m.get('https://big.one/api/v2/tickers', text='Too Many Requests', status_code=429)
+        with pytest.raises(BigoneRateLimitException) as e:
+            client.get_tickers()
+        assert e.value.message == 'Too Many Requests'
+
+        m.get('https://big.one/api/v2/viewer/accounts', json={'errors': {'detail': 'Unauthorized'}}, status_code=401)
+        with pytest.raises(BigoneAuthException) as e:
+            client.get_accounts()
+        assert e.value.message == 'Unauthorized'
+
+    assert capsys.readouterr().out == ''
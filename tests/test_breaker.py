@@ -0,0 +1,112 @@
+# coding=utf-8
+
+from bigone.breaker import (PRIORITY_LOW, STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker,
+                            endpoint_priority)
+from bigone.client import Client
+from bigone.exceptions import BigoneAPIException, BigoneCircuitOpenException
+from bigone.transport import MemoryTransport
+import pytest
+
+
+class _Clock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client(breaker):
+    transport = MemoryTransport()
+    transport.add('get', Client.API_URL + '/markets/ETH-BTC/depth', {'errors': [{'code': 1}]}, status_code=503)
+    transport.add('get', Client.API_URL + '/markets/EOS-BTC/depth', {'data': {}})
+    transport.add('get', Client.API_URL + '/markets/ETH-BTC/trades', {'data': {}})
+    transport.add('post', Client.API_URL + '/viewer/orders', {'data': {'id': 1}})
+    return Client('api_key', 'api_secret', transport=transport, breaker=breaker), transport
+
+
+def test_breaker_trips_and_recovers():
+    """Test the circuit opens on errors, fails fast and closes after probing"""
+
+    clock = _Clock()
+    events = []
+    breaker = CircuitBreaker(window=4, min_calls=4, open_time=5, half_open_calls=2, reserved_calls=1,
+                             close_after=2, clock=clock, callback=events.append)
+    client, transport = _client(breaker)
+
+    for _ in range(4):
+        with pytest.raises(BigoneAPIException):
+            client.get_order_book('ETH-BTC')
+    assert breaker.state('market') == STATE_OPEN
+
+    with pytest.raises(BigoneCircuitOpenException) as e:
+        client.get_order_book('EOS-BTC')
+    assert e.value.retry_after == 5
+    assert transport.calls == 4
+    # other groups are unaffected
+    assert client.create_order('ETH-BTC', 'BID', '1', '1') == {'id': 1}
+
+    clock.now += 5
+    with pytest.raises(BigoneCircuitOpenException):
+        client.get_market_trades('ETH-BTC')
+    assert breaker.state('market') == STATE_HALF_OPEN
+    client.get_order_book('EOS-BTC')
+    client.get_order_book('EOS-BTC')
+    assert breaker.state('market') == STATE_CLOSED
+
+    assert [(e['from'], e['to']) for e in events] == [
+        (STATE_CLOSED, STATE_OPEN), (STATE_OPEN, STATE_HALF_OPEN), (STATE_HALF_OPEN, STATE_CLOSED)]
+    stats = breaker.stats()['market']
+    assert stats['shed'] == {'high': 0, 'normal': 1, 'low': 1}
+    assert stats['transitions']['closed->open'] == 1
+
+
+def test_breaker_half_open_shedding():
+    """Test half-open probe slots are reserved for high priority calls"""
+
+    clock = _Clock()
+    breaker = CircuitBreaker(window=2, min_calls=2, open_time=1, half_open_calls=2, reserved_calls=1, clock=clock)
+    tickets = [breaker.acquire('get', 'markets/ETH-BTC/depth') for _ in range(2)]
+    for ticket in tickets:
+        breaker.release(ticket, error=IOError())
+    clock.now += 1
+
+    normal = breaker.acquire('get', 'markets/ETH-BTC/depth')
+    with pytest.raises(BigoneCircuitOpenException):
+        breaker.acquire('get', 'tickers')
+    with breaker.priority(PRIORITY_LOW):
+        with pytest.raises(BigoneCircuitOpenException):
+            breaker.acquire('post', 'markets/ETH-BTC/depth')
+    high = breaker.acquire('post', 'markets/ETH-BTC/depth')
+
+    # a slow probe re-opens the circuit
+    clock.now += breaker.slow_call
+    breaker.release(normal)
+    breaker.release(high)
+    assert breaker.state('market') == STATE_OPEN
+
+    assert endpoint_priority('get', 'viewer/withdrawals') == PRIORITY_LOW
+    assert endpoint_priority('post', 'viewer/orders/10/cancel') < endpoint_priority('get', 'tickers')
+
+
+def test_breaker_half_open_ignores_stale_calls():
+    """Test calls admitted before the circuit opened neither take probe slots nor close it"""
+
+    clock = _Clock()
+    breaker = CircuitBreaker(window=2, min_calls=2, open_time=1, half_open_calls=2, reserved_calls=1,
+                             close_after=1, clock=clock)
+    stale = [breaker.acquire('get', 'tickers') for _ in range(2)]
+    for ticket in [breaker.acquire('get', 'tickers') for _ in range(2)]:
+        breaker.release(ticket, error=IOError())
+    assert breaker.state('market') == STATE_OPEN
+    clock.now += 1
+
+    probe = breaker.acquire('get', 'tickers')
+    assert breaker.state('market') == STATE_HALF_OPEN
+    for ticket in stale:
+        breaker.release(ticket)
+    assert breaker.state('market') == STATE_HALF_OPEN
+
+    breaker.release(probe)
+    assert breaker.state('market') == STATE_CLOSED
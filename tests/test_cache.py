@@ -0,0 +1,96 @@
+# coding=utf-8
+
+import re
+import threading
+import time
+
+from bigone.cache import DepthCache
+from bigone.client import Client
+from bigone.exceptions import BigoneAPIException
+from bigone.transport import MemoryTransport
+import pytest
+import requests_mock
+
+
+DEPTH_URL = re.compile(r'https://big\.one/api/v2/markets/([A-Z0-9]+-[A-Z0-9]+)/depth')
+
+
+def _depth(request, context):
+    return {'data': {'market_uuid': DEPTH_URL.match(request.url).group(1), 'bids': [], 'asks': []}}
+
+
+def test_read_through():
+    """Test reads are served from memory until the book is too old"""
+
+    cache = DepthCache(Client('api_key', 'api_secret'), max_staleness=60)
+
+    with requests_mock.mock() as m:
+        m.get(DEPTH_URL, json=_depth)
+
+        assert cache.get_order_book('ETH-BTC')['market_uuid'] == 'ETH-BTC'
+        cache.get('ETH-BTC')
+        assert m.call_count == 1
+
+        snapshot = cache.get('ETH-BTC', max_staleness=0)
+        assert m.call_count == 2
+        assert snapshot.age >= 0
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+
+
+def test_background_refresh():
+    """Test subscribed markets are refreshed at their own interval"""
+
+    cache = DepthCache(Client('api_key', 'api_secret', threadsafe=True), interval=0.02)
+
+    with requests_mock.mock() as m:
+        m.get(DEPTH_URL, json=_depth)
+
+        cache.subscribe('ETH-BTC')
+        cache.subscribe('EOS-BTC', interval=10)
+        cache.start()
+        time.sleep(0.2)
+        cache.stop()
+
+        stats = cache.stats()
+        assert stats['markets']['ETH-BTC']['refreshes'] > 3
+        assert stats['markets']['EOS-BTC']['refreshes'] == 1
+        assert stats['markets']['EOS-BTC']['interval'] == 10
+
+        calls = m.call_count
+        cache.get('ETH-BTC', max_staleness=1)
+        assert m.call_count == calls
+
+
+def test_concurrent_misses_share_a_fetch():
+    """Test concurrent misses for a market wait for a single request"""
+
+    transport = MemoryTransport(latency=0.2)
+    transport.add('get', Client.API_URL + '/markets/ETH-BTC/depth', {'data': {'bids': [], 'asks': []}})
+    transport.add('get', Client.API_URL + '/markets/BAD-BTC/depth', {'errors': [{'code': 10013}]}, status_code=422)
+    cache = DepthCache(Client('api_key', 'api_secret', threadsafe=True, transport=transport))
+
+    results = []
+    errors = []
+
+    def read(symbol):
+        try:
+            results.append(cache.get(symbol))
+        except BigoneAPIException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read, args=(symbol,)) for symbol in ['ETH-BTC', 'BAD-BTC'] * 8]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert transport.calls == 2
+    assert len(set(id(r) for r in results)) == 1
+    assert len(errors) == 8
+    assert cache.stats()['misses'] == 16
+    with pytest.raises(BigoneAPIException):
+        cache.get('BAD-BTC')
+    assert transport.calls == 3
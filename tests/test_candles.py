@@ -0,0 +1,70 @@
+# coding=utf-8
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from bigone.candles import CLOSE, COUNT, HIGH, LOW, OPEN, START, VOLUME, BUY_VOLUME, CandleAggregator, CandleRing, vwap  # noqa: E402
+
+TRADES = [
+    {'id': 1, 'taker_side': 'BID', 'price': '10', 'amount': '1', 'inserted_at': '2018-03-15T16:00:00.5Z'},
+    {'id': 2, 'taker_side': 'ASK', 'price': '12', 'amount': '2', 'inserted_at': '2018-03-15T16:00:30Z'},
+    {'id': 3, 'taker_side': 'BID', 'price': '9', 'amount': '1', 'inserted_at': '2018-03-15T16:00:59Z'},
+    {'id': 4, 'taker_side': 'BID', 'price': '11', 'amount': '4', 'inserted_at': '2018-03-15T16:01:10Z'},
+]
+
+
+def test_live_updates_match_backfill():
+    """Test per-trade updates and vectorized resampling produce the same bars"""
+
+    live = CandleAggregator(resolutions=(1, 60), capacity=10)
+    for trade in TRADES:
+        live.update('ETH-BTC', trade)
+
+    history = CandleAggregator(resolutions=(1, 60), capacity=10)
+    history.backfill('ETH-BTC', {'edges': [{'node': t} for t in reversed(TRADES)]})
+
+    for resolution in (1, 60):
+        assert np.allclose(live.bars('ETH-BTC', resolution), history.bars('ETH-BTC', resolution))
+
+    bars = live.bars('ETH-BTC', 60)
+    assert len(bars) == 2
+    assert list(bars[0, [OPEN, HIGH, LOW, CLOSE, VOLUME, BUY_VOLUME, COUNT]]) == [10, 12, 9, 9, 4, 2, 3]
+    assert bars[1, START] - bars[0, START] == 60
+    assert vwap(bars)[0] == pytest.approx((10 + 24 + 9) / 4.0)
+
+
+def test_ring_capacity():
+    """Test the ring keeps only the most recent bars"""
+
+    ring = CandleRing(1, 3)
+    for ts in range(6):
+        ring.update(ts, float(ts), 1.0, True)
+    ring.update(2, 1.0, 1.0, True)
+
+    bars = ring.bars()
+    assert list(bars[:, START]) == [2, 3, 4, 5]
+    assert ring.late_trades == 1
+
+
+def test_missing_timestamp():
+    """Test trades without a timestamp are rejected unless the caller passes the arrival time"""
+
+    aggregator = CandleAggregator(resolutions=(60,), capacity=10)
+    trade = {'id': 5, 'taker_side': 'BID', 'price': '10', 'amount': '1'}
+    with pytest.raises(ValueError):
+        aggregator.update('ETH-BTC', trade)
+    with pytest.raises(ValueError):
+        aggregator.backfill('ETH-BTC', [trade])
+
+    aggregator.update('ETH-BTC', trade, timestamp=120.5)
+    assert aggregator.bars('ETH-BTC', 60)[0, START] == 120
+
+    # get_market_trades pages have no trade times
+    page = {'edges': [{'node': dict(trade, id=6), 'cursor': 'c6'}, {'node': dict(trade, id=7), 'cursor': 'c7'}]}
+    aggregator.update_many('ETH-BTC', page, timestamp=130)
+    assert aggregator.bars('ETH-BTC', 60)[0, COUNT] == 3
+    aggregator.backfill('ETH-BTC', page, timestamps=[200, 150])
+    assert list(aggregator.bars('ETH-BTC', 60)[:, START]) == [120, 180]
+    with pytest.raises(ValueError):
+        aggregator.backfill('ETH-BTC', page, timestamps=[200])
@@ -0,0 +1,80 @@
+# coding=utf-8
+
+import jwt
+
+from bigone.client import Client
+from bigone.clock import ClockSync
+from bigone.transport import MemoryTransport
+
+
+class _Clock(object):
+
+    def __init__(self):
+        self.now = 1531000000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_offset_intersection():
+    """Test interval bounds from several samples narrow the offset"""
+
+    sync = ClockSync()
+    # server is 0.3s ahead, Date headers are truncated to the second
+    for sent in (100.0, 200.4, 300.65, 400.72):
+        received = sent + 0.05
+        sync.observe(sent, received, int(sent + 0.025 + 0.3))
+    assert abs(sync.offset - 0.3) < 0.05
+    assert sync.error < 0.1
+    assert abs(sync.rtt - 0.05) < 1e-9
+
+    # inconsistent samples fall back to the median
+    sync.observe(500.0, 500.01, 510)
+    assert sync.error is None
+    assert abs(sync.offset - 0.3) < 1.0
+
+
+def test_client_clock_sync():
+    """Test responses are annotated and the nonce follows the server clock"""
+
+    clock = _Clock()
+    sync = ClockSync(clock=clock)
+    transport = MemoryTransport()
+    transport.add('get', Client.API_URL + '/markets', {'data': []},
+                  headers={'Date': 'Sun, 08 Jul 2018 21:46:50 GMT'})
+    transport.add('get', Client.API_URL + '/viewer/accounts', {'data': []})
+    client = Client('api_key', 'api_secret', transport=transport, clock_sync=sync)
+
+    # the local clock is 10 seconds behind the server
+    clock.now = 1531086410.0 - 10
+    assert client.last_timing is None
+    client.get_markets()
+    assert abs(sync.offset - 10.5) < 1e-6
+    assert client.last_timing['sent'] == clock.now
+    assert client.last_timing['rtt'] == 0
+    assert client.last_timing['offset'] == sync.offset
+
+    client.get_accounts()
+    token = transport.requests[-1]['headers']['Authorization'].split(' ')[1]
+    nonce = jwt.decode(token, 'api_secret', algorithms=['HS256'])['nonce']
+    assert nonce == int((clock.now + sync.offset) * 1000000000)
+
+    restored = Client('api_key', 'api_secret', clock_sync=True)
+    restored.set_state(client.get_state())
+    assert restored.clock_sync.offset == sync.offset
+
+
+def test_response_timing():
+    """Test the timing annotation of a single response"""
+
+    clock = _Clock()
+    sync = ClockSync(clock=clock)
+
+    class Response(object):
+        headers = {'Date': 'Sun, 08 Jul 2018 21:46:50 GMT'}
+
+    response = Response()
+    timing = sync.observe_response(response, 1531086410.0, 1531086410.2)
+    assert response.timing is timing
+    assert abs(timing['rtt'] - 0.2) < 1e-6
+    assert abs(timing['server_time'] - (1531086410.1 + timing['offset'])) < 1e-6
@@ -0,0 +1,143 @@
+# coding=utf-8
+
+import json
+import re
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+from bigone.client import Client
+from bigone.exceptions import BigoneAPIException
+import pytest
+import requests_mock
+
+
+DEPTH_URL = re.compile(r'https://big\.one/api/v2/markets/([A-Z0-9]+-[A-Z0-9]+)/depth')
+
+
+def _depth(request, context):
+    symbol = DEPTH_URL.match(request.url).group(1)
+    if symbol == 'BAD-BTC':
+        context.status_code = 422
+        return {'errors': [{'code': 10013, 'message': 'Resource not found'}]}
+    return {'data': {'market_uuid': symbol, 'bids': [], 'asks': []}}
+
+
+class _ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _DepthHandler(BaseHTTPRequestHandler):
+    """Answers after `delay` seconds and records the peak number of requests in flight"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    delay = 0.2
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        # old-style class on Python 2, the counters are set on the class explicitly
+        with _DepthHandler.lock:
+            _DepthHandler.in_flight += 1
+            _DepthHandler.peak = max(_DepthHandler.peak, _DepthHandler.in_flight)
+        time.sleep(self.delay)
+        with _DepthHandler.lock:
+            _DepthHandler.in_flight -= 1
+        symbol = self.path.split('/')[-2]
+        body = json.dumps({'data': {'market_uuid': symbol, 'bids': [], 'asks': []}}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = _ThreadingServer(('127.0.0.1', 0), _DepthHandler)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield 'http://127.0.0.1:{}/api/v2'.format(httpd.server_address[1])
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_threadsafe_sessions():
+    """Test each thread gets its own session sharing one connection pool"""
+
+    client = Client('api_key', 'api_secret', threadsafe=True)
+    sessions = []
+
+    def worker():
+        sessions.append(client.session)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(set(id(s) for s in sessions)) == 4
+    assert len(set(id(s.get_adapter('https://big.one')) for s in sessions)) == 1
+
+    closed = []
+    for session in sessions:
+        session.close = lambda session=session: closed.append(session)
+    client.transport.close()
+    assert len(closed) == 4
+
+
+def test_map_concurrent_stress(server):
+    """Test results stay matched to their arguments under 64 threads and throughput scales"""
+
+    client = Client('api_key', 'api_secret', threadsafe=True)
+    client.API_URL = server
+    symbols = ['S{}-BTC'.format(i) for i in range(64)]
+
+    # open the pooled connections before measuring
+    client.map_concurrent('get_order_book', symbols, max_workers=64)
+
+    throughput = {}
+    for workers in (8, 64):
+        _DepthHandler.peak = 0
+        start = time.time()
+        books = client.map_concurrent('get_order_book', symbols, max_workers=workers)
+        throughput[workers] = len(symbols) / (time.time() - start)
+        assert [b['market_uuid'] for b in books] == symbols
+        assert _DepthHandler.peak <= workers
+
+    # 8 workers cannot beat 8 / delay requests per second, 64 workers must at least double it
+    assert throughput[8] <= 8 / _DepthHandler.delay
+    assert throughput[64] > 2 * throughput[8]
+    assert _DepthHandler.peak > 8
+
+
+def test_map_concurrent_errors():
+    """Test exceptions are raised or returned in argument order"""
+
+    client = Client('api_key', 'api_secret', threadsafe=True)
+
+    with requests_mock.mock() as m:
+        m.get(DEPTH_URL, json=_depth)
+
+        res = client.map_concurrent(client.get_order_book, ['ETH-BTC', ('BAD-BTC',), {'symbol': 'EOS-BTC'}],
+                                    max_workers=3, return_exceptions=True)
+        assert res[0]['market_uuid'] == 'ETH-BTC'
+        assert isinstance(res[1], BigoneAPIException)
+        assert res[2]['market_uuid'] == 'EOS-BTC'
+
+        with pytest.raises(BigoneAPIException):
+            client.map_concurrent('get_order_book', ['BAD-BTC'])
@@ -0,0 +1,53 @@
+# coding=utf-8
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from bigone.execution import estimate_execution, estimate_history, estimate_many  # noqa: E402
+
+BOOK = {
+    'market_uuid': 'ETH-BTC',
+    'bids': [{'price': '9', 'amount': '1'}, {'price': '10', 'amount': '2'}],
+    'asks': [{'price': '12', 'amount': '3'}, {'price': '11', 'amount': '1'}]
+}
+
+
+def test_estimate_execution():
+    """Test average price, slippage and levels for single orders"""
+
+    res = estimate_execution(BOOK, 'BID', '2')
+    assert res['avg_price'] == pytest.approx(11.5)
+    assert res['slippage'] == pytest.approx(0.5 / 11)
+    assert res['levels'] == 2
+    assert res['complete']
+
+    res = estimate_execution(BOOK, 'ASK', 3)
+    assert res['avg_price'] == pytest.approx(29 / 3.0)
+    assert res['worst_price'] == 9
+
+    res = estimate_execution(BOOK, 'ASK', 5)
+    assert not res['complete']
+    assert res['filled'] == 3
+
+
+def test_estimate_many_matches_single():
+    """Test vectorized estimates agree with single estimates"""
+
+    sizes = np.linspace(0.5, 4, 8)
+    res = estimate_many(BOOK, sizes, 'BID')
+    for i, size in enumerate(sizes):
+        single = estimate_execution(BOOK, 'BID', size)
+        assert res['avg_price'][i] == pytest.approx(single['avg_price'])
+        assert res['levels'][i] == single['levels']
+
+
+def test_estimate_history():
+    """Test estimates over stored snapshots are indexed by time"""
+
+    res = estimate_history([(1.0, BOOK), (2.0, {'bids': [], 'asks': []})], [1, 2], 'BID')
+    assert list(res['timestamp']) == [1.0, 2.0]
+    assert res['avg_price'].shape == (2, 2)
+    assert res['avg_price'][0, 0] == 11
+    assert np.isnan(res['avg_price'][1, 0])
+    assert not res['complete'][1].any()
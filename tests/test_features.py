@@ -0,0 +1,59 @@
+# coding=utf-8
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from bigone.depth import book_metrics  # noqa: E402
+from bigone.features import FEATURES, book_features, feature_history, stack_books  # noqa: E402
+
+BOOK = {
+    'market_uuid': 'ETH-BTC',
+    'bids': [{'price': '9', 'amount': '1'}, {'price': '10', 'amount': '2'}, {'price': '8', 'amount': '3'}],
+    'asks': [{'price': '12', 'amount': '3'}, {'price': '11', 'amount': '1'}]
+}
+EMPTY = {'market_uuid': 'EOS-BTC', 'bids': [], 'asks': [{'price': '5', 'amount': '1'}]}
+
+
+def test_book_features():
+    """Test features match the per-book metrics and are NaN where undefined"""
+
+    res = book_features([BOOK, EMPTY], top=2)
+    assert res.shape == (2, len(FEATURES))
+    row = dict(zip(FEATURES, res[0]))
+    metrics = book_metrics(BOOK, depth=2)
+    for key in ('best_bid', 'best_ask', 'mid', 'spread', 'imbalance', 'bid_volume', 'ask_volume',
+                'bid_vwap', 'ask_vwap'):
+        assert row[key] == pytest.approx(metrics[key])
+    assert row['microprice'] == pytest.approx((10 * 1 + 11 * 2) / 3.0)
+    # cumulative bid amounts 2, 3, 6 at 0.5, 1.5 and 2.5 below the mid
+    assert row['bid_slope'] == pytest.approx(2.0)
+    assert row['ask_slope'] == pytest.approx(3.0)
+
+    empty = dict(zip(FEATURES, res[1]))
+    assert np.isnan(empty['best_bid']) and np.isnan(empty['mid']) and np.isnan(empty['bid_slope'])
+    assert empty['best_ask'] == 5
+    assert empty['imbalance'] == -1
+
+    res = book_features([BOOK], features=('imbalance', 'spread_bps'), dtype=np.float32)
+    assert res.dtype == np.float32
+    assert res[0, 0] == pytest.approx(0.2)
+    with pytest.raises(ValueError):
+        book_features([BOOK], features=('depth',))
+
+
+def test_feature_history():
+    """Test snapshot history is computed in one batch per market"""
+
+    snapshots = [(1.0, [BOOK, EMPTY]), (2.0, [EMPTY, BOOK])]
+    res = feature_history(snapshots, features=('mid', 'best_ask'), depth=3)
+    assert res['features'].shape == (2, 2, 2)
+    assert res['features'][0, 0, 0] == res['features'][1, 1, 0] == 10.5
+    assert res['features'][1, 0, 1] == 5
+    assert list(res['timestamp']) == [1.0, 2.0]
+
+    levels = stack_books([BOOK], depth=4)
+    np.testing.assert_array_equal(levels[0, 0], [10, 9, 8, np.nan])
+    np.testing.assert_array_equal(levels[0, 3], [1, 3, 0, 0])
+    with pytest.raises(ValueError):
+        feature_history([(1.0, [BOOK]), (2.0, [BOOK, EMPTY])])
@@ -0,0 +1,75 @@
+# coding=utf-8
+
+from decimal import Decimal
+
+from bigone.client import Client
+from bigone.fills import FillTracker
+import requests_mock
+
+
+client = Client('api_key', 'api_secret')
+
+
+def _page(nodes, end_cursor, has_next_page=False):
+    return {
+        'data': {
+            'edges': [{'node': n, 'cursor': 'c{}'.format(n['id'])} for n in nodes],
+            'page_info': {
+                'end_cursor': end_cursor,
+                'start_cursor': None,
+                'has_next_page': has_next_page,
+                'has_previous_page': False
+            }
+        }
+    }
+
+
+def test_fill_tracker_incremental():
+    """Test fills are attributed to tracked orders and the cursor advances"""
+
+    tracker = FillTracker(client, 'ETH-BTC', page_size=2)
+
+    with requests_mock.mock() as m:
+        m.get('https://big.one/api/v2/viewer/trades', [
+            {'json': _page([{'id': 0, 'viewer_side': 'BID', 'bid_order_id': 10, 'price': '1', 'amount': '1'}], 'c0')},
+            {'json': _page([
+                {'id': 1, 'viewer_side': 'BID', 'bid_order_id': 10, 'price': '2', 'amount': '1'},
+                {'id': 2, 'viewer_side': 'ASK', 'ask_order_id': 99, 'price': '5', 'amount': '1'},
+            ], 'c2', True)},
+            {'json': _page([
+                {'id': 3, 'viewer_side': 'BID', 'bid_order_id': 10, 'price': '5', 'amount': '2'},
+            ], 'c3')},
+        ])
+        tracker.track({'id': 10, 'market_uuid': 'ETH-BTC', 'amount': '3', 'filled_amount': '0', 'state': 'PENDING'})
+        events = tracker.poll()
+
+        assert m.call_count == 3
+        assert 'last=1' in m.request_history[0].url
+        assert 'after=c0' in m.request_history[1].url
+        assert 'after=c2' in m.request_history[2].url
+
+    assert [e['trade_id'] for e in events] == [1, 3]
+    assert events[-1]['filled_amount'] == Decimal('3')
+    assert events[-1]['avg_deal_price'] == Decimal('4')
+    assert events[-1]['state'] == FillTracker.STATE_FILLED
+    assert tracker.cursor == 'c3'
+    assert tracker.tracked_orders() == []
+
+
+def test_fill_tracker_skips_history():
+    """Test trades older than the start are not counted again for a partially filled order"""
+
+    tracker = FillTracker(client, 'ETH-BTC')
+
+    with requests_mock.mock() as m:
+        m.get('https://big.one/api/v2/viewer/trades', [
+            {'json': _page([{'id': 5, 'viewer_side': 'BID', 'bid_order_id': 10, 'price': '2', 'amount': '1'}], 'c5')},
+            {'json': _page([], None)},
+        ])
+        tracker.track({'id': 10, 'market_uuid': 'ETH-BTC', 'amount': '3', 'filled_amount': '1',
+                       'avg_deal_price': '2', 'state': 'PENDING'})
+        assert tracker.poll() == []
+        assert 'after=c5' in m.request_history[1].url
+
+    assert tracker.cursor == 'c5'
+    assert tracker.tracked_orders() == [10]
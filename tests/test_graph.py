@@ -0,0 +1,52 @@
+# coding=utf-8
+
+import pytest
+
+from bigone.graph import ArbitrageGraph
+
+
+def _market(base, quote):
+    return {'name': '{}/{}'.format(base, quote), 'baseAsset': {'symbol': base}, 'quoteAsset': {'symbol': quote}}
+
+
+def _ticker(symbol, bid, ask):
+    return {'market_uuid': symbol, 'bid': {'price': bid, 'amount': '1'}, 'ask': {'price': ask, 'amount': '1'}}
+
+
+MARKETS = [_market('ETH', 'BTC'), _market('EOS', 'ETH'), _market('EOS', 'BTC'), _market('BTG', 'BTC')]
+
+
+def test_triangular_opportunity():
+    """Test a profitable triangle is detected and cleared when prices move back"""
+
+    graph = ArbitrageGraph.from_markets(MARKETS)
+    # BTC -> ETH -> EOS -> BTC in both directions
+    assert len(graph) == 2
+
+    assert graph.update([
+        _ticker('ETH-BTC', '0.049', '0.05'),
+        _ticker('EOS-ETH', '0.0099', '0.01'),
+        _ticker('EOS-BTC', '0.0006', '0.00061'),
+    ]) == 2
+
+    opportunities = graph.opportunities()
+    assert len(opportunities) == 1
+    assert opportunities[0]['path'] == ['BTC', 'ETH', 'EOS', 'BTC']
+    assert opportunities[0]['sides'] == ['BID', 'BID', 'ASK']
+    assert opportunities[0]['return'] == pytest.approx(0.2)
+    assert graph.opportunities(min_return=0.3) == []
+
+    # only cycles touching the changed market are re-evaluated
+    assert graph.update([_ticker('BTG-BTC', '0.1', '0.2')]) == 0
+    graph.update([_ticker('EOS-BTC', '0.00049', '0.000505')])
+    assert graph.opportunities() == []
+
+
+def test_fees():
+    graph = ArbitrageGraph.from_markets(MARKETS, fee=0.1)
+    graph.update([
+        _ticker('ETH-BTC', '0.049', '0.05'),
+        _ticker('EOS-ETH', '0.0099', '0.01'),
+        _ticker('EOS-BTC', '0.0006', '0.00061'),
+    ])
+    assert graph.opportunities() == []
@@ -0,0 +1,137 @@
+# coding=utf-8
+
+import json
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+from bigone.client import Client
+from bigone.exceptions import BigoneTimeoutException
+from bigone.hedging import HedgePolicy
+from bigone.helpers import endpoint_key
+import pytest
+
+
+class _ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # abandoned attempts disconnect before the stalled handler answers
+        pass
+
+
+class _SlowFirstHandler(BaseHTTPRequestHandler):
+    """Stalls the first request to each path, answers the rest straight away"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    seen = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            first = self.path not in self.seen
+            self.seen.add(self.path)
+        if first or 'STALL' in self.path:
+            time.sleep(1)
+        body = json.dumps({'data': {'path': self.path, 'first': first}}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _SlowBodyHandler(BaseHTTPRequestHandler):
+    """Sends the headers straight away and trickles the body"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = json.dumps({'data': {'path': self.path}}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        for i in range(len(body)):
+            self.wfile.write(body[i:i + 1])
+            self.wfile.flush()
+            time.sleep(0.05)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = _ThreadingServer(('127.0.0.1', 0), _SlowFirstHandler)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield 'http://127.0.0.1:{}/api/v2'.format(httpd.server_address[1])
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_endpoint_key():
+    assert endpoint_key('markets/ETH-BTC/depth') == 'markets/*/depth'
+    assert endpoint_key('viewer/orders/10') == 'viewer/orders/*'
+    assert endpoint_key('tickers') == 'tickers'
+
+
+def test_hedged_request_wins(server):
+    """Test a stalled request is hedged and the duplicate answer is used"""
+
+    client = Client('api_key', 'api_secret', hedge=HedgePolicy(initial_delay=0.05))
+    client.API_URL = server
+
+    start = time.time()
+    book = client.get_order_book('ETH-BTC')
+    assert time.time() - start < 0.5
+    assert not book['first']
+
+    stats = client.hedge.stats()
+    assert stats['hedges'] == 1
+    assert stats['hedge_wins'] == 1
+
+
+def test_deadline(server):
+    """Test a call raises a typed timeout once its deadline has passed"""
+
+    client = Client('api_key', 'api_secret', hedge=HedgePolicy(initial_delay=0.05))
+    client.API_URL = server
+    with pytest.raises(BigoneTimeoutException):
+        client.get_order_book('STALL-BTC', deadline=0.2)
+    assert client.hedge.stats()['timeouts'] == 1
+
+    client = Client('api_key', 'api_secret', deadline=0.2)
+    client.API_URL = server
+    with pytest.raises(BigoneTimeoutException):
+        client.get_ticker('STALL-BTC')
+
+
+def test_deadline_slow_body():
+    """Test the deadline bounds the whole call when each read is fast but the body is slow"""
+
+    httpd = _ThreadingServer(('127.0.0.1', 0), _SlowBodyHandler)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    try:
+        client = Client('api_key', 'api_secret', deadline=0.3)
+        client.API_URL = 'http://127.0.0.1:{}/api/v2'.format(httpd.server_address[1])
+        start = time.time()
+        with pytest.raises(BigoneTimeoutException):
+            client.get_ticker('ETH-BTC')
+        assert time.time() - start < 0.6
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
@@ -0,0 +1,64 @@
+# coding=utf-8
+
+import gzip
+import io
+import json
+
+from bigone.client import Client
+import requests_mock
+from urllib3.util.request import ACCEPT_ENCODING
+
+
+MARKETS = [{'uuid': 'd2185614', 'name': 'BTG/BTC', 'quoteScale': 8, 'baseScale': 4}] * 20
+
+
+def _gzip(obj):
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb') as f:
+        f.write(json.dumps(obj).encode('utf-8'))
+    return buf.getvalue()
+
+
+def test_conditional_get():
+    """Test unchanged responses are revalidated and served from the cache"""
+
+    client = Client('api_key', 'api_secret', http_cache=True)
+
+    with requests_mock.mock() as m:
+        m.get('https://big.one/api/v2/markets', [
+            {'json': {'data': MARKETS}, 'headers': {'ETag': '"v1"'}},
+            {'status_code': 304, 'text': ''},
+            {'status_code': 304, 'text': ''},
+        ])
+        markets = client.get_markets()
+        assert markets == MARKETS
+        # results are private to the caller, changes do not leak into later hits
+        markets.append('junk')
+        cached = client.get_markets()
+        assert cached == MARKETS
+        cached.append('junk')
+        assert client.get_markets() == MARKETS
+        assert 'If-None-Match' not in m.request_history[0].headers
+        assert m.request_history[1].headers['If-None-Match'] == '"v1"'
+        # every scheme urllib3 can decode here is negotiated, br only with brotli installed
+        assert m.request_history[0].headers['Accept-Encoding'] == ACCEPT_ENCODING
+
+    assert client.transfer_stats.stats()['markets']['not_modified'] == 2
+
+
+def test_wire_bytes():
+    """Test compressed bytes on the wire are recorded per endpoint"""
+
+    client = Client('api_key', 'api_secret')
+    body = _gzip({'data': MARKETS})
+
+    with requests_mock.mock() as m:
+        m.get('https://big.one/api/v2/markets', content=body, headers={'Content-Encoding': 'gzip'})
+        m.get('https://big.one/api/v2/markets/BTG-BTC/depth', json={'data': {'bids': [], 'asks': []}})
+        assert client.get_markets() == MARKETS
+        client.get_order_book('BTG-BTC')
+
+    stats = client.transfer_stats.stats()
+    assert stats['markets']['wire_bytes'] == len(body)
+    assert stats['markets']['body_bytes'] > len(body)
+    assert stats['markets/*/depth']['requests'] == 1
@@ -0,0 +1,25 @@
+# coding=utf-8
+
+import subprocess
+import sys
+
+
+def test_lazy_imports():
+    """Test importing the client does not load signing, HTTP or numeric dependencies"""
+
+    code = (
+        'import sys, bigone, bigone.client; '
+        'print(",".join(m for m in ("jwt", "requests", "numpy", "bigone.numerics") if m in sys.modules))'
+    )
+    out = subprocess.check_output([sys.executable, '-c', code])
+    assert out.decode('utf-8').strip() == ''
+
+
+def test_lazy_attributes():
+    """Test package level attributes resolve on first access"""
+
+    import bigone
+    from bigone.client import Client
+
+    assert bigone.Client is Client
+    assert bigone.numerics.parse_fixed('1.5', 1) == 15
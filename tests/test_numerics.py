@@ -0,0 +1,47 @@
+# coding=utf-8
+
+from bigone.numerics import format_fixed, market_codecs, parse_fixed
+import pytest
+
+
+def test_parse_format_fixed():
+    """Test exact string to fixed-point round trips"""
+
+    assert parse_fixed('46.1450000000000000', 8) == 4614500000
+    assert parse_fixed('-0.5', 8) == -50000000
+    assert parse_fixed('42', 4) == 420000
+    assert parse_fixed('0E-16', 8) == 0
+    assert format_fixed(4614500000, 8) == '46.14500000'
+    assert format_fixed(-5, 4) == '-0.0005'
+    assert format_fixed(42, 0) == '42'
+
+    with pytest.raises(ValueError):
+        parse_fixed('0.123456789', 8)
+    with pytest.raises(ValueError):
+        parse_fixed('abc', 8)
+    for value in ('0.1 ', '1_0', ' 1', '1\n', '1.2.3', '--1'):
+        with pytest.raises(ValueError):
+            parse_fixed(value, 8)
+    assert parse_fixed('1.5', 80) == 15 * 10 ** 79
+
+
+def test_market_codec_batch():
+    """Test batch conversion of depth and trade payloads"""
+
+    markets = [{'uuid': 'd2185614', 'name': 'BTG/BTC', 'quoteScale': 8, 'baseScale': 4}]
+    codecs = market_codecs(markets)
+    codec = codecs['BTG-BTC']
+    assert codecs['d2185614'] is codec
+
+    book = {
+        'market_uuid': 'BTG-BTC',
+        'bids': [{'price': '42', 'order_count': 4, 'amount': '23.3336'}],
+        'asks': [{'price': '45.00000001', 'order_count': 2, 'amount': '4193.3283000000000000'}]
+    }
+    res = codec.parse_depth(book)
+    assert res['bids'] == [(4200000000, 233336)]
+    assert res['asks'] == [(4500000001, 41933283)]
+
+    trades = {'edges': [{'node': {'id': 1, 'taker_side': 'BID', 'price': '46.145', 'amount': '0.2465'}}]}
+    assert codec.parse_trades(trades) == [(1, 'BID', 4614500000, 2465)]
+    assert codec.format_price(res['asks'][0][0]) == '45.00000001'
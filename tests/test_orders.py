@@ -0,0 +1,92 @@
+# coding=utf-8
+
+import json
+
+import jwt
+import pytest
+
+from bigone.client import Client
+from bigone.breaker import CircuitBreaker
+from bigone.exceptions import BigoneAPIException, BigoneCircuitOpenException, BigoneRequestException
+from bigone.transport import MemoryTransport
+import requests_mock
+
+ORDER = {'id': 10, 'market_uuid': 'ETH-BTC', 'price': '0.01', 'amount': '10', 'side': 'BID', 'state': 'PENDING'}
+
+
+def test_template_order():
+    """Test a templated order sends the same request as create_order"""
+
+    client = Client('api_key', 'api_secret')
+    template = client.order_template('ETH-BTC')
+    # templates send through the session's adapter directly
+    m = requests_mock.Adapter()
+    client.session.mount('https://', m)
+
+    m.register_uri('POST', 'https://big.one/api/v2/viewer/orders', json={'data': ORDER})
+    assert template.create_order('BID', '0.01', '10') == ORDER
+    assert template.create_order('ASK', '0.02', 5) == ORDER
+    client.create_order('ETH-BTC', 'BID', '0.01', '10')
+
+    fast, other, slow = m.request_history
+    assert fast.json() == slow.json() == {'market_id': 'ETH-BTC', 'side': 'BID', 'price': '0.01', 'amount': '10'}
+    assert json.loads(other.body.decode('utf-8'))['amount'] == '5'
+    assert fast.headers['Content-Type'] == 'application/json'
+    assert fast.headers['Content-Length'] == str(len(fast.body))
+    token = fast.headers['Authorization'].split(' ')[1]
+    assert jwt.decode(token, 'api_secret', algorithms=['HS256'])['sub'] == 'api_key'
+
+    assert client.transfer_stats.stats()['viewer/orders']['requests'] == 3
+
+
+def test_template_errors():
+    """Test invalid orders are rejected before sending and API errors are raised"""
+
+    client = Client('api_key', 'api_secret')
+    template = client.order_template('ETH-BTC')
+
+    with pytest.raises(BigoneRequestException):
+        template.create_order('BUY', '0.01', '10')
+    with pytest.raises(BigoneRequestException):
+        template.create_order('BID', '0.01", "x": "1', '10')
+    with pytest.raises(BigoneRequestException):
+        template.body('BID', '0.01\n', '10')
+
+    m = requests_mock.Adapter()
+    client.session.mount('https://', m)
+    m.register_uri('POST', 'https://big.one/api/v2/viewer/orders', status_code=400,
+                   json={'errors': [{'code': 10014, 'message': 'Insufficient funds'}]})
+    with pytest.raises(BigoneAPIException):
+        template.create_order('BID', '0.01', '10')
+    assert len(m.request_history) == 1
+
+
+def test_template_breaker_and_clock_sync():
+    """Test templated orders go through the circuit breaker and clock sync"""
+
+    client = Client('api_key', 'api_secret', breaker=CircuitBreaker(min_calls=2, window=2), clock_sync=True)
+    template = client.order_template('ETH-BTC')
+    m = requests_mock.Adapter()
+    client.session.mount('https://', m)
+
+    m.register_uri('POST', 'https://big.one/api/v2/viewer/orders', json={'data': ORDER},
+                   headers={'Date': 'Sun, 08 Jul 2018 21:46:50 GMT'})
+    template.create_order('BID', '0.01', '10')
+    assert client.clock_sync.rtt is not None
+    assert client.breaker.stats()['trading']['calls'] == 1
+
+    m.register_uri('POST', 'https://big.one/api/v2/viewer/orders', status_code=503, json={'errors': []})
+    with pytest.raises(BigoneAPIException):
+        template.create_order('BID', '0.01', '10')
+    with pytest.raises(BigoneCircuitOpenException):
+        template.create_order('BID', '0.01', '10')
+    assert len(m.request_history) == 2
+    assert client.breaker.stats()['trading']['in_flight'] == 0
+
+
+def test_template_requires_requests_transport():
+    """Test templates are refused on transports they cannot send through"""
+
+    client = Client('api_key', 'api_secret', transport=MemoryTransport())
+    with pytest.raises(BigoneRequestException):
+        client.order_template('ETH-BTC')
@@ -0,0 +1,75 @@
+# coding=utf-8
+
+import re
+
+from bigone.client import Client
+from bigone.depth import book_metrics
+from bigone.exceptions import BigoneAPIException
+from bigone.pipeline import DepthPipeline, shared_memory
+from bigone.transport import MemoryTransport
+import pytest
+import requests_mock
+
+
+DEPTH_URL = re.compile(r'https://big\.one/api/v2/markets/([A-Z0-9]+-[A-Z0-9]+)/depth')
+
+BOOK = {
+    'market_uuid': 'ETH-BTC',
+    'bids': [{'price': '42', 'order_count': 4, 'amount': '3'}, {'price': '43', 'order_count': 1, 'amount': '1'}],
+    'asks': [{'price': '45', 'order_count': 2, 'amount': '2'}]
+}
+
+
+def _depth(request, context):
+    book = dict(BOOK)
+    book['market_uuid'] = DEPTH_URL.match(request.url).group(1)
+    return {'data': book}
+
+
+def test_book_metrics():
+    """Test VWAP, spread and imbalance of a book"""
+
+    metrics = book_metrics(BOOK)
+    assert metrics['best_bid'] == 43
+    assert metrics['best_ask'] == 45
+    assert metrics['spread'] == 2
+    assert metrics['mid'] == 44
+    assert metrics['bid_vwap'] == pytest.approx(42.25)
+    assert metrics['imbalance'] == pytest.approx(2.0 / 6)
+    assert book_metrics(BOOK, depth=1)['bid_volume'] == 1
+
+
+@pytest.mark.parametrize('processes', [0, 2])
+def test_depth_pipeline(processes):
+    """Test metrics computed in worker processes match in-process metrics"""
+
+    if processes and shared_memory is None:
+        pytest.skip('shared memory requires Python 3.8+')
+
+    client = Client('api_key', 'api_secret', threadsafe=True)
+    symbols = ['S{}-BTC'.format(i) for i in range(20)]
+
+    with requests_mock.mock() as m:
+        m.get(DEPTH_URL, json=_depth)
+        with DepthPipeline(client, processes=processes, io_workers=4) as pipeline:
+            res = pipeline.run(symbols)
+
+    assert sorted(res) == sorted(symbols)
+    expected = book_metrics(BOOK)
+    for symbol in symbols:
+        expected['market_uuid'] = symbol
+        assert res[symbol] == expected
+
+
+def test_depth_pipeline_error_body():
+    """Test an error body with a 2xx status raises like the client instead of an empty book"""
+
+    transport = MemoryTransport()
+    transport.add('get', Client.API_URL + '/markets/ETH-BTC/depth', {'data': BOOK})
+    transport.add('get', Client.API_URL + '/markets/BAD-BTC/depth', {'errors': [{'code': 10013, 'message': 'Not found'}]})
+    client = Client('api_key', 'api_secret', transport=transport)
+
+    with DepthPipeline(client, processes=0) as pipeline:
+        assert pipeline.run(['ETH-BTC'])['ETH-BTC'] == book_metrics(BOOK)
+        with pytest.raises(BigoneAPIException):
+            pipeline.run(['ETH-BTC', 'BAD-BTC'])
@@ -0,0 +1,64 @@
+# coding=utf-8
+
+import pytest
+
+from bigone.scheduler import PollScheduler
+
+
+def _trades(ids):
+    return {'edges': [{'node': {'id': i, 'price': '1', 'amount': '1'}} for i in ids]}
+
+
+def test_budget_follows_activity():
+    """Test active markets get shorter intervals within the same total budget"""
+
+    scheduler = PollScheduler(budget=4, min_interval=0.1, max_interval=100)
+    scheduler.add_markets([{'name': 'ETH/BTC'}, {'name': 'EOS/BTC'}, {'name': 'BTG/BTC'}], now=0)
+
+    before = scheduler.allocation()
+    assert before['ETH-BTC']['interval'] == before['BTG-BTC']['interval']
+
+    scheduler.observe_trades('ETH-BTC', _trades([1]), now=0)
+    scheduler.observe_trades('ETH-BTC', _trades(range(1, 51)), now=10)
+    scheduler.observe_tickers([
+        {'market_uuid': 'EOS-BTC', 'close': '1', 'bid': {'price': '1'}, 'ask': {'price': '2'}},
+        {'market_uuid': 'BTG-BTC', 'close': '1', 'bid': {'price': '1'}, 'ask': {'price': '2'}},
+    ], now=0)
+    scheduler.observe_tickers([
+        {'market_uuid': 'EOS-BTC', 'close': '2', 'bid': {'price': '1'}, 'ask': {'price': '2'}},
+        {'market_uuid': 'BTG-BTC', 'close': '1', 'bid': {'price': '1'}, 'ask': {'price': '2'}},
+    ], now=10)
+    scheduler.rebalance(now=10)
+
+    after = scheduler.allocation()
+    assert after['ETH-BTC']['interval'] < after['EOS-BTC']['interval'] < after['BTG-BTC']['interval']
+    assert sum(a['rate'] for a in after.values()) == pytest.approx(4)
+
+
+def test_min_interval_cap():
+    """Test budget above the min interval cap is shared with other markets"""
+
+    scheduler = PollScheduler(budget=10, min_interval=0.2, max_interval=100, floor_weight=0.01)
+    for symbol in ('ETH-BTC', 'EOS-BTC', 'BTG-BTC'):
+        scheduler.add_market(symbol, now=0)
+    scheduler.observe_trades('ETH-BTC', _trades([1]), now=0)
+    scheduler.observe_trades('ETH-BTC', _trades(range(1, 1001)), now=1)
+    scheduler.rebalance(now=1)
+
+    allocation = scheduler.allocation()
+    assert allocation['ETH-BTC']['interval'] == 0.2
+    assert allocation['EOS-BTC']['rate'] == pytest.approx(2.5)
+    assert allocation['BTG-BTC']['rate'] == pytest.approx(2.5)
+
+
+def test_due_queue():
+    """Test markets come due by deadline and are rescheduled at their interval"""
+
+    scheduler = PollScheduler(budget=1, min_interval=1, max_interval=10)
+    scheduler.add_market('ETH-BTC', now=0)
+    scheduler.add_market('EOS-BTC', now=0)
+
+    assert sorted(scheduler.due(now=0)) == ['EOS-BTC', 'ETH-BTC']
+    assert scheduler.due(now=1) == []
+    assert scheduler.next_deadline() == 2
+    assert sorted(scheduler.due(now=2)) == ['EOS-BTC', 'ETH-BTC']
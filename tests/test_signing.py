@@ -0,0 +1,24 @@
+# coding=utf-8
+
+import collections
+
+import jwt
+
+from bigone.signing import Signer
+
+
+def test_matches_jwt():
+    """Test tokens are identical to PyJWT and carry the nonce"""
+
+    signer = Signer('api_key', 'api_secret', clock=lambda: 1531000000.123)
+    token = signer.sign()
+
+    # same key order as the signer, dicts are unordered on Python 2
+    payload = collections.OrderedDict([('type', 'OpenAPI'), ('sub', 'api_key'), ('nonce', signer.nonce())])
+    expected = jwt.encode(payload, 'api_secret', algorithm='HS256', headers={'typ': 'JWT', 'alg': 'HS256'})
+    # PyJWT 2 returns text, earlier versions bytes
+    if not isinstance(expected, type(token)):
+        expected = expected.decode('utf-8')
+    assert token == expected
+    assert jwt.decode(token, 'api_secret', algorithms=['HS256']) == dict(payload)
+    assert signer.sign(nonce=1) != signer.sign(nonce=2)
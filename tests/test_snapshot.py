@@ -0,0 +1,65 @@
+# coding=utf-8
+
+from decimal import Decimal
+
+from bigone.cache import DepthCache
+from bigone.client import Client
+from bigone.fills import FillTracker
+from bigone.snapshot import Snapshot
+import pytest
+import requests_mock
+
+
+def _components():
+    client = Client('api_key', 'api_secret', http_cache=True)
+    fills = FillTracker(client)
+    depth = DepthCache(client, max_staleness=3600)
+    snapshot = Snapshot()
+    snapshot.register('client', client)
+    snapshot.register('fills', fills)
+    snapshot.register('depth', depth)
+    return snapshot, client, fills, depth
+
+
+def test_warm_restart(tmpdir):
+    """Test state saved before shutdown is restored and revalidated incrementally"""
+
+    path = str(tmpdir.join('bigone.snap'))
+    snapshot, client, fills, depth = _components()
+    assert snapshot.load(path) == []
+
+    with requests_mock.mock() as m:
+        m.get('https://big.one/api/v2/markets', json={'data': [{'name': 'ETH/BTC'}]}, headers={'ETag': '"v1"'})
+        m.get('https://big.one/api/v2/markets/ETH-BTC/depth', json={'data': {'bids': [], 'asks': []}})
+        client.get_markets()
+        depth.subscribe('ETH-BTC')
+        depth.get('ETH-BTC')
+    fills.cursor = 'c42'
+    fills.track({'id': 10, 'amount': '3', 'filled_amount': '1', 'avg_deal_price': '2'})
+    snapshot.save(path)
+
+    restored, client, fills, depth = _components()
+    assert restored.load(path) == ['client', 'fills', 'depth']
+
+    assert fills.cursor == 'c42'
+    assert fills.get_state()['orders'][0]['filled_amount'] == '1'
+    assert fills._orders['10']['notional'] == Decimal('2')
+
+    assert depth.subscriptions() == {'ETH-BTC': 1.0}
+
+    with requests_mock.mock() as m:
+        m.get('https://big.one/api/v2/markets', status_code=304, text='')
+        assert client.get_markets() == [{'name': 'ETH/BTC'}]
+        assert m.request_history[0].headers['If-None-Match'] == '"v1"'
+        assert depth.get('ETH-BTC').book == {'bids': [], 'asks': []}
+        assert m.call_count == 1
+
+
+def test_invalid_snapshot():
+    snapshot = _components()[0]
+    with pytest.raises(ValueError):
+        snapshot.loads(b'not a snapshot')
+    # a valid header in front of a damaged payload
+    data = snapshot.dumps()
+    with pytest.raises(ValueError):
+        snapshot.loads(data[:-4])
@@ -0,0 +1,113 @@
+# coding=utf-8
+
+from bigone.client import Client
+from bigone.snapshot import Snapshot
+from bigone.transfers import TransferSync
+import requests_mock
+
+
+client = Client('api_key', 'api_secret')
+
+URL = 'https://big.one/api/v2/viewer/withdrawals'
+DEPOSITS_URL = 'https://big.one/api/v2/viewer/deposits'
+
+
+def _withdrawal(id, state, asset='ETH'):
+    return {'id': id, 'asset_uuid': asset, 'amount': '1', 'state': state,
+            'inserted_at': '2018-03-15T16:13:{:02d}Z'.format(id)}
+
+
+def _page(nodes, has_next_page=False):
+    return {
+        'data': {
+            'edges': [{'node': n, 'cursor': 'c{}'.format(n['id'])} for n in nodes],
+            'page_info': {
+                'end_cursor': 'c{}'.format(nodes[-1]['id']) if nodes else None,
+                'has_next_page': has_next_page
+            }
+        }
+    }
+
+
+def test_transfer_sync_incremental():
+    """Test only new pages are read and pending transfers are re-checked"""
+
+    sync = TransferSync(client, page_size=2)
+
+    with requests_mock.mock() as m:
+        m.get(URL, [
+            {'json': _page([_withdrawal(1, 'CONFIRMED'), _withdrawal(2, 'PENDING')], True)},
+            {'json': _page([_withdrawal(3, 'CONFIRMED', 'BTC')])},
+            # resumed after c1, the transfer before the pending one
+            {'json': _page([_withdrawal(2, 'CONFIRMED'), _withdrawal(3, 'CONFIRMED', 'BTC')], True)},
+            {'json': _page([_withdrawal(4, 'CONFIRMED')])},
+            # nothing pending, only pages after the watermark are requested
+            {'json': _page([])},
+        ])
+        events = sync.sync([TransferSync.KIND_WITHDRAWAL])
+        assert [(e['type'], e['id']) for e in events] == [('new', '1'), ('new', '2'), ('new', '3')]
+
+        events = sync.sync([TransferSync.KIND_WITHDRAWAL])
+        assert 'after=c1' in m.request_history[2].url
+        assert [(e['type'], e['id'], e['previous_state']) for e in events] == [
+            ('updated', '2', 'PENDING'), ('new', '4', None)]
+
+        assert sync.sync([TransferSync.KIND_WITHDRAWAL]) == []
+        assert 'after=c4' in m.request_history[4].url
+        assert m.call_count == 5
+
+    assert sync.watermarks()['withdrawal']['ETH'] == {'id': '4', 'inserted_at': '2018-03-15T16:13:04Z', 'count': 3}
+    assert [t['id'] for t in sync.transfers(currency='BTC')] == [3]
+
+
+def test_transfer_sync_deposit_list():
+    """Test deposits returned as a plain list are paged by id and resume after the last one"""
+
+    sync = TransferSync(client, page_size=2)
+
+    def deposit(n, state):
+        return {'deposit_id': 'd{}'.format(n), 'deposit_type': 'ETH', 'amount': '1', 'state': state,
+                'created_at': '2018-03-15T16:13:{:02d}Z'.format(n)}
+
+    with requests_mock.mock() as m:
+        m.get(DEPOSITS_URL, [
+            {'json': {'data': [deposit(1, 'confirmed'), deposit(2, 'confirmed')]}},
+            {'json': {'data': [deposit(3, 'confirmed')]}},
+            {'json': {'data': []}},
+        ])
+        events = sync.sync([TransferSync.KIND_DEPOSIT])
+        assert [e['id'] for e in events] == ['d1', 'd2', 'd3']
+        assert 'after' not in m.request_history[0].url
+        assert 'after=d2' in m.request_history[1].url
+
+        assert sync.sync([TransferSync.KIND_DEPOSIT]) == []
+        assert 'after=d3' in m.request_history[2].url
+        assert m.call_count == 3
+
+    assert sync.watermarks()['deposit']['ETH'] == {'id': 'd3', 'inserted_at': '2018-03-15T16:13:03Z', 'count': 3}
+
+
+def test_transfer_sync_snapshot():
+    """Test pending transfers and cursors survive a snapshot"""
+
+    sync = TransferSync(client)
+    with requests_mock.mock() as m:
+        m.get(URL, json=_page([_withdrawal(1, 'CONFIRMED'), _withdrawal(2, 'PENDING')]))
+        sync.sync([TransferSync.KIND_WITHDRAWAL])
+
+    snapshot = Snapshot()
+    snapshot.register('transfers', sync)
+    data = snapshot.dumps()
+
+    restored = TransferSync(client)
+    snapshot = Snapshot()
+    snapshot.register('transfers', restored)
+    snapshot.loads(data)
+
+    assert [t['id'] for t in restored.transfers(pending=True)] == [2]
+    with requests_mock.mock() as m:
+        m.get(URL, json=_page([_withdrawal(2, 'FAILED')]))
+        events = restored.sync([TransferSync.KIND_WITHDRAWAL])
+        assert 'after=c1' in m.request_history[0].url
+    assert events[0]['state'] == 'FAILED'
+    assert restored.transfers(pending=True) == []
@@ -0,0 +1,122 @@
+# coding=utf-8
+
+import json
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from bigone.client import Client
+from bigone.exceptions import BigoneAPIException, BigoneRequestException, BigoneTimeoutException
+from bigone.transport import MemoryTransport, Urllib3Transport
+import pytest
+
+ENDPOINTS = [
+    ('get_accounts', (), 'get', 'viewer/accounts'),
+    ('get_account', ('BTC',), 'get', 'accounts/BTC'),
+    ('get_markets', (), 'get', 'markets'),
+    ('get_tickers', (), 'get', 'tickers'),
+    ('get_ticker', ('ETH-BTC',), 'get', 'markets/ETH-BTC/ticker'),
+    ('get_order_book', ('ETH-BTC',), 'get', 'markets/ETH-BTC/depth'),
+    ('get_market_trades', ('ETH-BTC',), 'get', 'markets/ETH-BTC/trades'),
+    ('create_order', ('ETH-BTC', 'BID', '1', '1'), 'post', 'viewer/orders'),
+    ('get_orders', ('ETH-BTC',), 'get', 'viewer/orders'),
+    ('get_order', (10,), 'get', 'viewer/orders/10'),
+    ('cancel_order', (10,), 'post', 'viewer/orders/10/cancel'),
+    ('cancel_orders', (), 'post', 'viewer/orders/cancel_all'),
+    ('get_trades', (), 'get', 'viewer/trades'),
+    ('withdrawals', (), 'get', 'viewer/withdrawals'),
+    ('get_deposits', (), 'get', 'viewer/deposits'),
+]
+
+
+@pytest.mark.parametrize('name,args,method,path', ENDPOINTS)
+def test_memory_transport_endpoints(name, args, method, path):
+    """Test every endpoint method works on the in-memory transport"""
+
+    transport = MemoryTransport()
+    transport.add(method, '{}/{}'.format(Client.API_URL, path), {'data': {'endpoint': path}})
+    client = Client('api_key', 'api_secret', transport=transport)
+
+    assert getattr(client, name)(*args) == {'endpoint': path}
+    request = transport.requests[-1]
+    signed = path.startswith('viewer') or path.startswith('accounts')
+    assert ('Authorization' in (request['headers'] or {})) == signed
+
+
+def test_memory_transport_errors():
+    """Test errors and timeouts surface as client exceptions"""
+
+    transport = MemoryTransport(latency=0.05)
+    transport.add('get', Client.API_URL + '/markets/BAD-BTC/depth',
+                  {'errors': [{'code': 10013, 'message': 'Resource not found'}]}, status_code=422)
+    transport.add('get', Client.API_URL + '/markets/ETH-BTC/trades', lambda request: {'data': request['params']})
+    client = Client('api_key', 'api_secret', threadsafe=True, transport=transport)
+
+    with pytest.raises(BigoneAPIException) as e:
+        client.get_order_book('BAD-BTC')
+    assert e.value.code == 10013
+    assert client.get_market_trades('ETH-BTC', first=2) == {'first': 2}
+    with pytest.raises(BigoneTimeoutException):
+        client.get_order_book('ETH-BTC', deadline=0.01)
+    assert transport.calls == 3
+
+    # an abandoned attempt would share the transport with the next call
+    with pytest.raises(BigoneRequestException):
+        Client('api_key', 'api_secret', transport=transport).get_order_book('ETH-BTC', deadline=0.01)
+    assert transport.calls == 3
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _reply(self, status, obj):
+        body = json.dumps(obj).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith('/api/v2/markets/BAD-BTC'):
+            return self._reply(422, {'errors': [{'code': 10013, 'message': 'Resource not found'}]})
+        self._reply(200, {'data': {'path': self.path, 'auth': self.headers.get('Authorization') is not None}})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self._reply(200, {'data': {'json': json.loads(body.decode('utf-8')),
+                                   'content_type': self.headers['Content-Type']}})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = HTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield 'http://127.0.0.1:{}/api/v2'.format(httpd.server_address[1])
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_urllib3_transport(server):
+    """Test the urllib3 transport sends queries, JSON bodies and signatures"""
+
+    client = Client('api_key', 'api_secret', transport=Urllib3Transport())
+    client.API_URL = server
+
+    assert client.get_market_trades('ETH-BTC', first=2) == {
+        'path': '/api/v2/markets/ETH-BTC/trades?first=2', 'auth': False}
+    assert client.get_order(10)['auth'] is True
+    assert client.create_order('ETH-BTC', 'BID', '1', '2') == {
+        'json': {'market_id': 'ETH-BTC', 'side': 'BID', 'price': '1', 'amount': '2'},
+        'content_type': 'application/json'}
+    with pytest.raises(BigoneAPIException):
+        client.get_order_book('BAD-BTC')
+    assert client.transfer_stats.stats()['viewer/orders']['wire_bytes'] > 0